@@ -0,0 +1,205 @@
+"""
+Benchmark suite for the blockchain core and service layer.
+
+Times block construction and Merkle roots per roster size, then chain-wide
+operations (integrity check, save/load, student search, analytics, and an
+attendance submission through BlockchainService) on synthetic chains of
+each requested size. Results are written as JSON keyed by case name so two
+runs, e.g. on two commits, can be compared.
+
+    python -m benchmarks.bench_core --sizes 1000,10000,100000 --output bench-main.json
+    python -m benchmarks.bench_core --output bench-branch.json --compare bench-main.json
+    python -m benchmarks.bench_core --compare bench-main.json bench-branch.json
+
+--sizes accepts 1000000 too; building and saving a 1M-block chain takes
+minutes and several GB of memory. --compare exits with status 1 when a case
+is slower than the baseline by more than --threshold.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import build_chain, iter_attendance_data, make_roster
+from src.blockchain.block import Block
+from src.blockchain.checkChain import check_integrity
+from src.blockchain.getBlock import search_by_student
+from src.blockchain.merkle_tree import calculate_merkle_root
+from src.blockchain.persistence import load_blockchain, save_blockchain
+from src.config.config import Config
+from src.utils.analytics import get_attendance_analytics
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_ROSTERS = "30,120,500"
+
+
+def measure(fn: Callable[[], Any], repeat: int, budget: float, number: int = 1) -> Dict[str, Any]:
+    """
+    Time fn() in samples of `number` calls. Takes `repeat` samples, or fewer
+    once `budget` seconds have been spent (always at least one).
+    """
+    samples: List[float] = []
+    spent = 0.0
+    while len(samples) < repeat and (not samples or spent < budget):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        spent += elapsed
+        samples.append(elapsed / number)
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "samples": len(samples),
+        "number": number,
+    }
+
+
+def bench_roster_cases(rosters: List[int], args) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    timestamp = dt.datetime(2024, 1, 15, 9, 0)
+    for size in rosters:
+        data = next(iter_attendance_data(1, students=size))
+        results[f"block_construct[students={size}]"] = measure(
+            lambda: Block(1, timestamp, data, "0" * 64), args.repeat, args.budget, number=50
+        )
+        roster = make_roster(size)
+        results[f"merkle_root[students={size}]"] = measure(
+            lambda: calculate_merkle_root(roster, timestamp), args.repeat, args.budget, number=50
+        )
+    return results
+
+
+def bench_chain_cases(blocks: int, workdir: str, args) -> Dict[str, Dict[str, Any]]:
+    from src.services.blockchain_service import BlockchainService
+
+    results = {}
+    started = time.perf_counter()
+    chain = build_chain(blocks, seed=args.seed)
+    print(f"  built {blocks} blocks in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    suffix = f"[blocks={blocks}]"
+    chain_file = os.path.join(workdir, f"chain_{blocks}.json")
+    Config.BLOCKCHAIN_FILE = chain_file
+
+    results[f"check_integrity{suffix}"] = measure(lambda: check_integrity(chain), args.repeat, args.budget)
+    results[f"save_blockchain{suffix}"] = measure(lambda: save_blockchain(chain, chain_file), args.repeat, args.budget)
+
+    def load():
+        loaded, message = load_blockchain(chain_file)
+        assert loaded is not None, message
+
+    results[f"load_blockchain{suffix}"] = measure(load, args.repeat, args.budget)
+
+    # A student who attends roughly nine sessions in ten of their classroom
+    roll_no = chain[-1].data["present_students"][0]
+    results[f"search_by_student{suffix}"] = measure(
+        lambda: search_by_student(chain, roll_no), args.repeat, args.budget
+    )
+    results[f"get_attendance_analytics{suffix}"] = measure(
+        lambda: get_attendance_analytics(chain), args.repeat, args.budget
+    )
+
+    # Submissions go through the service, including the save that follows every append
+    service = BlockchainService(blockchain=chain)
+    sessions = iter_attendance_data(args.repeat, seed=args.seed + 1)
+
+    def add():
+        data = next(sessions)
+        form = {f"roll_no{number}": roll for number, roll in enumerate(data.pop("present_students"), start=1)}
+        success, message = service.add_attendance_block(form, data)
+        assert success, message
+
+    results[f"add_attendance_block{suffix}"] = measure(add, args.repeat, args.budget)
+    # Every save also writes a full backup; keep the scratch directory small
+    shutil.rmtree(Config.BACKUP_DIR, ignore_errors=True)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    """Print both runs side by side; return True when any case regressed past threshold."""
+    regressed = False
+    print(f"baseline {baseline['environment'].get('commit')}  current {current['environment'].get('commit')}")
+    print(f"{'case':<48} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>12} {result['best'] * 1000:>12.3f} {'new':>7}")
+            continue
+        ratio = result["best"] / before["best"] if before["best"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  slower"
+            regressed = True
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<48} {before['best'] * 1000:>12.3f} {result['best'] * 1000:>12.3f} {ratio:>7.2f}{flag}")
+    return regressed
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main() -> Optional[int]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated chain lengths")
+    parser.add_argument("--rosters", default=DEFAULT_ROSTERS, help="comma-separated students per block")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case (best is compared)")
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds per case before taking fewer samples")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic chains")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="baseline results, or baseline and current results to compare without running")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        return int(compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_core_") as workdir:
+        Config.BACKUP_DIR = os.path.join(workdir, "backups")
+        results.update(bench_roster_cases([int(size) for size in args.rosters.split(",")], args))
+        for blocks in (int(size) for size in args.sizes.split(",")):
+            results.update(bench_chain_cases(blocks, workdir, args))
+
+    current = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        return int(compare(load_results(args.compare[0]), current, args.threshold))
+
+    print(f"{'case':<48} {'best ms':>10} {'median ms':>10} {'samples':>8}")
+    for name, result in results.items():
+        print(f"{name:<48} {result['best'] * 1000:>10.3f} {result['median'] * 1000:>10.3f} {result['samples']:>8}")
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
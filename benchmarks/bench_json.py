@@ -0,0 +1,65 @@
+"""
+JSON encode benchmark for API payloads.
+
+Builds a synthetic chain and times encoding the full /records payload and
+the analytics payload with Flask's default provider and FastJSONProvider
+(orjson when installed, otherwise its stdlib fallback).
+
+    python -m benchmarks.bench_json --blocks 100000 --students 30
+"""
+import argparse
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import src.utils.json_provider as json_provider
+from src.api.v1.schemas import create_paginated_response, create_success_response
+from benchmarks.synthetic import build_chain
+from src.blockchain.getBlock import get_all_attendance_records
+from src.utils.analytics import get_attendance_analytics
+
+
+def time_encode(encode, payload, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(payload)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=100_000, help="blocks in the synthetic chain")
+    parser.add_argument("--students", type=int, default=30, help="present students per block")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    chain = build_chain(args.blocks, args.students)
+    records = get_all_attendance_records(chain)
+    payloads = {
+        "records": create_success_response(create_paginated_response(records, 1, len(records), len(records))),
+        "analytics": create_success_response(get_attendance_analytics(chain)),
+    }
+    print(f"built {len(chain)} blocks in {time.perf_counter() - started:.1f}s")
+
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    default.compact = True
+    fast = json_provider.FastJSONProvider(app)
+    encoders = {"flask-default": lambda payload: default.dumps(payload, separators=(",", ":"))}
+    if json_provider.orjson is not None:
+        encoders["orjson"] = fast.dumps_bytes
+    encoders["stdlib-compact"] = lambda payload: fast.dumps(payload, separators=(",", ":"))
+
+    print(f"{'payload':<10} {'encoder':<15} {'ms':>9} {'MB':>7}")
+    for name, payload in payloads.items():
+        for encoder_name, encode in encoders.items():
+            size = len(encode(payload)) / 1e6
+            print(f"{name:<10} {encoder_name:<15} {time_encode(encode, payload, args.repeat):>9.1f} {size:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Login throughput benchmark.
+
+Runs AuthService.authenticate from a number of concurrent request threads
+for each bcrypt pool size and reports logins per second, with the
+verification cache disabled (cold logins) and enabled (repeat logins).
+
+    python -m benchmarks.bench_login --rounds 12 --logins 64 --threads 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.config import Config
+import src.services.auth_service as auth_module
+from src.services.user_store import MemoryUserStore
+
+
+def run(pool_size: int, threads: int, logins: int, cache_ttl: int) -> float:
+    if auth_module._bcrypt_executor is not None:
+        auth_module._bcrypt_executor.shutdown(wait=True)
+    auth_module._bcrypt_executor = (
+        ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="bcrypt") if pool_size > 0 else None
+    )
+    Config.PASSWORD_CACHE_TTL_SECONDS = cache_ttl
+
+    # A fresh in-memory store, so every run hashes at --rounds and nothing is written to disk
+    service = auth_module.AuthService(store=MemoryUserStore())
+    for number in range(threads):
+        created, message = service.create_user(f"bench{number}", "bench-password")
+        assert created, message
+
+    def login(attempt: int) -> bool:
+        success, _, _ = service.authenticate(f"bench{attempt % threads}", "bench-password")
+        return success
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        results = list(request_threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    assert all(results)
+    return logins / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=Config.BCRYPT_ROUNDS, help="bcrypt work factor")
+    parser.add_argument("--logins", type=int, default=64, help="logins per run")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent request threads")
+    parser.add_argument("--pool-sizes", default="0,1,2,4,8",
+                        help="comma-separated bcrypt pool sizes (0 hashes on the request thread)")
+    args = parser.parse_args()
+
+    Config.BCRYPT_ROUNDS = args.rounds
+    print(f"bcrypt rounds={args.rounds} logins={args.logins} request threads={args.threads}")
+    print(f"{'pool':>6} {'cold logins/s':>15} {'cached logins/s':>17}")
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        cold = run(pool_size, args.threads, args.logins, cache_ttl=0)
+        cached = run(pool_size, args.threads, args.logins, cache_ttl=300)
+        print(f"{pool_size:>6} {cold:>15.1f} {cached:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Rate limiter overhead benchmark.
+
+Times limiter.hit() per request for each storage backend and strategy,
+single-threaded and from several processes sharing one SQLite file.
+
+    python -m benchmarks.bench_rate_limiter --hits 5000 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+import src.utils.rate_limit_storage  # noqa: F401  registers sqlite://
+
+
+def time_hits(storage_uri: str, strategy: str, hits: int, keys: int) -> float:
+    limiter = STRATEGIES[strategy](storage_from_string(storage_uri))
+    item = parse("1000000/minute")
+    started = time.perf_counter()
+    for number in range(hits):
+        limiter.hit(item, f"client-{number % keys}")
+    return (time.perf_counter() - started) / hits * 1e6
+
+
+def _worker(storage_uri: str, strategy: str, hits: int, keys: int, results) -> None:
+    results.put(time_hits(storage_uri, strategy, hits, keys))
+
+
+def time_hits_multiprocess(storage_uri: str, strategy: str, hits: int, keys: int, processes: int) -> float:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(storage_uri, strategy, hits, keys, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(results.get() for _ in workers) / processes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hits", type=int, default=5000, help="hits per run")
+    parser.add_argument("--keys", type=int, default=100, help="distinct client keys")
+    parser.add_argument("--processes", type=int, default=4, help="processes sharing the SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{os.path.join(directory, 'ratelimits.db')}",
+        }
+        print(f"{'backend':<8} {'strategy':<24} {'us/hit':>8} {f'us/hit x{args.processes}':>12}")
+        for backend, uri in backends.items():
+            for strategy in sorted(STRATEGIES):
+                single = time_hits(uri, strategy, args.hits, args.keys)
+                shared = (
+                    f"{time_hits_multiprocess(uri, strategy, args.hits, args.keys, args.processes):>12.1f}"
+                    if backend == "sqlite" else f"{'-':>12}"
+                )
+                print(f"{backend:<8} {strategy:<24} {single:>8.1f} {shared}")
+
+
+if __name__ == "__main__":
+    main()
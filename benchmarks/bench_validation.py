@@ -0,0 +1,79 @@
+"""
+Validation cost per attendance submission.
+
+Times the two schema passes a POST /api/v1/attendance makes (request schema,
+then validate_attendance_form) for a large roster, against the previous
+path that built both schemas per request and validated every roll number
+with its own field and regex match.
+
+    python -m benchmarks.bench_validation --students 500
+"""
+import argparse
+import time
+
+from marshmallow import fields, validate
+
+from src.api.v1.routes import attendance_submission_schema
+from src.api.v1.schemas import AttendanceSubmissionRequestSchema
+from src.utils.validators import AttendanceFormSchema, RollNumberField, validate_attendance_form
+
+
+class PerItemSubmissionSchema(AttendanceSubmissionRequestSchema):
+    present_students = fields.List(
+        fields.String(validate=validate.Length(min=1, max=50)),
+        required=True,
+        validate=validate.Length(min=1, max=500),
+    )
+
+
+class PerItemFormSchema(AttendanceFormSchema):
+    present_students = fields.List(RollNumberField(), required=True, validate=validate.Length(min=1))
+
+
+def per_item_path(payload, form):
+    PerItemSubmissionSchema().load(payload)
+    PerItemFormSchema().load(form)
+
+
+def current_path(payload, form):
+    attendance_submission_schema.load(payload)
+    is_valid, _, error_msg = validate_attendance_form(form)
+    assert is_valid, error_msg
+
+
+def time_per_call(validate_submission, payload, form, iterations: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            validate_submission(payload, form)
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=500, help="roll numbers per submission")
+    parser.add_argument("--iterations", type=int, default=200, help="submissions per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    rolls = [f"CS-{roll:04d}" for roll in range(1, args.students + 1)]
+    payload = {
+        "teacher_name": "Jane Doe",
+        "course": "Data Structures",
+        "date": "2024-01-15",
+        "year": "2",
+        "class_id": "CLS-1234",
+        "present_students": rolls,
+    }
+    form = dict(payload, class_name="CS 2A")
+
+    print(f"{'path':<10} {'us/submission':>14}")
+    for name, validate_submission in (("per-item", per_item_path), ("current", current_path)):
+        cost = time_per_call(validate_submission, payload, form, args.iterations, args.repeat)
+        print(f"{name:<10} {cost:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+HTTP load test for the API with realistic traffic mixes.
+
+Seeds a scratch chain, classrooms and teacher accounts, then replays one or
+more traffic mixes against the app and reports requests per second and
+latency percentiles per endpoint:
+
+    python -m benchmarks.loadtest --target wsgi --mix dashboard
+    python -m benchmarks.loadtest --target gunicorn --workers 4 --mix period_start --mix mixed
+    python -m benchmarks.loadtest --target gunicorn --mix stats=5,records=3,student=2 --output load.json
+
+--target wsgi drives the app in this process through Flask's test client
+(application cost without the network or worker model); --target gunicorn
+starts gunicorn with gunicorn_config.py on a free local port and sends real
+HTTP requests, so WORKERS and WORKER_CLASS can be compared.
+
+Built-in mixes (--list-mixes prints their phases): login_burst,
+period_start, dashboard, student_lookup and mixed. A custom mix is
+endpoint=weight pairs. Rate limits are off unless --rate-limits is given,
+since they would otherwise cap every mix at a few requests per minute.
+"""
+import argparse
+import datetime as dt
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import build_chain, make_roster
+
+PASSWORD = "loadtest-password"
+TEACHERS = 8
+CLASSROOMS = 20
+
+
+@dataclass
+class Phase:
+    name: str
+    # Shares of --duration and --concurrency spent in this phase
+    duration_share: float
+    concurrency_share: float
+    weights: Dict[str, int]
+
+
+MIXES: Dict[str, List[Phase]] = {
+    "login_burst": [
+        Phase("burst", 1.0, 1.0, {"login": 1}),
+    ],
+    "period_start": [
+        Phase("before", 0.2, 0.25, {"stats": 2, "records": 2, "analytics": 1}),
+        Phase("spike", 0.3, 1.0, {"attendance": 8, "stats": 1, "records": 1}),
+        Phase("after", 0.5, 0.25, {"stats": 2, "records": 2, "analytics": 1}),
+    ],
+    "dashboard": [
+        Phase("polling", 1.0, 1.0, {"stats": 4, "analytics": 2, "records": 4}),
+    ],
+    "student_lookup": [
+        Phase("lookups", 1.0, 1.0, {"student": 1}),
+    ],
+    "mixed": [
+        Phase("steady", 1.0, 1.0, {
+            "login": 1, "attendance": 2, "stats": 4, "analytics": 2, "records": 4, "student": 3,
+        }),
+    ],
+}
+
+
+@dataclass
+class Fixture:
+    """What the seeded app holds, for building requests."""
+    teachers: List[str]
+    token: str
+    classrooms: List[Tuple[str, List[str]]]
+    students: List[str]
+
+
+class Request:
+    def __init__(self, method: str, path: str, label: str, body: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.method = method
+        self.path = path
+        self.label = label
+        self.body = body
+        self.headers = headers or {}
+
+
+def build_request(endpoint: str, fixture: Fixture, rng: random.Random) -> Request:
+    auth = {"Authorization": f"Bearer {fixture.token}"}
+    if endpoint == "login":
+        return Request("POST", "/api/v1/auth/login", "POST /api/v1/auth/login",
+                       {"username": rng.choice(fixture.teachers), "password": PASSWORD})
+    if endpoint == "attendance":
+        class_id, roster = rng.choice(fixture.classrooms)
+        present = [roll for roll in roster if rng.random() < 0.9] or roster[:1]
+        return Request("POST", "/api/v1/attendance", "POST /api/v1/attendance", {
+            "teacher_name": "Load Test",
+            "course": "Load Testing",
+            "date": dt.date.today().isoformat(),
+            "year": "2",
+            "class_id": class_id,
+            "present_students": present,
+        }, auth)
+    if endpoint == "stats":
+        return Request("GET", "/api/v1/stats", "GET /api/v1/stats", headers=auth)
+    if endpoint == "analytics":
+        return Request("GET", "/api/v1/analytics", "GET /api/v1/analytics", headers=auth)
+    if endpoint == "records":
+        return Request("GET", "/api/v1/records?per_page=20&view=summary", "GET /api/v1/records", headers=auth)
+    if endpoint == "student":
+        return Request("GET", f"/api/v1/students/{rng.choice(fixture.students)}",
+                       "GET /api/v1/students/<roll_no>", headers=auth)
+    raise ValueError(f"Unknown endpoint {endpoint!r}")
+
+
+ENDPOINTS = ("login", "attendance", "stats", "analytics", "records", "student")
+
+
+def parse_mix(value: str) -> List[Phase]:
+    if value in MIXES:
+        return MIXES[value]
+    weights = {}
+    for part in value.split(","):
+        endpoint, _, weight = part.partition("=")
+        if endpoint not in ENDPOINTS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"{value!r} is not a mix name or endpoint=weight pairs over {', '.join(ENDPOINTS)}"
+            )
+        weights[endpoint] = int(weight)
+    return [Phase("custom", 1.0, 1.0, weights)]
+
+
+class WSGIClient:
+    """One Flask test client per load thread."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def send(self, request: Request) -> int:
+        response = self._client.open(request.path, method=request.method, json=request.body,
+                                     headers=request.headers)
+        response.get_data()
+        return response.status_code
+
+    def close(self) -> None:
+        pass
+
+
+class HTTPClient:
+    """One keep-alive connection per load thread."""
+
+    # Requests that may be resent when the server drops the connection without answering
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+    def __init__(self, port: int):
+        self._port = port
+        self._connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def send(self, request: Request) -> int:
+        headers = dict(request.headers)
+        body = None
+        if request.body is not None:
+            body = json.dumps(request.body)
+            headers["Content-Type"] = "application/json"
+        # The worker may have closed this connection after its last response (max_requests)
+        reused = self._connection.sock is not None
+        try:
+            try:
+                self._connection.request(request.method, request.path, body=body, headers=headers)
+            except (http.client.HTTPException, OSError):
+                if not reused:
+                    raise
+                # Nothing reached the worker; send it again on a fresh connection
+                self._connection.close()
+                reused = False
+                self._connection.request(request.method, request.path, body=body, headers=headers)
+            try:
+                response = self._connection.getresponse()
+            except ConnectionResetError:
+                # Closed without a response. A POST may already have been applied, so
+                # only reads are resent; timeouts are never retried.
+                if not reused or request.method not in self.IDEMPOTENT_METHODS:
+                    raise
+                self._connection.close()
+                self._connection.request(request.method, request.path, body=body, headers=headers)
+                response = self._connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            self._connection.close()
+            raise
+        return response.status
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, status: int, latency: float) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies.extend(other.latencies)
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(stats: Dict[str, EndpointStats], elapsed: float) -> Dict[str, Dict[str, Any]]:
+    summary = {}
+    for label, endpoint in sorted(stats.items()):
+        ordered = sorted(endpoint.latencies)
+        errors = sum(count for status, count in endpoint.statuses.items() if status >= 400 and status != 429)
+        summary[label] = {
+            "requests": len(ordered),
+            "rps": len(ordered) / elapsed if elapsed else 0.0,
+            "errors": errors,
+            "throttled": endpoint.statuses.get(429, 0),
+            "statuses": {str(status): count for status, count in sorted(endpoint.statuses.items())},
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p90_ms": percentile(ordered, 0.90) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        }
+    return summary
+
+
+def run_phase(phase: Phase, make_client, fixture: Fixture, duration: float, concurrency: int,
+              seed: int) -> Dict[str, EndpointStats]:
+    threads = max(1, round(concurrency * phase.concurrency_share))
+    deadline = time.perf_counter() + duration * phase.duration_share
+    endpoints = list(phase.weights)
+    weights = [phase.weights[endpoint] for endpoint in endpoints]
+    results: List[Dict[str, EndpointStats]] = [{} for _ in range(threads)]
+
+    def worker(number: int) -> None:
+        rng = random.Random(seed * 1000 + number)
+        client = make_client()
+        stats = results[number]
+        try:
+            while time.perf_counter() < deadline:
+                request = build_request(rng.choices(endpoints, weights)[0], fixture, rng)
+                started = time.perf_counter()
+                try:
+                    status = client.send(request)
+                except (http.client.HTTPException, OSError):
+                    status = 599
+                latency = time.perf_counter() - started
+                stats.setdefault(request.label, EndpointStats()).record(status, latency)
+        finally:
+            client.close()
+
+    pool = [threading.Thread(target=worker, args=(number,), daemon=True) for number in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    merged: Dict[str, EndpointStats] = {}
+    for stats in results:
+        for label, endpoint in stats.items():
+            merged.setdefault(label, EndpointStats()).merge(endpoint)
+    return merged
+
+
+def run_mix(name: str, phases: List[Phase], make_client, fixture: Fixture, args) -> Dict[str, Any]:
+    merged: Dict[str, EndpointStats] = {}
+    started = time.perf_counter()
+    for number, phase in enumerate(phases):
+        print(f"  {name}/{phase.name}: {max(1, round(args.concurrency * phase.concurrency_share))} clients "
+              f"for {args.duration * phase.duration_share:.0f}s", file=sys.stderr)
+        stats = run_phase(phase, make_client, fixture, args.duration, args.concurrency, args.seed + number)
+        for label, endpoint in stats.items():
+            merged.setdefault(label, EndpointStats()).merge(endpoint)
+    elapsed = time.perf_counter() - started
+    endpoints = summarize(merged, elapsed)
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {"elapsed": elapsed, "requests": total, "rps": total / elapsed, "endpoints": endpoints}
+
+
+def configure_environment(workdir: str, args) -> None:
+    """Point every store at workdir; must run before anything imports src.config."""
+    os.environ.update({
+        "BLOCKCHAIN_FILE": os.path.join(workdir, "blockchain_data.json"),
+        "CLASSES_FILE": os.path.join(workdir, "classes_data.json"),
+        "USERS_FILE": os.path.join(workdir, "users_data.json"),
+        "BACKUP_DIR": os.path.join(workdir, "backups"),
+        "USER_STORE": "file",
+        "USE_DATABASE": "False",
+        "CLASSES_WRITE_DELAY_MS": "0",
+        "RATELIMIT_ENABLED": "True" if args.rate_limits else "False",
+        "RATELIMIT_STORAGE_URI": f"sqlite:///{os.path.join(workdir, 'ratelimits.db')}",
+    })
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def seed(args) -> Fixture:
+    from src.blockchain.persistence import save_blockchain
+    from src.config.config import Config
+    from src.services.auth_service import auth_service
+    from src.services.classroom_service import get_classroom_service
+
+    chain = build_chain(args.blocks, seed=args.seed)
+    success, message = save_blockchain(chain, Config.BLOCKCHAIN_FILE)
+    if not success:
+        raise RuntimeError(message)
+    students = sorted({roll for block in chain[1:] for roll in block.data["present_students"]})
+
+    classroom_service = get_classroom_service()
+    classrooms = []
+    for number in range(CLASSROOMS):
+        roster = make_roster(args.roster, prefix=f"L{number}")
+        classroom = classroom_service.create_classroom(f"Load Test {number}", len(roster))
+        classroom_service.add_students_to_class(
+            classroom.id, [{"roll_number": roll, "name": f"Student {roll}"} for roll in roster]
+        )
+        classrooms.append((classroom.id, roster))
+
+    teachers = [f"loadtest{number}" for number in range(TEACHERS)]
+    for username in teachers:
+        auth_service.create_user(username, PASSWORD)
+    token = auth_service.generate_token(teachers[0], "teacher")
+    return Fixture(teachers, token, classrooms, students or ["CS-0001"])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(workdir: str, args) -> Tuple[subprocess.Popen, int]:
+    port = free_port()
+    env = dict(os.environ, PORT=str(port))
+    if args.workers:
+        env["WORKERS"] = str(args.workers)
+    if args.worker_class:
+        env["WORKER_CLASS"] = args.worker_class
+    # uvicorn workers need the ASGI entry point, which delegates to the same Flask app
+    app = "src.asgi:app" if "uvicorn" in env.get("WORKER_CLASS", "sync").lower() else "src.app:app"
+    log = open(os.path.join(workdir, "gunicorn.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn_config.py", "--bind", f"127.0.0.1:{port}", app],
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {process.returncode}; see {log.name}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/api/v1/stats")
+            connection.getresponse().read()
+            connection.close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start within 60s")
+
+
+def print_report(name: str, result: Dict[str, Any]) -> None:
+    print(f"\n{name}: {result['requests']} requests in {result['elapsed']:.1f}s ({result['rps']:.1f} req/s)")
+    print(f"{'endpoint':<34} {'req':>7} {'req/s':>8} {'err':>5} {'429':>5} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, endpoint in result["endpoints"].items():
+        print(f"{label:<34} {endpoint['requests']:>7} {endpoint['rps']:>8.1f} {endpoint['errors']:>5} "
+              f"{endpoint['throttled']:>5} {endpoint['p50_ms']:>8.1f} {endpoint['p90_ms']:>8.1f} "
+              f"{endpoint['p99_ms']:>8.1f} {endpoint['max_ms']:>8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("wsgi", "gunicorn"), default="wsgi")
+    parser.add_argument("--mix", action="append", dest="mixes", metavar="MIX",
+                        help="mix name or endpoint=weight,...; repeat to run several in order (default: mixed)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per mix")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients at full load")
+    parser.add_argument("--workers", type=int, help="gunicorn WORKERS (default: gunicorn_config.py)")
+    parser.add_argument("--worker-class", help="gunicorn WORKER_CLASS (default: sync)")
+    parser.add_argument("--blocks", type=int, default=2000, help="blocks in the seeded chain")
+    parser.add_argument("--roster", type=int, default=40, help="students per seeded classroom")
+    parser.add_argument("--rate-limits", action="store_true", help="keep route limits and token buckets on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--list-mixes", action="store_true", help="print the built-in mixes and exit")
+    args = parser.parse_args()
+
+    if args.list_mixes:
+        for name, phases in MIXES.items():
+            print(name)
+            for phase in phases:
+                weights = ", ".join(f"{endpoint}={weight}" for endpoint, weight in phase.weights.items())
+                print(f"  {phase.name:<8} {phase.duration_share:>4.0%} of time, "
+                      f"{phase.concurrency_share:>4.0%} of clients: {weights}")
+        return
+
+    mix_names = args.mixes or ["mixed"]
+    try:
+        mixes = [parse_mix(name) for name in mix_names]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    configure_environment(workdir, args)
+    process = None
+    try:
+        fixture = seed(args)
+        if args.target == "wsgi":
+            from src.app import app
+
+            def make_client():
+                return WSGIClient(app)
+        else:
+            process, port = start_gunicorn(workdir, args)
+
+            def make_client():
+                return HTTPClient(port)
+
+        results = {}
+        for name, phases in zip(mix_names, mixes):
+            results[name] = run_mix(name, phases, make_client, fixture, args)
+            print_report(name, results[name])
+
+        if args.output:
+            from benchmarks.bench_core import environment
+
+            with open(args.output, "w") as f:
+                json.dump({
+                    "environment": environment(),
+                    "settings": {
+                        "target": args.target,
+                        "workers": args.workers or os.environ.get("WORKERS"),
+                        "worker_class": args.worker_class or os.environ.get("WORKER_CLASS", "sync"),
+                        "concurrency": args.concurrency,
+                        "duration": args.duration,
+                        "blocks": args.blocks,
+                        "roster": args.roster,
+                        "rate_limits": args.rate_limits,
+                    },
+                    "mixes": results,
+                }, f, indent=2)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Synthetic chains for the benchmarks.
+
+Blocks look like real attendance: a fixed set of classrooms with their own
+rosters, one session per class period, and most of the roster present.
+Generation is seeded, so two runs of a benchmark see the same chain.
+"""
+import datetime as dt
+import random
+from typing import Iterator, List, Optional, Sequence
+
+from src.blockchain.block import Block
+from src.blockchain.genesis import create_genesis_block
+
+# Class sizes seen in practice, from tutorial groups to lecture halls
+ROSTER_SIZES = (25, 40, 60, 120)
+CLASSROOMS = 40
+PERIODS_PER_DAY = 8
+
+
+def make_roster(size: int, prefix: str = "CS") -> List[str]:
+    return [f"{prefix}-{roll:04d}" for roll in range(1, size + 1)]
+
+
+def iter_attendance_data(
+    count: int,
+    students: Optional[int] = None,
+    seed: int = 0,
+    roster_sizes: Sequence[int] = ROSTER_SIZES,
+) -> Iterator[dict]:
+    """
+    Yield block data for count sessions. With students set, every session
+    has exactly that many present; otherwise each classroom draws a size
+    from roster_sizes and 80-100% of it attends.
+    """
+    rng = random.Random(seed)
+    classrooms = []
+    for number in range(CLASSROOMS):
+        size = students or rng.choice(roster_sizes)
+        classrooms.append({
+            "class_id": f"CLS-{number:04d}",
+            "class_name": f"Section {number}",
+            "teacher_name": f"Teacher {number % 25}",
+            "course": f"Course {number % 15}",
+            "year": str(1 + number % 4),
+            "roster": make_roster(size, prefix=f"C{number % 8}"),
+        })
+
+    start = dt.date(2024, 1, 1)
+    for session in range(count):
+        classroom = classrooms[session % CLASSROOMS]
+        roster = classroom["roster"]
+        if students:
+            present = roster
+        else:
+            present = [roll for roll in roster if rng.random() < 0.9] or roster[:1]
+        yield {
+            "type": "attendance",
+            "teacher_name": classroom["teacher_name"],
+            "date": (start + dt.timedelta(days=(session // PERIODS_PER_DAY) % 365)).isoformat(),
+            "course": classroom["course"],
+            "year": classroom["year"],
+            "class_id": classroom["class_id"],
+            "class_name": classroom["class_name"],
+            "present_students": list(present),
+        }
+
+
+def build_chain(blocks: int, students: Optional[int] = None, seed: int = 0) -> List[Block]:
+    """Genesis plus blocks - 1 linked attendance blocks."""
+    chain = [create_genesis_block()]
+    started = dt.datetime(2024, 1, 1, 8, 0)
+    for number, data in enumerate(iter_attendance_data(blocks - 1, students, seed), start=1):
+        timestamp = started + dt.timedelta(minutes=45 * number)
+        chain.append(Block(number, timestamp, data, chain[-1].hash))
+    return chain
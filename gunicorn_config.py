@@ -3,7 +3,12 @@ import os
 
 bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
 workers = int(os.getenv('WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
+# "sync" for src.app:app; "uvicorn.workers.UvicornWorker" for src.asgi:app, which
+# the Dockerfile and start_production.sh run so the block event stream is served
+worker_class = os.getenv('WORKER_CLASS', 'sync')
+# Share rate-limit counters across workers instead of one memory:// store each
+os.environ.setdefault('RATELIMIT_STORAGE_URI', 'sqlite:///ratelimits.db')
+os.environ.setdefault('RATELIMIT_STRATEGY', 'sliding-window-counter')
 worker_connections = 1000
 timeout = 120
 keepalive = 5
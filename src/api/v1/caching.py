@@ -0,0 +1,94 @@
+"""
+Conditional GET support for read endpoints.
+
+Read responses are pure functions of the chain tip (and, for classroom
+endpoints, the classroom store's version), so a weak ETag derived from
+those is checked against If-None-Match before the view runs; a match
+returns 304 without computing the payload.
+
+The expensive bodies (stats, analytics, report) are also rendered once per
+chain tip and kept as serialized bytes in a size-bounded cache shared by
+every request in the worker.
+"""
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+from flask import current_app, g, make_response, request
+
+from src.config.config import Config
+from src.utils.cache import ResponseCache
+
+# Bump when the shape of cached responses changes
+ETAG_SCHEMA_VERSION = "1"
+
+response_cache = ResponseCache(Config.RESPONSE_CACHE_MAX_BYTES)
+
+
+def _chain_metadata():
+    # Looked up once per request; the ETag check and the response cache share it
+    metadata = getattr(g, "chain_metadata", None)
+    if metadata is None:
+        from src.services.blockchain_service import get_blockchain_service
+
+        blockchain_service = getattr(g, "blockchain_service", None) or get_blockchain_service()
+        metadata = g.chain_metadata = blockchain_service.get_chain_metadata()
+    return metadata
+
+
+def current_etag(include_classrooms: bool = False) -> str:
+    metadata = _chain_metadata()
+    parts = [ETAG_SCHEMA_VERSION, str(metadata.height), metadata.tip_hash or ""]
+    if include_classrooms:
+        classroom_service = getattr(g, "classroom_service", None)
+        parts.append(repr(classroom_service.version() if classroom_service else None))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20]
+
+
+def conditional_get(include_classrooms: bool = False, max_age: Optional[int] = None):
+    """
+    Tag successful responses with a weak ETag and short private caching,
+    and answer matching If-None-Match requests with 304.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = current_etag(include_classrooms)
+            cache_control = f"private, max-age={Config.HTTP_CACHE_MAX_AGE if max_age is None else max_age}"
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = cache_control
+            return response
+
+        return decorated_function
+    return decorator
+
+
+def render_json(payload: Any) -> bytes:
+    provider = current_app.json
+    if hasattr(provider, "dumps_bytes"):
+        return provider.dumps_bytes(payload)
+    return provider.dumps(payload).encode("utf-8")
+
+
+def cached_response(
+    name: str,
+    render: Callable[[], bytes],
+    variant: Hashable = None,
+    mimetype: str = "application/json",
+):
+    """
+    Serve the body rendered by render() for the current chain tip, rendering
+    it at most once per (name, variant, tip) across concurrent requests.
+    """
+    metadata = _chain_metadata()
+    key = (ETAG_SCHEMA_VERSION, name, variant, metadata.height, metadata.tip_hash)
+    body = response_cache.get_or_render(key, render)
+    return current_app.response_class(body, status=200, mimetype=mimetype)
@@ -0,0 +1,173 @@
+"""
+Server-sent events stream of newly committed blocks.
+
+    GET /api/v1/events/blocks
+
+Served by the ASGI app (src.asgi) so every open stream is a coroutine
+rather than a pinned sync worker. Each block is sent as
+
+    id: <block index>
+    event: block
+    data: {"index": ..., "hash": ..., "class_id": ..., "student_count": ..., "timestamp": ...}
+
+A client reconnecting with Last-Event-ID (or ?last_event_id=) first gets
+the blocks it missed, read from the chain by index. If it missed more than
+SSE_REPLAY_LIMIT, a single "reset" event carries the current tip and the
+client should refetch /records instead.
+
+Blocks appended by other workers are noticed by the hub's poller, one per
+process, which checks the chain tip every SSE_POLL_SECONDS while any stream
+is open and wakes every stream when it moves.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.api.v1.schemas import create_error_response
+from src.config.config import Config
+from src.services.block_events import BlockEvent, BlockEventHub, block_events
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PATH = "/api/v1/events/blocks"
+# Blocks read from the chain per catch-up query
+CATCH_UP_BATCH = 100
+RETRY_MS = 3000
+
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def format_event(event: BlockEvent) -> bytes:
+    data = json.dumps(event.to_dict(), separators=(",", ":"))
+    return f"id: {event.index}\nevent: block\ndata: {data}\n\n".encode("utf-8")
+
+
+def chain_tip_index(blockchain_service) -> int:
+    metadata = blockchain_service.get_chain_metadata()
+    return metadata.tip_index if metadata.tip_index is not None else -1
+
+
+def last_event_id(scope: Dict[str, Any], query: Dict[str, str]) -> Optional[int]:
+    value = query.get("last_event_id")
+    for name, header_value in scope.get("headers", []):
+        if name.lower() == b"last-event-id":
+            value = header_value.decode("latin-1")
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+class BlockEventStream:
+    def __init__(self, blockchain_service, send: Send, hub: BlockEventHub = block_events):
+        self._blockchain_service = blockchain_service
+        self._send = send
+        self._hub = hub
+        self.last_sent: Optional[int] = None
+
+    async def _write(self, chunk: bytes) -> None:
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    async def _tip_index(self) -> int:
+        return await asyncio.to_thread(chain_tip_index, self._blockchain_service)
+
+    async def send_events(self, events) -> None:
+        for event in events:
+            if event.index > self.last_sent:
+                await self._write(format_event(event))
+                self.last_sent = event.index
+
+    async def catch_up(self) -> None:
+        """Send every block after last_sent from the chain, or a reset past the replay limit."""
+        replayed = 0
+        while True:
+            blocks = await asyncio.to_thread(
+                self._blockchain_service.get_blocks_after, self.last_sent, CATCH_UP_BATCH
+            )
+            await self.send_events(BlockEvent.from_block(block) for block in blocks)
+            replayed += len(blocks)
+            if len(blocks) < CATCH_UP_BATCH:
+                return
+            if replayed >= Config.SSE_REPLAY_LIMIT:
+                tip_index = await self._tip_index()
+                data = json.dumps({"tip_index": tip_index})
+                await self._write(f"id: {tip_index}\nevent: reset\ndata: {data}\n\n".encode("utf-8"))
+                self.last_sent = tip_index
+                return
+
+    async def run(self, scope: Dict[str, Any], receive: Receive, query: Dict[str, str]) -> None:
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription = self._hub.subscribe(lambda: loop.call_soon_threadsafe(wakeup.set))
+        if subscription is None:
+            await _send_unavailable(self._send)
+            return
+        blockchain_service = self._blockchain_service
+        self._hub.start_polling(lambda: chain_tip_index(blockchain_service), Config.SSE_POLL_SECONDS)
+
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+            wakeup.set()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await self._send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            })
+            await self._write(f"retry: {RETRY_MS}\n\n".encode("ascii"))
+
+            resume_from = last_event_id(scope, query)
+            if resume_from is None:
+                self.last_sent = await self._tip_index()
+            else:
+                self.last_sent = resume_from
+                await self.catch_up()
+
+            heartbeat_at = loop.time() + Config.SSE_HEARTBEAT_SECONDS
+            while not disconnected.is_set():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=max(0.0, heartbeat_at - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+
+                events, overflowed = subscription.drain()
+                if overflowed:
+                    await self.catch_up()
+                else:
+                    await self.send_events(events)
+
+                if loop.time() >= heartbeat_at:
+                    await self._write(b": keepalive\n\n")
+                    heartbeat_at = loop.time() + Config.SSE_HEARTBEAT_SECONDS
+        except OSError as e:
+            logger.info(f"Block event stream closed: {str(e)}")
+        finally:
+            self._hub.unsubscribe(subscription)
+            watcher.cancel()
+        if not disconnected.is_set():
+            await self._send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def _send_unavailable(send: Send) -> None:
+    payload = json.dumps(create_error_response(
+        "service_unavailable", "Too many open event streams on this worker", 503
+    )).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [(b"content-type", b"application/json"), (b"retry-after", b"5")],
+    })
+    await send({"type": "http.response.body", "body": payload})
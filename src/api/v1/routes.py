@@ -1,16 +1,22 @@
 from flask import Blueprint, request, jsonify, g, current_app
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import logging
 from functools import wraps
 from marshmallow import ValidationError
 from datetime import datetime
 
 from src.services.blockchain_service import BlockchainService
+from src.models.attendance_models import AttendanceSession
 from src.services.auth_service import auth_service
+from src.config.config import Config
+from src.api.v1.caching import cached_response, conditional_get, render_json
 from src.api.v1.schemas import (
     create_error_response,
     create_success_response,
     create_paginated_response,
+    create_cursor_page,
+    decode_cursor_bounds,
+    parse_record_fields,
     LoginRequestSchema,
     LoginResponseSchema,
     StatsResponseSchema,
@@ -25,17 +31,26 @@ from src.api.v1.schemas import (
     ClassroomResponseSchema,
 )
 from src.utils.validators import validate_attendance_form
+from src.utils.roster_import import detect_roster_format, iter_roster_rows
+from src.utils.token_bucket import rate_limit_bucket
 
 logger = logging.getLogger(__name__)
 
 api_v1 = Blueprint('api_v1', __name__, url_prefix='/api/v1')
 
+# Schemas hold no per-request state; build them once
+attendance_submission_schema = AttendanceSubmissionRequestSchema()
+
 _limiter_instance = None
+# Views marked exempt before the app's limiter existed
+_exempt_views = []
 
 def set_limiter(app_limiter):
     """Set the limiter instance for this module"""
     global _limiter_instance
     _limiter_instance = app_limiter
+    for view in _exempt_views:
+        app_limiter.exempt(view)
 
 def get_limiter():
     """Get limiter from module variable"""
@@ -55,6 +70,16 @@ class LimiterProxy:
             return f
         return decorator
 
+    def exempt(self, f):
+        """
+        Opt a view out of the default per-address limits. Used by routes
+        that rate limit per user with rate_limit_bucket instead.
+        """
+        _exempt_views.append(f)
+        if _limiter_instance is not None:
+            _limiter_instance.exempt(f)
+        return f
+
 limiter = LimiterProxy()
 
 
@@ -180,15 +205,17 @@ def refresh_token():
 
 @api_v1.route('/stats', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get()
 def get_stats():
     try:
         blockchain_service: BlockchainService = g.blockchain_service
-        stats = blockchain_service.get_stats()
         
-        schema = StatsResponseSchema()
-        validated_stats = schema.load(stats)
+        def render() -> bytes:
+            schema = StatsResponseSchema()
+            validated_stats = schema.load(blockchain_service.get_stats())
+            return render_json(create_success_response(validated_stats))
         
-        return jsonify(create_success_response(validated_stats)), 200
+        return cached_response("stats", render)
         
     except Exception as e:
         logger.error(f"Error in get_stats: {str(e)}", exc_info=True)
@@ -201,40 +228,17 @@ def get_stats():
 
 @api_v1.route('/records', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get()
 def get_records():
     try:
         blockchain_service: BlockchainService = g.blockchain_service
         
-        teacher_name = request.args.get('teacher_name', '').strip()
-        course = request.args.get('course', '').strip()
-        date = request.args.get('date', '').strip()
-        year = request.args.get('year', '').strip()
-        
-        all_records = blockchain_service.get_all_records()
-        
-        if teacher_name or course or date or year:
-            filtered_records = []
-            for record in all_records:
-                match = True
-                if teacher_name:
-                    record_teacher = str(record.get('teacher_name', '')).strip()
-                    if record_teacher != teacher_name:
-                        match = False
-                if course:
-                    record_course = str(record.get('course', '')).strip()
-                    if record_course != course:
-                        match = False
-                if date:
-                    record_date = str(record.get('date', '')).strip()
-                    if record_date != date:
-                        match = False
-                if year:
-                    record_year = str(record.get('year', '')).strip()
-                    if record_year != year:
-                        match = False
-                if match:
-                    filtered_records.append(record)
-            all_records = filtered_records
+        filters = {
+            'teacher_name': request.args.get('teacher_name', '').strip(),
+            'course': request.args.get('course', '').strip(),
+            'date': request.args.get('date', '').strip(),
+            'year': request.args.get('year', '').strip(),
+        }
         
         pagination_schema = PaginationSchema()
         pagination = pagination_schema.load({
@@ -244,6 +248,12 @@ def get_records():
         
         page = pagination['page']
         per_page = pagination['per_page']
+        fields = parse_record_fields(request.args.get('fields'), request.args.get('view'))
+        
+        if 'cursor' in request.args:
+            return _get_records_by_cursor(blockchain_service, filters, per_page, request.args['cursor'], fields)
+        
+        all_records = blockchain_service.get_all_records(filters, fields)
         total = len(all_records)
         
         start = (page - 1) * per_page
@@ -275,8 +285,62 @@ def get_records():
         )), 500
 
 
+def _get_records_by_cursor(
+    blockchain_service: BlockchainService,
+    filters: Dict[str, str],
+    per_page: int,
+    cursor: str,
+    fields: Optional[Sequence[str]] = None
+):
+    """
+    Keyset pagination on block_index. An empty cursor starts at the oldest
+    record; pages never shift when blocks are appended between requests.
+    """
+    after, before = decode_cursor_bounds(cursor)
+    records, has_more = blockchain_service.get_records_page(
+        filters, per_page, after=after, before=before, fields=fields
+    )
+    response_data = create_cursor_page(records, has_more, per_page, after, before)
+    return jsonify(create_success_response(response_data)), 200
+
+
+@api_v1.route('/records/<int:block_index>/students', methods=['GET'])
+@limiter.limit("30 per minute")
+@conditional_get()
+def get_record_students(block_index: int):
+    try:
+        blockchain_service: BlockchainService = g.blockchain_service
+        roster = blockchain_service.get_block_roster(block_index)
+        
+        if roster is None:
+            return jsonify(create_error_response(
+                "not_found",
+                f"Attendance block {block_index} not found",
+                404
+            )), 404
+        
+        return jsonify(create_success_response(roster)), 200
+        
+    except Exception as e:
+        logger.error(f"Error in get_record_students: {str(e)}", exc_info=True)
+        return jsonify(create_error_response(
+            "internal_error",
+            "Failed to retrieve block roster",
+            500
+        )), 500
+
+
+def _compute_analytics(blockchain_service: BlockchainService) -> Dict[str, Any]:
+    analytics = blockchain_service.get_analytics()
+    if 'error' in analytics:
+        # Raised rather than returned so the failure is not cached for this tip
+        raise RuntimeError(analytics['error'])
+    return analytics
+
+
 @api_v1.route('/analytics', methods=['GET'])
 @limiter.limit("20 per minute")
+@conditional_get()
 def get_analytics():
     try:
         blockchain_service: BlockchainService = g.blockchain_service
@@ -287,21 +351,26 @@ def get_analytics():
             'per_page': request.args.get('per_page', 50, type=int)
         })
         
-        analytics = blockchain_service.get_analytics()
+        per_page = pagination['per_page'] if pagination['per_page'] < 50 else None
         
-        if pagination['per_page'] < 50:
-            overview = analytics.get('overview', {})
-            by_teacher = dict(list(analytics.get('by_teacher', {}).items())[:pagination['per_page']])
-            by_course = dict(list(analytics.get('by_course', {}).items())[:pagination['per_page']])
+        def render() -> bytes:
+            analytics = _compute_analytics(blockchain_service)
+            
+            if per_page is not None:
+                overview = analytics.get('overview', {})
+                by_teacher = dict(list(analytics.get('by_teacher', {}).items())[:per_page])
+                by_course = dict(list(analytics.get('by_course', {}).items())[:per_page])
+                
+                analytics = {
+                    **analytics,
+                    'overview': overview,
+                    'by_teacher': by_teacher,
+                    'by_course': by_course
+                }
             
-            analytics = {
-                **analytics,
-                'overview': overview,
-                'by_teacher': by_teacher,
-                'by_course': by_course
-            }
+            return render_json(create_success_response(analytics))
         
-        return jsonify(create_success_response(analytics)), 200
+        return cached_response("analytics", render, variant=per_page)
         
     except ValidationError as err:
         return jsonify(create_error_response(
@@ -360,6 +429,7 @@ def export_data(format: str):
 
 @api_v1.route('/integrity', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get()
 def check_integrity():
     try:
         blockchain_service: BlockchainService = g.blockchain_service
@@ -386,6 +456,7 @@ def check_integrity():
 
 @api_v1.route('/students/<roll_no>', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get()
 def search_student(roll_no: str):
     try:
         if not roll_no or not roll_no.strip():
@@ -418,6 +489,7 @@ def search_student(roll_no: str):
 @api_v1.route('/report', methods=['GET'])
 @limiter.limit("20 per minute")
 @auth_service.require_auth("read")
+@conditional_get()
 def get_report():
     try:
         format_type = request.args.get('format', 'json')
@@ -430,12 +502,20 @@ def get_report():
             )), 400
         
         blockchain_service: BlockchainService = g.blockchain_service
-        report = blockchain_service.generate_report(format_type)
         
         if format_type == 'text':
-            return report, 200, {'Content-Type': 'text/plain'}
-        else:
-            return jsonify(create_success_response({"report": report})), 200
+            return cached_response(
+                "report",
+                lambda: blockchain_service.generate_report('text').encode("utf-8"),
+                variant='text',
+                mimetype='text/plain',
+            )
+        
+        return cached_response(
+            "report",
+            lambda: render_json(create_success_response({"report": _compute_analytics(blockchain_service)})),
+            variant='json',
+        )
         
     except Exception as e:
         logger.error(f"Error in get_report: {str(e)}", exc_info=True)
@@ -446,12 +526,78 @@ def get_report():
         )), 500
 
 
+@api_v1.route('/events/blocks', methods=['GET'])
+def stream_block_events():
+    # Long-lived streams would pin a sync worker each; src.asgi serves this path
+    return jsonify(create_error_response(
+        "not_implemented",
+        "The block event stream is served by the ASGI app (src.asgi:app)",
+        501
+    )), 501
+
+
+def _prepare_attendance_submission(
+    data: Dict[str, Any],
+    classroom_service,
+    classrooms: Optional[Dict[str, Any]] = None
+):
+    """
+    Validate one loaded AttendanceSubmissionRequestSchema payload against its
+    classroom. Returns (AttendanceSession, None) or (None, (error_code, message, status)).
+    classrooms memoizes lookups across the items of a batch.
+    """
+    class_id = data["class_id"].strip()
+    if classrooms is not None and class_id in classrooms:
+        classroom = classrooms[class_id]
+    else:
+        classroom = classroom_service.get_classroom(class_id)
+        if classrooms is not None:
+            classrooms[class_id] = classroom
+    
+    if not classroom:
+        return None, ("not_found", f"Classroom {class_id} not found", 404)
+    
+    attendance_data = {
+        "teacher_name": data["teacher_name"],
+        "date": data["date"].strftime("%Y-%m-%d"),
+        "course": data["course"],
+        "year": data["year"],
+        "class_id": classroom.id,
+        "class_name": classroom.name,
+        "present_students": data["present_students"],
+    }
+    
+    is_valid, validated_data, error_msg = validate_attendance_form(attendance_data)
+    
+    if not is_valid:
+        return None, ("validation_error", error_msg, 400)
+    
+    invalid_rolls = classroom.missing_roll_numbers(validated_data["present_students"])
+    
+    if invalid_rolls:
+        return None, (
+            "validation_error",
+            f"Roll number(s) {', '.join(invalid_rolls)} are not part of classroom {classroom.name}",
+            400
+        )
+    
+    return AttendanceSession(
+        teacher_name=validated_data["teacher_name"],
+        date=validated_data["date"].strftime("%Y-%m-%d"),
+        course=validated_data["course"],
+        year=validated_data["year"],
+        present_students=validated_data["present_students"],
+        class_id=classroom.id,
+        class_name=classroom.name,
+    ), None
+
+
 @api_v1.route('/attendance', methods=['POST'])
-@limiter.limit("10 per minute")
+@limiter.exempt
+@rate_limit_bucket("attendance")
 def submit_attendance():
     try:
-        schema = AttendanceSubmissionRequestSchema()
-        data = schema.load(request.get_json() or {})
+        data = attendance_submission_schema.load(request.get_json() or {})
         
         blockchain_service: BlockchainService = g.blockchain_service
         classroom_service = getattr(g, 'classroom_service', None)
@@ -463,115 +609,154 @@ def submit_attendance():
                 503
             )), 503
         
-        class_id = data["class_id"].strip()
-        classroom = classroom_service.get_classroom(class_id)
-        
-        if not classroom:
-            return jsonify(create_error_response(
-                "not_found",
-                f"Classroom {class_id} not found",
-                404
-            )), 404
+        session, error = _prepare_attendance_submission(data, classroom_service)
         
-        attendance_data = {
-            "teacher_name": data["teacher_name"],
-            "date": data["date"].strftime("%Y-%m-%d"),
-            "course": data["course"],
-            "year": data["year"],
-            "class_id": classroom.id,
-            "class_name": classroom.name,
-            "present_students": data["present_students"],
-        }
+        if error:
+            error_code, message, status_code = error
+            return jsonify(create_error_response(error_code, message, status_code)), status_code
         
-        is_valid, validated_data, error_msg = validate_attendance_form(attendance_data)
+        result = blockchain_service.record_attendance(session)
         
-        if not is_valid:
+        if not result.success:
             return jsonify(create_error_response(
-                "validation_error",
-                error_msg,
+                "submission_failed",
+                result.message,
                 400
             )), 400
         
-        roster_rolls = {
-            student.roll_number.strip().lower()
-            for student in classroom.students
-            if student.roll_number
+        response_data = {
+            "message": result.message,
+            "block_index": result.block_index,
+            "students_count": result.students_count,
+            "class_id": session.class_id,
         }
-        invalid_rolls = [
-            roll for roll in validated_data["present_students"]
-            if roll.strip().lower() not in roster_rolls
-        ]
         
-        if invalid_rolls:
+        return jsonify(create_success_response(
+            response_data,
+            "Attendance recorded successfully"
+        )), 200
+        
+    except ValidationError as err:
+        return jsonify(create_error_response(
+            "validation_error",
+            "Invalid request data",
+            400,
+            err.messages
+        )), 400
+    except Exception as e:
+        logger.error(f"Error in submit_attendance: {str(e)}", exc_info=True)
+        return jsonify(create_error_response(
+            "internal_error",
+            "Failed to submit attendance",
+            500
+        )), 500
+
+
+def _batch_session_count() -> int:
+    """Tokens charged for a batch: one per session, so batching shares the per-user attendance budget."""
+    payload = request.get_json(silent=True)
+    sessions = payload.get("sessions") if isinstance(payload, dict) else None
+    if not isinstance(sessions, list):
+        return 1
+    return max(1, min(len(sessions), Config.ATTENDANCE_BATCH_MAX_SESSIONS))
+
+
+@api_v1.route('/attendance/batch', methods=['POST'])
+@limiter.exempt
+@rate_limit_bucket("attendance", cost=_batch_session_count)
+def submit_attendance_batch():
+    """
+    Record several class sessions at once (offline sync). Every item is
+    validated up front; the valid ones are appended as consecutive blocks
+    under one lock hold and persisted with one write.
+    """
+    try:
+        payload = request.get_json() or {}
+        sessions = payload.get("sessions")
+        
+        if not isinstance(sessions, list) or not sessions:
             return jsonify(create_error_response(
                 "validation_error",
-                f"Roll number(s) {', '.join(invalid_rolls)} are not part of classroom {classroom.name}",
+                "sessions must be a non-empty list",
                 400
             )), 400
         
-        attendance_payload = {
-            "teacher_name": validated_data["teacher_name"],
-            "date": validated_data["date"].strftime("%Y-%m-%d"),
-            "course": validated_data["course"],
-            "year": validated_data["year"],
-            "class_id": classroom.id,
-            "class_name": classroom.name,
-        }
-        
-        form_dict_with_rolls = {f"roll_no{i+1}": roll for i, roll in enumerate(validated_data["present_students"])}
-        form_dict_with_rolls.update({
-            "teacher_name": validated_data["teacher_name"],
-            "date": validated_data["date"].strftime("%Y-%m-%d"),
-            "course": validated_data["course"],
-            "year": validated_data["year"],
-            "class_id": classroom.id,
-            "class_name": classroom.name,
-        })
-        
-        success, result = blockchain_service.add_attendance_block(
-            form_dict_with_rolls, attendance_payload
-        )
-        
-        if not success:
+        if len(sessions) > Config.ATTENDANCE_BATCH_MAX_SESSIONS:
             return jsonify(create_error_response(
-                "submission_failed",
-                result,
+                "validation_error",
+                f"At most {Config.ATTENDANCE_BATCH_MAX_SESSIONS} sessions per batch",
                 400
             )), 400
         
-        block_index_match = None
-        if "Block #" in result:
-            import re
-            match = re.search(r'Block #(\d+)', result)
-            if match:
-                block_index_match = int(match.group(1))
+        blockchain_service: BlockchainService = g.blockchain_service
+        classroom_service = getattr(g, 'classroom_service', None)
         
-        students_count = len(validated_data["present_students"])
+        if classroom_service is None:
+            return jsonify(create_error_response(
+                "service_unavailable",
+                "Classroom service is not available",
+                503
+            )), 503
+        
+        classrooms: Dict[str, Any] = {}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(sessions)
+        accepted = []
+        
+        for position, item in enumerate(sessions):
+            try:
+                data = attendance_submission_schema.load(item if isinstance(item, dict) else {})
+            except ValidationError as err:
+                results[position] = {
+                    "index": position,
+                    "success": False,
+                    "error": "validation_error",
+                    "message": "Invalid request data",
+                    "details": err.messages,
+                }
+                continue
+            
+            session, error = _prepare_attendance_submission(data, classroom_service, classrooms)
+            if error:
+                error_code, message, _ = error
+                results[position] = {"index": position, "success": False, "error": error_code, "message": message}
+                continue
+            accepted.append((position, session))
+        
+        if accepted:
+            recorded = blockchain_service.record_attendance_batch([session for _, session in accepted])
+            
+            if not recorded[0].success:
+                return jsonify(create_error_response(
+                    "submission_failed",
+                    recorded[0].message,
+                    400
+                )), 400
+            
+            for (position, session), result in zip(accepted, recorded):
+                results[position] = {
+                    "index": position,
+                    "success": True,
+                    "block_index": result.block_index,
+                    "students_count": result.students_count,
+                    "class_id": session.class_id,
+                }
         
         response_data = {
-            "message": result,
-            "block_index": block_index_match,
-            "students_count": students_count,
-            "class_id": classroom.id,
+            "results": results,
+            "accepted": len(accepted),
+            "rejected": len(sessions) - len(accepted),
         }
         
         return jsonify(create_success_response(
             response_data,
-            "Attendance recorded successfully"
+            f"Recorded {len(accepted)} of {len(sessions)} sessions"
         )), 200
         
-    except ValidationError as err:
-        return jsonify(create_error_response(
-            "validation_error",
-            "Invalid request data",
-            400,
-            err.messages
-        )), 400
     except Exception as e:
-        logger.error(f"Error in submit_attendance: {str(e)}", exc_info=True)
+        logger.error(f"Error in submit_attendance_batch: {str(e)}", exc_info=True)
         return jsonify(create_error_response(
             "internal_error",
-            "Failed to submit attendance",
+            "Failed to submit attendance batch",
             500
         )), 500
 
@@ -624,11 +809,18 @@ def create_classroom():
 
 @api_v1.route('/classrooms', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get(include_classrooms=True)
 def list_classrooms():
-    """List all classrooms"""
+    """List all classrooms; ?view=summary returns counts without rosters"""
     try:
         classroom_service: ClassroomService = g.classroom_service
         
+        if request.args.get('view') == 'summary':
+            summaries = classroom_service.list_classroom_summaries()
+            return jsonify(create_success_response(
+                [summary.to_dict() for summary in summaries]
+            )), 200
+        
         classrooms = classroom_service.list_classrooms()
         
         response_data = []
@@ -650,6 +842,7 @@ def list_classrooms():
 
 @api_v1.route('/classrooms/<class_id>', methods=['GET'])
 @limiter.limit("30 per minute")
+@conditional_get(include_classrooms=True)
 def get_classroom(class_id: str):
     """Get classroom details including roster"""
     try:
@@ -797,12 +990,60 @@ def add_students_to_classroom(class_id: str):
         )), 500
 
 
+@api_v1.route('/classrooms/<class_id>/students/import', methods=['POST'])
+@limiter.limit("5 per minute")
+def import_students_to_classroom(class_id: str):
+    """Bulk-register students from a streamed CSV or NDJSON upload"""
+    try:
+        roster_format = detect_roster_format(request.mimetype, request.args.get('format'))
+        if roster_format is None:
+            return jsonify(create_error_response(
+                "unsupported_media_type",
+                "Upload must be text/csv or application/x-ndjson",
+                415
+            )), 415
+        
+        classroom_service: ClassroomService = g.classroom_service
+        
+        classroom = classroom_service.get_classroom(class_id.strip())
+        if not classroom:
+            return jsonify(create_error_response(
+                "not_found",
+                f"Classroom {class_id} not found",
+                404
+            )), 404
+        
+        report = classroom_service.import_students(
+            classroom.id,
+            iter_roster_rows(request.stream, roster_format)
+        )
+        
+        return jsonify(create_success_response(
+            report,
+            f"Imported {report['imported']} student(s), rejected {report['rejected']}"
+        )), 200
+        
+    except ValueError as e:
+        return jsonify(create_error_response(
+            "validation_error",
+            str(e),
+            400
+        )), 400
+    except Exception as e:
+        logger.error(f"Error in import_students_to_classroom: {str(e)}", exc_info=True)
+        return jsonify(create_error_response(
+            "internal_error",
+            "Failed to import students",
+            500
+        )), 500
+
+
 @api_v1.before_request
 def inject_services():
-    from src.services.blockchain_service import BlockchainService
-    from src.services.classroom_service import ClassroomService
+    from src.services.blockchain_service import get_blockchain_service
+    from src.services.classroom_service import get_classroom_service
     if not hasattr(g, 'blockchain_service'):
-        g.blockchain_service = BlockchainService()
+        g.blockchain_service = get_blockchain_service()
     if not hasattr(g, 'classroom_service'):
-        g.classroom_service = ClassroomService(seed=True)
+        g.classroom_service = get_classroom_service()
 
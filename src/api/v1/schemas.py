@@ -1,5 +1,11 @@
+import base64
+import binascii
+
 from marshmallow import Schema, fields, validate, ValidationError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+from src.blockchain.getBlock import RECORD_FIELDS, SUMMARY_FIELDS
+from src.utils.validators import RollNumberListField, validate_roll_number
 
 
 class ErrorResponseSchema(Schema):
@@ -84,8 +90,8 @@ class AttendanceSubmissionRequestSchema(Schema):
     date = fields.Date(required=True, format='%Y-%m-%d')
     year = fields.String(required=True, validate=validate.Length(min=1, max=50))
     class_id = fields.String(required=True, validate=validate.Length(min=1, max=64))
-    present_students = fields.List(
-        fields.String(validate=validate.Length(min=1, max=50)),
+    present_students = RollNumberListField(
+        allow_blank=False,
         required=True,
         validate=validate.Length(min=1, max=500, error="Must have between 1 and 500 students")
     )
@@ -114,7 +120,7 @@ class StudentSearchResponseSchema(Schema):
 
 # Classroom API Schemas
 class StudentProfileSchema(Schema):
-    roll_number = fields.String(required=True, validate=validate.Length(min=1, max=50))
+    roll_number = fields.String(required=True, validate=[validate.Length(min=1, max=50), validate_roll_number])
     name = fields.String(required=True, validate=validate.Length(min=1, max=200))
 
 
@@ -192,3 +198,92 @@ def create_paginated_response(
         }
     }
 
+
+
+CURSOR_DIRECTIONS = ("after", "before")
+
+
+def encode_cursor(direction: str, block_index: int) -> str:
+    token = f"{direction}:{block_index}".encode("ascii")
+    return base64.urlsafe_b64encode(token).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Return (direction, block_index); raises ValidationError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, _, index = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").partition(":")
+        block_index = int(index)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValidationError({"cursor": ["Malformed cursor"]})
+    if direction not in CURSOR_DIRECTIONS or block_index < 0:
+        raise ValidationError({"cursor": ["Malformed cursor"]})
+    return direction, block_index
+
+
+def decode_cursor_bounds(cursor: str) -> Tuple[Optional[int], Optional[int]]:
+    """Return (after, before) for a cursor query value; empty means the first page."""
+    if not cursor:
+        return None, None
+    direction, block_index = decode_cursor(cursor)
+    return (block_index, None) if direction == "after" else (None, block_index)
+
+
+def create_cursor_page(
+    records: list,
+    has_more: bool,
+    per_page: int,
+    after: Optional[int],
+    before: Optional[int]
+) -> Dict[str, Any]:
+    """Paginated response for a keyset page fetched with after/before bounds."""
+    next_cursor = prev_cursor = None
+    if records:
+        first_index, last_index = records[0]["block_index"], records[-1]["block_index"]
+        if before is not None:
+            next_cursor = encode_cursor("after", last_index)
+            prev_cursor = encode_cursor("before", first_index) if has_more else None
+        else:
+            next_cursor = encode_cursor("after", last_index) if has_more else None
+            prev_cursor = encode_cursor("before", first_index) if after is not None else None
+    return create_cursor_paginated_response(records, per_page, next_cursor, prev_cursor)
+
+
+def create_cursor_paginated_response(
+    data: list,
+    per_page: int,
+    next_cursor: Optional[str],
+    prev_cursor: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "data": data,
+        "pagination": {
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "has_next": next_cursor is not None,
+            "has_prev": prev_cursor is not None
+        }
+    }
+
+
+RECORD_VIEWS = {"full": None, "summary": SUMMARY_FIELDS}
+
+
+def parse_record_fields(fields_param: Optional[str], view: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Resolve ?fields=a,b / ?view=summary into the record keys to build, or
+    None for full records. block_index is always kept since cursors use it.
+    """
+    if fields_param:
+        requested = {field.strip() for field in fields_param.split(",") if field.strip()}
+        unknown = sorted(requested.difference(RECORD_FIELDS))
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}"]})
+        requested.add("block_index")
+        return tuple(field for field in RECORD_FIELDS if field in requested)
+    if view:
+        if view not in RECORD_VIEWS:
+            raise ValidationError({"view": [f"Must be one of: {', '.join(RECORD_VIEWS)}"]})
+        return RECORD_VIEWS[view]
+    return None
@@ -2,20 +2,26 @@ import datetime as dt
 import logging
 from flask import Flask, request, render_template, jsonify
 from flask_cors import CORS
+from marshmallow import ValidationError
 from typing import Dict, Any
 
-from src.services.blockchain_service import BlockchainService
+from src.services.blockchain_service import get_blockchain_service
+from src.models.attendance_models import AttendanceSession
 from src.config.config import Config
 from src.utils.logger_config import setup_logging
 from src.utils.validators import validate_attendance_form, validate_search_form, sanitize_string
 from src.services.auth_service import auth_service
 from src.utils.rate_limiter import init_rate_limiter
+from src.utils.json_provider import FastJSONProvider
 from src.api.v1.routes import api_v1
+from src.api.v1.caching import cached_response
+from src.api.v1.schemas import parse_record_fields
 
 setup_logging(Config.LOG_FILE)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 
 if Config.ENABLE_CSRF:
@@ -28,7 +34,7 @@ else:
 CORS(app, resources={
     r"/api/*": {"origins": ["http://localhost:3000", "http://localhost:5173"]},
     r"/*": {"origins": ["http://localhost:3000", "http://localhost:5173"]}
-})
+}, expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"])
 
 limiter = init_rate_limiter(app)
 
@@ -46,7 +52,7 @@ if not is_prod_valid and not Config.DEBUG:
     logger.error(f"Production configuration invalid: {prod_error}")
     raise ValueError(f"Invalid production configuration: {prod_error}")
 
-blockchain_service = BlockchainService()
+blockchain_service = get_blockchain_service()
 
 from src.api.v1.routes import set_limiter
 set_limiter(limiter)
@@ -66,10 +72,9 @@ logger.info(f"Blockchain initialized with {blockchain_service.get_block_count()}
 
 @app.after_request
 def after_request(response):
-    response.headers.add(
-        'Cache-Control',
-        'no-store, no-cache, must-revalidate, post-check=0, pre-check=0'
-    )
+    # Read endpoints with ETags set their own short private caching
+    if 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0'
     return response
 
 
@@ -155,26 +160,15 @@ def parse_request():
                     result=f"Error: {error_msg}"
                 )
 
-            form_dict_with_rolls = {f"roll_no{i+1}": roll for i, roll in enumerate(validated_data["present_students"])}
-            form_dict_with_rolls.update({
-                "teacher_name": validated_data["teacher_name"],
-                "date": validated_data["date"].strftime("%Y-%m-%d"),
-                "course": validated_data["course"],
-                "year": validated_data["year"],
-            })
-
-            attendance_payload = {
-                "teacher_name": validated_data["teacher_name"],
-                "date": validated_data["date"].strftime("%Y-%m-%d"),
-                "course": validated_data["course"],
-                "year": validated_data["year"],
-            }
-
-            success, result = blockchain_service.add_attendance_block(
-                form_dict_with_rolls, attendance_payload
-            )
-
-            if success and "added" in result.lower():
+            outcome = blockchain_service.record_attendance(AttendanceSession(
+                teacher_name=validated_data["teacher_name"],
+                date=validated_data["date"].strftime("%Y-%m-%d"),
+                course=validated_data["course"],
+                year=validated_data["year"],
+                present_students=validated_data["present_students"],
+            ))
+            result = outcome.message
+            if outcome.success:
                 result += " Blockchain automatically saved."
 
             return render_template("result.html", result=result)
@@ -335,7 +329,11 @@ def api_stats():
 @auth_service.require_auth("read")
 def api_records():
     try:
-        records = blockchain_service.get_all_records()
+        fields = parse_record_fields(request.args.get('fields'), request.args.get('view'))
+    except ValidationError as err:
+        return jsonify({"error": "Invalid query parameters", "details": err.messages}), 400
+    try:
+        records = blockchain_service.get_all_records(fields=fields)
         return jsonify({"records": records, "count": len(records)})
     except Exception as e:
         logger.error(f"Error in api_records: {str(e)}", exc_info=True)
@@ -375,12 +373,12 @@ def api_export(format):
 def api_report():
     try:
         format_type = request.args.get('format', 'json')
-        report = blockchain_service.generate_report(format_type)
-        
-        if format_type == 'text':
-            return report, 200, {'Content-Type': 'text/plain'}
-        else:
-            return report, 200, {'Content-Type': 'application/json'}
+        return cached_response(
+            "legacy_report",
+            lambda: blockchain_service.generate_report(format_type).encode("utf-8"),
+            variant=format_type,
+            mimetype='text/plain' if format_type == 'text' else 'application/json',
+        )
     except Exception as e:
         logger.error(f"Error in api_report: {str(e)}", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,219 @@
+"""
+ASGI entry point.
+
+Serves the read-heavy endpoints (records, student search, classroom listing)
+from the async database services so one worker can hold many slow clients
+without a thread each; every other route is delegated to the Flask app.
+The block event stream (src.api.v1.events) is always served here.
+
+    WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn --config gunicorn_config.py src.asgi:app
+
+The async read path is only used with USE_DATABASE=True and ASYNC_READS=True
+(the default for uvicorn workers); otherwise every other request goes to Flask. Flask-Limiter does not see requests served here.
+"""
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from marshmallow import ValidationError
+
+from src.api.v1.schemas import (
+    PaginationSchema,
+    create_cursor_page,
+    create_error_response,
+    create_paginated_response,
+    create_success_response,
+    decode_cursor_bounds,
+    parse_record_fields,
+)
+from src.api.v1.events import EVENTS_PATH, BlockEventStream
+from src.app import app as flask_app
+from src.config.config import Config
+from src.services.blockchain_service import get_blockchain_service
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class AsyncReadAPI:
+    def __init__(self, wsgi_app, blockchain_service=None, classroom_repository=None):
+        self._fallback = WsgiToAsgi(wsgi_app) if WsgiToAsgi else None
+        self._blockchain_service = blockchain_service
+        self._classroom_repository = classroom_repository
+        self._routes: List[Tuple[re.Pattern, Callable]] = [
+            (re.compile(r"^/api/v1/records$"), self.get_records),
+            (re.compile(r"^/api/v1/students/(?P<roll_no>[^/]+)$"), self.search_student),
+            (re.compile(r"^/api/v1/classrooms$"), self.list_classrooms),
+            (re.compile(r"^/api/v1/classrooms/(?P<class_id>[^/]+)$"), self.get_classroom),
+        ]
+
+    @property
+    def async_enabled(self) -> bool:
+        return self._blockchain_service is not None and self._classroom_repository is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] == EVENTS_PATH:
+            await BlockEventStream(get_blockchain_service(), send).run(scope, receive, self._query(scope))
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET" and self.async_enabled:
+            for pattern, handler in self._routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    params = {key: unquote(value) for key, value in match.groupdict().items()}
+                    await self._dispatch(handler, scope, send, params)
+                    return
+
+        if self._fallback is None:
+            await self._send_json(send, 503, create_error_response(
+                "service_unavailable",
+                "asgiref is required to serve Flask routes over ASGI",
+                503
+            ))
+            return
+        await self._fallback(scope, receive, send)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._blockchain_service is not None:
+                    await self._blockchain_service.db.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    def _query(scope: Scope) -> Dict[str, str]:
+        return {
+            key: values[-1]
+            for key, values in parse_qs(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True).items()
+        }
+
+    async def _dispatch(self, handler: Callable, scope: Scope, send: Send, params: Dict[str, str]) -> None:
+        query = self._query(scope)
+        try:
+            status, body = await handler(query, **params)
+        except Exception as e:
+            logger.error(f"Error in async {handler.__name__}: {str(e)}", exc_info=True)
+            status, body = 500, create_error_response("internal_error", "Failed to process request", 500)
+        await self._send_json(send, status, body)
+
+    async def _send_json(self, send: Send, status: int, body: Dict[str, Any]) -> None:
+        payload = flask_app.json.dumps(body).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("latin-1")),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def get_records(self, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        try:
+            pagination = PaginationSchema().load({
+                "page": query.get("page") or 1,
+                "per_page": query.get("per_page") or 10,
+            })
+            fields = parse_record_fields(query.get("fields"), query.get("view"))
+            after, before = decode_cursor_bounds(query.get("cursor", ""))
+        except ValidationError as err:
+            return 400, create_error_response(
+                "validation_error", "Invalid pagination parameters", 400, err.messages
+            )
+
+        filters = {
+            key: query.get(key, "").strip()
+            for key in ("teacher_name", "course", "date", "year")
+        }
+        if "cursor" in query:
+            records, has_more = await self._blockchain_service.get_records_page(
+                filters, pagination["per_page"], after=after, before=before, fields=fields
+            )
+            return 200, create_success_response(
+                create_cursor_page(records, has_more, pagination["per_page"], after, before)
+            )
+
+        records = await self._blockchain_service.get_all_records(filters, fields)
+
+        page = pagination["page"]
+        per_page = pagination["per_page"]
+        start = (page - 1) * per_page
+        return 200, create_success_response(
+            create_paginated_response(records[start:start + per_page], page, per_page, len(records))
+        )
+
+    async def search_student(self, query: Dict[str, str], roll_no: str) -> Tuple[int, Dict[str, Any]]:
+        roll_no = roll_no.strip()
+        if not roll_no:
+            return 400, create_error_response("validation_error", "Roll number is required", 400)
+        records = await self._blockchain_service.search_by_student(roll_no)
+        return 200, create_success_response({
+            "roll_no": roll_no,
+            "records": records,
+            "total_records": len(records),
+        })
+
+    async def list_classrooms(self, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        if query.get("view") == "summary":
+            summaries = await self._classroom_repository.list_classroom_summaries()
+            return 200, create_success_response([summary.to_dict() for summary in summaries])
+
+        response_data = []
+        for classroom in await self._classroom_repository.list_classrooms():
+            classroom_dict = classroom.to_dict()
+            classroom_dict["current_student_count"] = len(classroom.students)
+            response_data.append(classroom_dict)
+        return 200, create_success_response(response_data)
+
+    async def get_classroom(self, query: Dict[str, str], class_id: str) -> Tuple[int, Dict[str, Any]]:
+        classroom = await self._classroom_repository.get_classroom(class_id.strip())
+        if not classroom:
+            return 404, create_error_response("not_found", f"Classroom {class_id} not found", 404)
+        response_data = classroom.to_dict()
+        response_data["current_student_count"] = len(classroom.students)
+        return 200, create_success_response(response_data)
+
+
+def create_asgi_app(wsgi_app=flask_app, database_url: Optional[str] = None) -> AsyncReadAPI:
+    if database_url is None and not (Config.USE_DATABASE and Config.ASYNC_READS):
+        # Without ASYNC_READS the sync pool was sized for the whole worker budget
+        logger.info("USE_DATABASE or ASYNC_READS is off; ASGI app delegates every route but the event stream to Flask")
+        return AsyncReadAPI(wsgi_app)
+
+    try:
+        from src.services.async_database_service import (
+            AsyncDatabaseService,
+            AsyncDatabaseBlockchainService,
+            AsyncDatabaseClassroomRepository,
+        )
+        async_db = AsyncDatabaseService(database_url)
+    except ImportError as e:
+        logger.warning(f"Async database driver not available ({e}); ASGI app delegates to Flask")
+        return AsyncReadAPI(wsgi_app)
+
+    return AsyncReadAPI(
+        wsgi_app,
+        blockchain_service=AsyncDatabaseBlockchainService(async_db),
+        classroom_repository=AsyncDatabaseClassroomRepository(async_db),
+    )
+
+
+app = create_asgi_app()
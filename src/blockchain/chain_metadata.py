@@ -0,0 +1,51 @@
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from src.blockchain.block import Block
+
+
+def is_attendance_data(index: int, data: Any) -> bool:
+    return index > 0 and isinstance(data, dict) and data.get("type") == "attendance"
+
+
+def is_attendance_block(block: Block) -> bool:
+    return is_attendance_data(block.index, block.data)
+
+
+@dataclass
+class ChainMetadata:
+    """
+    Running counters for a chain, maintained on every append so that
+    stats and block counts never have to walk the whole chain.
+
+    height is the number of blocks in the chain (genesis included).
+    """
+    height: int = 0
+    tip_index: Optional[int] = None
+    tip_hash: Optional[str] = None
+    attendance_blocks: int = 0
+    total_attendance_records: int = 0
+
+    @classmethod
+    def from_chain(cls, chain: List[Block]) -> "ChainMetadata":
+        metadata = cls()
+        for block in chain:
+            metadata.record_block(block)
+        return metadata
+
+    def record_block(self, block: Block) -> None:
+        self.record(block.index, block.hash, block.data)
+
+    def record(self, index: int, block_hash: str, data: Any) -> None:
+        self.height += 1
+        self.tip_index = index
+        self.tip_hash = block_hash
+        if is_attendance_data(index, data):
+            self.attendance_blocks += 1
+            self.total_attendance_records += len(data.get("present_students", []))
+
+    def copy(self) -> "ChainMetadata":
+        return ChainMetadata(**asdict(self))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
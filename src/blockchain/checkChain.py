@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional, Tuple
 from src.blockchain.block import Block
+from src.blockchain.chain_metadata import ChainMetadata
 
 
 def check_integrity(chain: List[Block]) -> str:
@@ -71,23 +72,23 @@ def get_blockchain_stats(chain: List[Block]) -> Dict[str, Any]:
     if not chain:
         return {"error": "Empty blockchain"}
 
-    stats: Dict[str, Any] = {
-        "total_blocks": len(chain),
-        "genesis_block": chain[0].to_dict() if chain else None,
-        "latest_block": chain[-1].to_dict() if chain else None,
-        "attendance_blocks": 0,
-        "total_attendance_records": 0
-    }
+    return get_blockchain_stats_from_metadata(
+        ChainMetadata.from_chain(chain), chain[0], chain[-1]
+    )
+
 
-    for block in chain:
-        if (
-            block.index > 0
-            and isinstance(block.data, dict)
-            and block.data.get("type") == "attendance"
-        ):
-            stats["attendance_blocks"] += 1
-            stats["total_attendance_records"] += len(
-                block.data.get("present_students", [])
-            )
-
-    return stats
+def get_blockchain_stats_from_metadata(
+    metadata: ChainMetadata,
+    genesis_block: Optional[Block],
+    latest_block: Optional[Block],
+) -> Dict[str, Any]:
+    if not metadata.height:
+        return {"error": "Empty blockchain"}
+
+    return {
+        "total_blocks": metadata.height,
+        "genesis_block": genesis_block.to_dict() if genesis_block else None,
+        "latest_block": latest_block.to_dict() if latest_block else None,
+        "attendance_blocks": metadata.attendance_blocks,
+        "total_attendance_records": metadata.total_attendance_records
+    }
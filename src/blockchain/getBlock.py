@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, Union
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
 from src.blockchain.block import Block
 
 
@@ -40,29 +41,168 @@ def find_records(
         return -1
 
 
-def get_all_attendance_records(blockchain: List[Block]) -> List[Dict[str, Any]]:
+RECORD_FIELDS = (
+    "block_index",
+    "timestamp",
+    "teacher_name",
+    "date",
+    "course",
+    "year",
+    "class_id",
+    "class_name",
+    "present_students",
+    "student_count",
+)
+# Everything but the roster, which dominates the size of a record
+SUMMARY_FIELDS = tuple(field for field in RECORD_FIELDS if field != "present_students")
+
+_FIELD_GETTERS = {
+    "block_index": lambda index, timestamp, data: index,
+    "timestamp": lambda index, timestamp, data: timestamp,
+    "teacher_name": lambda index, timestamp, data: data.get("teacher_name", ""),
+    "date": lambda index, timestamp, data: data.get("date", ""),
+    "course": lambda index, timestamp, data: data.get("course", ""),
+    "year": lambda index, timestamp, data: data.get("year", ""),
+    "class_id": lambda index, timestamp, data: data.get("class_id"),
+    "class_name": lambda index, timestamp, data: data.get("class_name"),
+    "present_students": lambda index, timestamp, data: data.get("present_students", []),
+    "student_count": lambda index, timestamp, data: len(data.get("present_students", [])),
+}
+
+
+def attendance_record(
+    index: int, timestamp: Any, data: Dict[str, Any], fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Build a record; with fields, only those keys are computed."""
+    if fields is not None:
+        return {field: _FIELD_GETTERS[field](index, timestamp, data) for field in fields}
+    present_students = data.get("present_students", [])
+    return {
+        "block_index": index,
+        "timestamp": timestamp,
+        "teacher_name": data.get("teacher_name", ""),
+        "date": data.get("date", ""),
+        "course": data.get("course", ""),
+        "year": data.get("year", ""),
+        "class_id": data.get("class_id"),
+        "class_name": data.get("class_name"),
+        "present_students": present_students,
+        "student_count": len(present_students)
+    }
+
+
+def get_all_attendance_records(
+    blockchain: List[Block],
+    filters: Optional[Dict[str, str]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    active = _active_filters(filters)
     records = []
     for block in blockchain:
         if (
             block.index > 0
             and isinstance(block.data, dict)
             and block.data.get("type") == "attendance"
+            and (not active or _matches_filters(block.data, active))
         ):
-            records.append({
-                "block_index": block.index,
-                "timestamp": block.timestamp,
-                "teacher_name": block.data.get("teacher_name", ""),
-                "date": block.data.get("date", ""),
-                "course": block.data.get("course", ""),
-                "year": block.data.get("year", ""),
-                "class_id": block.data.get("class_id"),
-                "class_name": block.data.get("class_name"),
-                "present_students": block.data.get("present_students", []),
-                "student_count": len(block.data.get("present_students", []))
-            })
+            records.append(attendance_record(block.index, block.timestamp, block.data, fields))
     return records
 
 
+def filter_attendance_records(
+    records: List[Dict[str, Any]], filters: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """Keep records whose fields exactly match every non-empty filter value."""
+    active = _active_filters(filters)
+    if not active:
+        return records
+    return [record for record in records if _matches_filters(record, active)]
+
+
+def matches_filters(data: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """Whether a record (or raw block data) matches every non-empty filter value."""
+    return _matches_filters(data, _active_filters(filters))
+
+
+def _active_filters(filters: Optional[Dict[str, str]]) -> Dict[str, str]:
+    return {key: value for key, value in (filters or {}).items() if value}
+
+
+def _matches_filters(record: Dict[str, Any], active: Dict[str, str]) -> bool:
+    # Filter keys are block data keys, so this works on records and raw block data alike
+    return all(str(record.get(key, '')).strip() == value for key, value in active.items())
+
+
+def take_attendance_records(
+    blocks: Iterable[Any],
+    filters: Dict[str, str],
+    limit: int,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Collect up to limit matching attendance records from blocks (anything
+    with index, timestamp and data), in iteration order. Stops at the first
+    match past the limit and reports whether it exists.
+    """
+    active = _active_filters(filters)
+    records = []
+    for block in blocks:
+        if block.index <= 0 or not isinstance(block.data, dict) or block.data.get("type") != "attendance":
+            continue
+        if active and not _matches_filters(block.data, active):
+            continue
+        if len(records) == limit:
+            return records, True
+        records.append(attendance_record(block.index, block.timestamp, block.data, fields))
+    return records, False
+
+
+def find_block(blockchain: List[Block], block_index: int) -> Optional[Block]:
+    position = bisect_left(blockchain, block_index, key=lambda block: block.index)
+    if position < len(blockchain) and blockchain[position].index == block_index:
+        return blockchain[position]
+    return None
+
+
+def attendance_records_page(
+    blockchain: List[Block],
+    filters: Dict[str, str],
+    limit: int,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Keyset page of attendance records ordered by block_index: up to limit
+    records with block_index > after (or < before), ascending, and whether
+    more lie beyond them. The scan starts at the cursor, so a page touches
+    O(limit) blocks unless filters skip most of them.
+    """
+    if before is not None:
+        start = bisect_left(blockchain, before, key=lambda block: block.index)
+        records, has_more = take_attendance_records(
+            (blockchain[position] for position in range(start - 1, -1, -1)), filters, limit, fields
+        )
+        records.reverse()
+        return records, has_more
+
+    start = 0 if after is None else bisect_right(blockchain, after, key=lambda block: block.index)
+    return take_attendance_records(
+        (blockchain[position] for position in range(start, len(blockchain))), filters, limit, fields
+    )
+
+
+def student_attendance_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "date": data.get("date", ""),
+        "course": data.get("course", ""),
+        "year": data.get("year", ""),
+        "teacher_name": data.get("teacher_name", ""),
+        "class_id": data.get("class_id"),
+        "class_name": data.get("class_name"),
+    }
+
+
 def search_by_student(blockchain: List[Block], roll_no: str) -> List[Dict[str, Any]]:
     student_records = []
     for block in blockchain:
@@ -72,12 +212,5 @@ def search_by_student(blockchain: List[Block], roll_no: str) -> List[Dict[str, A
             and block.data.get("type") == "attendance"
         ):
             if roll_no in block.data.get("present_students", []):
-                student_records.append({
-                    "date": block.data.get("date", ""),
-                    "course": block.data.get("course", ""),
-                    "year": block.data.get("year", ""),
-                    "teacher_name": block.data.get("teacher_name", ""),
-                    "class_id": block.data.get("class_id"),
-                    "class_name": block.data.get("class_name"),
-                })
+                student_records.append(student_attendance_record(block.data))
     return student_records
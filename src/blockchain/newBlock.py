@@ -4,13 +4,17 @@ import copy
 from typing import List, Dict, Any
 
 
-def next_block(last_block: Block, data: Dict[str, Any]) -> Block:
+def next_block(last_block: Block, data: Dict[str, Any], copy_data: bool = True) -> Block:
+    """
+    Build the block after last_block. Pass copy_data=False when data was
+    freshly built for this block and nothing else holds a reference to it.
+    """
     if not last_block:
         raise ValueError("Previous block cannot be None")
 
     this_index = last_block.index + 1
     this_timestamp = dt.datetime.now()
-    this_data = copy.deepcopy(data)
+    this_data = copy.deepcopy(data) if copy_data else data
     this_prev_hash = last_block.hash
     return Block(this_index, this_timestamp, this_data, this_prev_hash)
 
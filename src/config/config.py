@@ -1,5 +1,6 @@
 import os
 import logging
+import multiprocessing
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -17,6 +18,13 @@ class Config:
     CLASSES_FILE: str = os.getenv("CLASSES_FILE", "classes_data.json")
     BACKUP_DIR: str = os.getenv("BACKUP_DIR", "blockchain_backups")
     
+    # Debounce for classes file writes; 0 writes on every change
+    CLASSES_WRITE_DELAY_MS: int = int(os.getenv("CLASSES_WRITE_DELAY_MS", "200"))
+    
+    # Bulk roster import: rows validated and written per chunk
+    ROSTER_IMPORT_CHUNK_SIZE: int = int(os.getenv("ROSTER_IMPORT_CHUNK_SIZE", "500"))
+    ROSTER_IMPORT_MAX_ERRORS: int = int(os.getenv("ROSTER_IMPORT_MAX_ERRORS", "100"))
+    
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: Optional[str] = os.getenv("LOG_FILE", None)
     
@@ -27,6 +35,86 @@ class Config:
     
     USE_DATABASE: bool = os.getenv("USE_DATABASE", "False").lower() == "true"
     
+    # Async driver URL for the ASGI read path; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL", None)
+    # Serve the read endpoints from the async engine under src.asgi (with
+    # USE_DATABASE). Each worker then holds a sync and an async pool, and
+    # DB_MAX_CONNECTIONS is split between them. On by default for uvicorn workers.
+    ASYNC_READS: bool = os.getenv(
+        "ASYNC_READS", str("uvicorn" in os.getenv("WORKER_CLASS", "").lower())
+    ).lower() == "true"
+    
+    # Gunicorn worker count; server-side connection pools are sized from it
+    WORKERS: int = int(os.getenv("WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+    
+    # Postgres/MySQL pooling. DB_POOL_SIZE=0 derives the pool from
+    # DB_MAX_CONNECTIONS split across WORKERS, minus DB_MAX_OVERFLOW, so
+    # pool plus overflow across all workers stays within the limit.
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "0"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "0"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    
+    # SQLite tuning
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+    
+    # Password hashing: bcrypt work factor, cap on concurrent hashes per
+    # worker (0 hashes on the request thread) and how long a successful
+    # verification is remembered (0 disables the cache)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_MAX_WORKERS: int = int(os.getenv("BCRYPT_MAX_WORKERS", "0"))
+    PASSWORD_CACHE_TTL_SECONDS: int = int(os.getenv("PASSWORD_CACHE_TTL_SECONDS", "300"))
+    PASSWORD_CACHE_SIZE: int = int(os.getenv("PASSWORD_CACHE_SIZE", "1024"))
+    
+    # User storage: memory, file (USERS_FILE) or database; defaults to
+    # database with USE_DATABASE and file otherwise
+    USER_STORE: str = os.getenv("USER_STORE", "")
+    USERS_FILE: str = os.getenv("USERS_FILE", "users_data.json")
+    USER_CACHE_CHECK_SECONDS: float = float(os.getenv("USER_CACHE_CHECK_SECONDS", "1"))
+    
+    # Verified JWTs are cached until their exp, capped at this many seconds
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+    
+    # Rate limit counters. memory:// is per worker; sqlite:///ratelimits.db
+    # shares counters between workers on one host
+    RATELIMIT_STORAGE_URI: str = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    # False turns off both the route limits and the per-user token buckets
+    # (load testing only)
+    RATELIMIT_ENABLED: bool = os.getenv("RATELIMIT_ENABLED", "True").lower() == "true"
+    RATELIMIT_STRATEGY: str = os.getenv("RATELIMIT_STRATEGY", "fixed-window")
+    
+    # Per-user token buckets as role=requests_per_minute/burst; callers
+    # without a valid token use the anonymous budget, keyed by address.
+    # Buckets are per worker: with N workers a user gets up to N x burst
+    RATE_LIMIT_ROLE_BUDGETS: str = os.getenv(
+        "RATE_LIMIT_ROLE_BUDGETS",
+        "admin=120/30,teacher=30/10,student=10/5,viewer=10/5,anonymous=10/10"
+    )
+    
+    # Sessions accepted by one POST /api/v1/attendance/batch
+    ATTENDANCE_BATCH_MAX_SESSIONS: int = int(os.getenv("ATTENDANCE_BATCH_MAX_SESSIONS", "100"))
+    
+    # max-age for private caching of ETag-tagged read responses
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "5"))
+    
+    # Upper bound on rendered stats/analytics/report bodies kept per worker
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    
+    # Block event stream (served by src.asgi)
+    SSE_BUFFER_SIZE: int = int(os.getenv("SSE_BUFFER_SIZE", "256"))
+    SSE_MAX_SUBSCRIBERS: int = int(os.getenv("SSE_MAX_SUBSCRIBERS", "1000"))
+    SSE_POLL_SECONDS: float = float(os.getenv("SSE_POLL_SECONDS", "2"))
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_REPLAY_LIMIT: int = int(os.getenv("SSE_REPLAY_LIMIT", "1000"))
+    
     ENABLE_CSRF: bool = os.getenv("ENABLE_CSRF", "False").lower() == "true"
     
     @classmethod
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class AttendanceSession:
+    """One class session to record as an attendance block."""
+    teacher_name: str
+    date: str
+    course: str
+    year: str
+    present_students: List[str]
+    class_id: Optional[str] = None
+    class_name: Optional[str] = None
+
+    def to_block_data(self) -> Dict[str, Any]:
+        return {
+            "type": "attendance",
+            "teacher_name": self.teacher_name,
+            "date": self.date,
+            "course": self.course,
+            "year": self.year,
+            "class_id": self.class_id,
+            "class_name": self.class_name,
+            "present_students": list(self.present_students),
+        }
+
+
+@dataclass
+class AttendanceResult:
+    success: bool
+    message: str
+    block_index: Optional[int] = None
+    students_count: int = 0
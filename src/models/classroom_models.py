@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional
 
 
 def _parse_datetime(value: Any) -> datetime:
@@ -16,6 +16,19 @@ def _parse_datetime(value: Any) -> datetime:
     raise ValueError(f"Unsupported datetime value: {value}")
 
 
+def normalize_roll_number(roll_number: str) -> str:
+    return roll_number.strip().lower()
+
+
+def build_roll_index(students: Iterable[Dict[str, Any]]) -> frozenset:
+    """Normalized roll numbers of a stored roster (list of student dicts)."""
+    return frozenset(
+        normalize_roll_number(str(student.get("roll_number", "")))
+        for student in students
+        if str(student.get("roll_number", "")).strip()
+    )
+
+
 @dataclass
 class StudentProfile:
     roll_number: str
@@ -44,6 +57,15 @@ class Classroom:
     students: List[StudentProfile] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+    # Normalized roll numbers of the roster. Supplied by the repository or
+    # built on first use; dropped when students is reassigned. Code that
+    # edits students in place must call invalidate_roll_index().
+    _roll_index: Optional[AbstractSet[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "students":
+            super().__setattr__("_roll_index", None)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -57,8 +79,9 @@ class Classroom:
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Classroom":
-        return cls(
+    def from_dict(cls, data: Dict[str, Any], roll_index: Optional[frozenset] = None) -> "Classroom":
+        """roll_index, when given, must be build_roll_index(data["students"])."""
+        classroom = cls(
             id=data.get("id", ""),
             name=data.get("name", ""),
             description=data.get("description", "") or "",
@@ -67,8 +90,69 @@ class Classroom:
             created_at=_parse_datetime(data.get("created_at")),
             updated_at=_parse_datetime(data.get("updated_at")),
         )
+        classroom._roll_index = roll_index
+        return classroom
+
+    def summary(self) -> "ClassroomSummary":
+        return ClassroomSummary(
+            id=self.id,
+            name=self.name,
+            description=self.description,
+            expected_student_count=self.expected_student_count,
+            current_student_count=len(self.students),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    def roll_index(self) -> AbstractSet[str]:
+        if self._roll_index is None:
+            self._roll_index = {
+                normalize_roll_number(student.roll_number)
+                for student in self.students
+                if student.roll_number
+            }
+        return self._roll_index
+
+    def invalidate_roll_index(self) -> None:
+        self._roll_index = None
 
     def has_roll_number(self, roll_number: str) -> bool:
-        normalized = roll_number.strip().lower()
-        return any(student.roll_number.strip().lower() == normalized for student in self.students)
+        return normalize_roll_number(roll_number) in self.roll_index()
+
+    def missing_roll_numbers(self, roll_numbers: Iterable[str]) -> List[str]:
+        index = self.roll_index()
+        return [roll for roll in roll_numbers if normalize_roll_number(roll) not in index]
+
+    def add_students(self, students: Iterable[StudentProfile]) -> None:
+        index = self.roll_index()
+        if not isinstance(index, set):
+            # A repository-supplied index is shared and frozen; extend a copy
+            index = set(index)
+        for student in students:
+            self.students.append(student)
+            if student.roll_number:
+                index.add(normalize_roll_number(student.roll_number))
+        self._roll_index = index
+
+
+@dataclass
+class ClassroomSummary:
+    """Classroom listing entry without the roster."""
+    id: str
+    name: str
+    description: str = ""
+    expected_student_count: int = 0
+    current_student_count: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "expected_student_count": self.expected_student_count,
+            "current_student_count": self.current_student_count,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
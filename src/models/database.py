@@ -1,5 +1,6 @@
 from sqlalchemy import (
     create_engine,
+    event,
     Column,
     Integer,
     String,
@@ -8,15 +9,20 @@ from sqlalchemy import (
     JSON,
     ForeignKey,
     UniqueConstraint,
+    func,
+    select,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, relationship, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.sql import Select
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 import logging
 
 from src.config.config import Config
+from src.models.classroom_models import ClassroomSummary
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +52,28 @@ class BlockModel(Base):
         }
 
 
+class ChainMetadataModel(Base):
+    """Single-row table holding running chain counters, updated with every append."""
+    __tablename__ = 'chain_metadata'
+
+    id = Column(Integer, primary_key=True)
+    height = Column(Integer, nullable=False, default=0)
+    tip_index = Column(Integer, nullable=True)
+    tip_hash = Column(String(64), nullable=True)
+    attendance_blocks = Column(Integer, nullable=False, default=0)
+    total_attendance_records = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'height': self.height,
+            'tip_index': self.tip_index,
+            'tip_hash': self.tip_hash,
+            'attendance_blocks': self.attendance_blocks,
+            'total_attendance_records': self.total_attendance_records,
+        }
+
+
 class UserModel(Base):
     __tablename__ = 'users'
 
@@ -77,7 +105,12 @@ class ClassroomModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    students = relationship("StudentModel", back_populates="classroom", cascade="all, delete-orphan")
+    students = relationship(
+        "StudentModel",
+        back_populates="classroom",
+        cascade="all, delete-orphan",
+        order_by="StudentModel.roll_number",
+    )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -116,40 +149,191 @@ class StudentModel(Base):
         }
 
 
+def classroom_summaries_query() -> Select:
+    """Classrooms with their student counts, oldest first; shared by the sync and async services."""
+    return (
+        select(
+            ClassroomModel.id,
+            ClassroomModel.name,
+            ClassroomModel.description,
+            ClassroomModel.expected_student_count,
+            ClassroomModel.created_at,
+            ClassroomModel.updated_at,
+            func.count(StudentModel.id),
+        )
+        .outerjoin(StudentModel, StudentModel.classroom_id == ClassroomModel.id)
+        .group_by(ClassroomModel.id)
+        .order_by(ClassroomModel.created_at.asc())
+    )
+
+
+def classroom_summaries_from_rows(rows: Iterable[Any]) -> List[ClassroomSummary]:
+    return [
+        ClassroomSummary(
+            id=class_id,
+            name=name,
+            description=description or '',
+            expected_student_count=expected or 0,
+            current_student_count=count,
+            created_at=created_at or datetime.utcnow(),
+            updated_at=updated_at or datetime.utcnow(),
+        )
+        for class_id, name, description, expected, created_at, updated_at, count in rows
+    ]
+
+
+def _is_sqlite_memory(database: Optional[str]) -> bool:
+    return not database or database == ':memory:' or database.startswith('file::memory:')
+
+
+def server_max_overflow() -> int:
+    return max(0, Config.DB_MAX_OVERFLOW)
+
+
+def engines_per_worker() -> int:
+    """Server connection pools in each worker: the sync engine, plus the async one under src.asgi."""
+    return 2 if Config.USE_DATABASE and Config.ASYNC_READS else 1
+
+
+def server_pool_size() -> int:
+    """Pool size for one engine, so that pools and overflow of every engine in every worker fit DB_MAX_CONNECTIONS."""
+    if Config.DB_POOL_SIZE > 0:
+        return Config.DB_POOL_SIZE
+    per_engine = Config.DB_MAX_CONNECTIONS // max(1, Config.WORKERS) // engines_per_worker()
+    return max(2, per_engine - server_max_overflow())
+
+
+def build_engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Engine keyword arguments for the backend behind database_url.
+
+    SQLite gets a small reader pool (WAL lets readers run alongside the
+    writer); server databases get a pool sized so that every gunicorn worker
+    together, overflow included, stays within DB_MAX_CONNECTIONS, plus a
+    statement timeout.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {
+        'echo': False,
+        'query_cache_size': Config.DB_STATEMENT_CACHE_SIZE,
+    }
+
+    if backend == 'sqlite':
+        options['connect_args'] = {
+            'check_same_thread': False,
+            'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+        if _is_sqlite_memory(url.database):
+            options['poolclass'] = StaticPool
+        else:
+            options['poolclass'] = QueuePool
+            options['pool_size'] = Config.SQLITE_READ_POOL_SIZE
+            options['max_overflow'] = 0
+            options['pool_timeout'] = Config.DB_POOL_TIMEOUT
+        return options
+
+    options.update({
+        'poolclass': QueuePool,
+        'pool_size': server_pool_size(),
+        'max_overflow': server_max_overflow(),
+        'pool_timeout': Config.DB_POOL_TIMEOUT,
+        'pool_recycle': Config.DB_POOL_RECYCLE,
+        'pool_pre_ping': True,
+    })
+
+    if backend == 'postgresql':
+        connect_args: Dict[str, Any] = {
+            'options': f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT_MS}",
+        }
+        if url.get_driver_name() == 'psycopg':
+            # psycopg 3 prepares statements server-side after this many executions
+            connect_args['prepare_threshold'] = 5
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, writer: bool = False) -> None:
+    """
+    Configure every new SQLite connection. The writer connection also opens
+    transactions with BEGIN IMMEDIATE so concurrent writers queue on the
+    busy timeout instead of failing on lock upgrade.
+    """
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        if writer:
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={Config.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={Config.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(Config.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(Config.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.close()
+
+    if writer:
+        @event.listens_for(engine, 'begin')
+        def _on_begin(connection):
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
 class DatabaseService:
     def __init__(self, database_url: Optional[str] = None):
         if database_url is None:
             database_url = Config.DATABASE_URL if hasattr(Config, 'DATABASE_URL') else 'sqlite:///blockendance.db'
-        
-        self.engine = create_engine(
-            database_url,
-            poolclass=QueuePool,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,
-            echo=False
-        )
-        
+
+        url = make_url(database_url)
+        self.is_sqlite = url.get_backend_name() == 'sqlite'
+
+        self.engine = create_engine(database_url, **build_engine_options(database_url))
+
+        if self.is_sqlite and not _is_sqlite_memory(url.database):
+            apply_sqlite_pragmas(self.engine)
+            # SQLite allows one writer at a time; funnel writes through a
+            # single connection instead of letting pooled readers contend.
+            self.write_engine = create_engine(
+                database_url,
+                poolclass=QueuePool,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=Config.DB_POOL_TIMEOUT,
+                connect_args={
+                    'check_same_thread': False,
+                    'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+                },
+                echo=False,
+            )
+            apply_sqlite_pragmas(self.write_engine, writer=True)
+        else:
+            self.write_engine = self.engine
+
         self.SessionLocal = sessionmaker(
             bind=self.engine,
             autocommit=False,
             autoflush=False
         )
-        
-        Base.metadata.create_all(self.engine)
-        logger.info(f"Database initialized: {database_url}")
+        self.WriteSessionLocal = sessionmaker(
+            bind=self.write_engine,
+            autocommit=False,
+            autoflush=False
+        )
+
+        Base.metadata.create_all(self.write_engine)
+        logger.info(f"Database initialized: {url.render_as_string(hide_password=True)}")
 
     def get_session(self) -> Session:
         return self.SessionLocal()
 
+    def get_write_session(self) -> Session:
+        return self.WriteSessionLocal()
+
     def create_tables(self):
-        Base.metadata.create_all(self.engine)
+        Base.metadata.create_all(self.write_engine)
         logger.info("Database tables created")
 
     def drop_tables(self):
-        Base.metadata.drop_all(self.engine)
+        Base.metadata.drop_all(self.write_engine)
         logger.warning("Database tables dropped")
 
 
 db_service = DatabaseService()
-
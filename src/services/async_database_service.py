@@ -0,0 +1,226 @@
+"""
+Asyncio variants of the read paths in database_service, built on SQLAlchemy's
+async engine (aiosqlite for SQLite, asyncpg for Postgres). They back the
+read-only endpoints served by src.asgi; writes stay on the sync services.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from src.blockchain.chain_metadata import ChainMetadata
+from src.blockchain.getBlock import attendance_record, matches_filters, student_attendance_record
+from src.config.config import Config
+from src.models.classroom_models import Classroom, ClassroomSummary, StudentProfile
+from src.models.database import (
+    BlockModel,
+    ChainMetadataModel,
+    ClassroomModel,
+    StudentModel,
+    _is_sqlite_memory,
+    apply_sqlite_pragmas,
+    classroom_summaries_from_rows,
+    classroom_summaries_query,
+    server_max_overflow,
+    server_pool_size,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+CHAIN_METADATA_ROW_ID = 1
+
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def build_async_engine_options(database_url: str) -> Dict[str, Any]:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {"echo": False}
+
+    if backend == "sqlite":
+        if _is_sqlite_memory(url.database):
+            options["poolclass"] = StaticPool
+        else:
+            options["poolclass"] = AsyncAdaptedQueuePool
+            options["pool_size"] = Config.SQLITE_READ_POOL_SIZE
+            options["max_overflow"] = 0
+            options["pool_timeout"] = Config.DB_POOL_TIMEOUT
+        return options
+
+    options.update({
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": server_pool_size(),
+        "max_overflow": server_max_overflow(),
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {
+            "server_settings": {"statement_timeout": str(Config.DB_STATEMENT_TIMEOUT_MS)},
+            "prepared_statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE,
+        },
+    })
+    return options
+
+
+class AsyncDatabaseService:
+    def __init__(self, database_url: Optional[str] = None):
+        database_url = database_url or Config.ASYNC_DATABASE_URL or to_async_url(Config.DATABASE_URL)
+        url = make_url(database_url)
+
+        self.engine: AsyncEngine = create_async_engine(
+            database_url, **build_async_engine_options(database_url)
+        )
+        if url.get_backend_name() == "sqlite" and not _is_sqlite_memory(url.database):
+            apply_sqlite_pragmas(self.engine.sync_engine)
+
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        logger.info(f"Async database initialized: {url.render_as_string(hide_password=True)}")
+
+    def get_session(self) -> AsyncSession:
+        return self.SessionLocal()
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+class AsyncDatabaseBlockchainService:
+    def __init__(self, db: AsyncDatabaseService):
+        self.db = db
+
+    async def get_chain_metadata(self) -> Optional[ChainMetadata]:
+        async with self.db.get_session() as session:
+            metadata_row = await session.get(ChainMetadataModel, CHAIN_METADATA_ROW_ID)
+            if metadata_row is None:
+                return None
+            return ChainMetadata(**metadata_row.to_dict())
+
+    async def get_all_records(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        records = []
+        async for index, timestamp, data in self._iter_attendance_rows():
+            if filters and not matches_filters(data, filters):
+                continue
+            records.append(attendance_record(index, timestamp, data, fields))
+        return records
+
+    async def get_records_page(
+        self,
+        filters: Dict[str, str],
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Keyset page on blocks.index; see DatabaseBlockchainService.get_attendance_records_page."""
+        statement = select(BlockModel.index, BlockModel.timestamp, BlockModel.data).where(BlockModel.index > 0)
+        if before is not None:
+            statement = statement.where(BlockModel.index < before).order_by(BlockModel.index.desc())
+        else:
+            if after is not None:
+                statement = statement.where(BlockModel.index > after)
+            statement = statement.order_by(BlockModel.index)
+
+        records: List[Dict[str, Any]] = []
+        has_more = False
+        async with self.db.get_session() as session:
+            result = await session.stream(statement.execution_options(yield_per=max(limit + 1, 100)))
+            async for index, timestamp, data in result:
+                if not isinstance(data, dict) or data.get("type") != "attendance":
+                    continue
+                if filters and not matches_filters(data, filters):
+                    continue
+                if len(records) == limit:
+                    has_more = True
+                    break
+                records.append(attendance_record(index, timestamp, data, fields))
+        if before is not None:
+            records.reverse()
+        return records, has_more
+
+    async def search_by_student(self, roll_no: str) -> List[Dict[str, Any]]:
+        records = []
+        async for _, _, data in self._iter_attendance_rows():
+            if roll_no in data.get("present_students", []):
+                records.append(student_attendance_record(data))
+        return records
+
+    async def _iter_attendance_rows(self):
+        statement = (
+            select(BlockModel.index, BlockModel.timestamp, BlockModel.data)
+            .where(BlockModel.index > 0)
+            .order_by(BlockModel.index)
+            .execution_options(yield_per=500)
+        )
+        async with self.db.get_session() as session:
+            result = await session.stream(statement)
+            async for index, timestamp, data in result:
+                if isinstance(data, dict) and data.get("type") == "attendance":
+                    yield index, timestamp, data
+
+
+class AsyncDatabaseClassroomRepository:
+    def __init__(self, db: AsyncDatabaseService):
+        self.db = db
+
+    async def list_classrooms(self) -> List[Classroom]:
+        statement = (
+            select(ClassroomModel)
+            .options(selectinload(ClassroomModel.students))
+            .order_by(ClassroomModel.created_at.asc())
+        )
+        async with self.db.get_session() as session:
+            models = (await session.scalars(statement)).all()
+            return [self._to_domain(model) for model in models]
+
+    async def list_classroom_summaries(self) -> List[ClassroomSummary]:
+        async with self.db.get_session() as session:
+            rows = (await session.execute(classroom_summaries_query())).all()
+        return classroom_summaries_from_rows(rows)
+
+    async def get_classroom(self, class_id: str) -> Optional[Classroom]:
+        statement = (
+            select(ClassroomModel)
+            .options(selectinload(ClassroomModel.students))
+            .where(ClassroomModel.id == class_id)
+        )
+        async with self.db.get_session() as session:
+            model = (await session.scalars(statement)).first()
+            return self._to_domain(model) if model else None
+
+    def _to_domain(self, model: ClassroomModel) -> Classroom:
+        return Classroom(
+            id=model.id,
+            name=model.name,
+            description=model.description or "",
+            expected_student_count=model.expected_student_count or 0,
+            students=[
+                StudentProfile(roll_number=student.roll_number, name=student.name)
+                for student in model.students
+            ],
+            created_at=model.created_at or datetime.utcnow(),
+            updated_at=model.updated_at or datetime.utcnow(),
+        )
@@ -1,13 +1,20 @@
 import jwt
 import bcrypt
+import hashlib
+import hmac
 import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Hashable, List
 from functools import wraps
 from flask import request, jsonify, g
 import logging
 
 from src.config.config import Config
+from src.services.user_store import UserStore, build_user_store
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,41 +35,115 @@ PERMISSIONS = {
     "student": ["read"],
     "viewer": ["read"],
 }
+_UNLOADED = object()
+
+# With BCRYPT_MAX_WORKERS > 0, hashing runs in a pool of that size. This only
+# caps how many hashes a threaded worker computes at once: the request thread
+# still waits for the result. Sync workers have one request thread, so by
+# default bcrypt is called directly instead of paying for the handoff.
+_bcrypt_executor: Optional[ThreadPoolExecutor] = (
+    ThreadPoolExecutor(max_workers=Config.BCRYPT_MAX_WORKERS, thread_name_prefix="bcrypt")
+    if Config.BCRYPT_MAX_WORKERS > 0
+    else None
+)
+
+
+def _run_bcrypt(function, *args):
+    if _bcrypt_executor is None:
+        return function(*args)
+    return _bcrypt_executor.submit(function, *args).result()
 
 
 class AuthService:
-    def __init__(self):
-        self.users: Dict[str, Dict[str, Any]] = {}
-        self._initialize_default_users()
+    def __init__(self, store: Optional[UserStore] = None):
+        # The configured store is built on first use, so importing this
+        # module does not create USERS_FILE or touch the database
+        self._store: Optional[UserStore] = None
+        self._store_lock = threading.Lock()
+        if store is not None:
+            self._initialize_default_users(store)
+            self._store = store
+        # Per-worker copy of the store's user table, reloaded when the
+        # store's version changes (checked at most every USER_CACHE_CHECK_SECONDS)
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._users_version: Hashable = _UNLOADED
+        self._users_checked_at = 0.0
+        self._users_lock = threading.Lock()
+        # Recently verified (username, password, hash) triples, keyed by an
+        # HMAC under a per-process key so plaintext passwords are never stored
+        self._verification_key = secrets.token_bytes(32)
+        self._verified_passwords = TTLCache(
+            maxsize=Config.PASSWORD_CACHE_SIZE, ttl=Config.PASSWORD_CACHE_TTL_SECONDS
+        )
+        # Decoded, verified tokens keyed by sha256 of the token; entries live
+        # until the token's exp (capped) and are dropped on role changes
+        self._verified_tokens = TTLCache(
+            maxsize=Config.TOKEN_CACHE_SIZE, ttl=Config.TOKEN_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def store(self) -> UserStore:
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    store = build_user_store()
+                    self._initialize_default_users(store)
+                    self._store = store
+        return self._store
 
-    def _initialize_default_users(self) -> None:
+    @property
+    def users(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        if now - self._users_checked_at >= Config.USER_CACHE_CHECK_SECONDS:
+            self._refresh_users()
+        return self._users
+
+    def _refresh_users(self, force: bool = False) -> None:
+        with self._users_lock:
+            version = self.store.version()
+            self._users_checked_at = time.monotonic()
+            if not force and version == self._users_version:
+                return
+            self._users = self.store.load_all()
+            self._users_version = version
+            # Roles may have changed in another worker
+            self._verified_tokens.clear()
+
+    def _initialize_default_users(self, store: UserStore) -> None:
+        if store.load_all():
+            return
+        
         default_password = "admin123"
         password_hash = self._hash_password(default_password)
         
-        self.users["admin"] = {
+        created, _ = store.create_user({
             "username": "admin",
             "password_hash": password_hash,
             "role": ROLES["ADMIN"],
             "email": "admin@blockendance.com",
             "created_at": datetime.now().isoformat(),
-        }
+        })
         
-        logger.warning(
-            "Default admin user created. Username: admin, Password: admin123. "
-            "Please change this in production!"
-        )
+        if created:
+            logger.warning(
+                "Default admin user created. Username: admin, Password: admin123. "
+                "Please change this in production!"
+            )
 
     def _hash_password(self, password: str) -> str:
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+        salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+        hashed = _run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
+    def _verification_cache_key(self, username: str, password: str, password_hash: str) -> str:
+        message = "\0".join((username, password, password_hash)).encode('utf-8')
+        return hmac.new(self._verification_key, message, hashlib.sha256).hexdigest()
+    
     def _verify_password(self, password: str, password_hash: str) -> bool:
         try:
             if password_hash.startswith('$2b$') or password_hash.startswith('$2a$'):
-                return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+                return _run_bcrypt(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
             else:
-                import hashlib
                 legacy_hash = hashlib.sha256(password.encode()).hexdigest()
                 if legacy_hash == password_hash:
                     return True
@@ -82,13 +163,16 @@ class AuthService:
         
         password_hash = self._hash_password(password)
         
-        self.users[username] = {
+        created, error = self.store.create_user({
             "username": username,
             "password_hash": password_hash,
             "role": role,
             "email": email or f"{username}@blockendance.com",
             "created_at": datetime.now().isoformat(),
-        }
+        })
+        self._refresh_users(force=True)
+        if not created:
+            return False, error
         
         logger.info(f"User created: {username} with role {role}")
         return True, None
@@ -99,12 +183,16 @@ class AuthService:
         
         user = self.users[username]
         
-        if not self._verify_password(password, user["password_hash"]):
-            return False, "Invalid credentials", None
+        cache_key = self._verification_cache_key(username, password, user["password_hash"])
+        if not self._verified_passwords.get(cache_key):
+            if not self._verify_password(password, user["password_hash"]):
+                return False, "Invalid credentials", None
+            self._verified_passwords.set(cache_key, True)
         
         if not user["password_hash"].startswith('$2b$') and not user["password_hash"].startswith('$2a$'):
             new_hash = self._hash_password(password)
-            user["password_hash"] = new_hash
+            self.store.update_user(username, password_hash=new_hash)
+            self._refresh_users(force=True)
             logger.info(f"Migrated password hash for user {username} to bcrypt")
         
         token = self.generate_token(username, user["role"])
@@ -143,24 +231,48 @@ class AuthService:
             return False, "Token refresh failed", None
 
     def verify_token(self, token: str) -> tuple[bool, Optional[Dict[str, Any]]]:
+        users = self.users  # reloading a changed user table also clears cached tokens
+        token_digest = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        cached = self._verified_tokens.get(token_digest)
+        if cached is not None:
+            return True, dict(cached)
+
         try:
             payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
             username = payload.get("username")
             
-            if username not in self.users:
+            if username not in users:
                 return False, None
             
-            user = self.users[username]
-            return True, {
+            user = users[username]
+            user_info = {
                 "username": username,
                 "role": user["role"],
                 "permissions": PERMISSIONS.get(user["role"], []),
             }
+            ttl = min(payload["exp"] - time.time(), Config.TOKEN_CACHE_TTL_SECONDS) if "exp" in payload else None
+            self._verified_tokens.set(token_digest, user_info, ttl=ttl)
+            return True, dict(user_info)
         except jwt.ExpiredSignatureError:
             return False, None
         except jwt.InvalidTokenError:
             return False, None
 
+    def update_user_role(self, username: str, role: str) -> tuple[bool, Optional[str]]:
+        if username not in self.users:
+            return False, "User not found"
+        
+        if role not in ROLES.values():
+            return False, "Invalid role"
+        
+        success, error = self.store.update_user(username, role=role)
+        if not success:
+            return False, error
+        self._verified_tokens.discard_where(lambda _, user_info: user_info["username"] == username)
+        self._refresh_users(force=True)
+        logger.info(f"Updated role for user {username} to {role}")
+        return True, None
+
     def has_permission(self, user_info: Dict[str, Any], required_permission: str) -> bool:
         user_permissions = user_info.get("permissions", [])
         return required_permission in user_permissions
@@ -0,0 +1,166 @@
+"""
+In-process fan-out of newly committed blocks to event-stream subscribers.
+
+BlockchainService publishes every block it appends or picks up from disk.
+Each subscriber gets a bounded buffer; one that falls behind is marked
+overflowed and catches up from the chain itself by block index, so a slow
+client costs bounded memory and still sees every block.
+
+Blocks written by other workers reach the hub through a single poller per
+process, which checks the chain tip while anyone is subscribed and marks
+every subscriber for catch-up when the tip moves past what was published.
+"""
+import logging
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.blockchain.block import Block
+from src.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BlockEvent:
+    index: int
+    hash: str
+    class_id: Optional[str]
+    student_count: int
+    timestamp: str
+
+    @classmethod
+    def from_block(cls, block: Block) -> "BlockEvent":
+        data = block.data if isinstance(block.data, dict) else {}
+        timestamp = block.timestamp
+        return cls(
+            index=block.index,
+            hash=block.hash,
+            class_id=data.get("class_id"),
+            student_count=len(data.get("present_students", [])),
+            timestamp=timestamp.isoformat() if hasattr(timestamp, "isoformat") else str(timestamp),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class Subscription:
+    def __init__(self, maxsize: int, wakeup: Callable[[], None]):
+        self.maxsize = maxsize
+        self.overflowed = False
+        self._events: deque = deque()
+        self._wakeup = wakeup
+        self._lock = threading.Lock()
+
+    def push(self, event: BlockEvent) -> None:
+        with self._lock:
+            if self.overflowed:
+                return
+            if len(self._events) >= self.maxsize:
+                # Drop the backlog; the reader re-reads the chain from its last id
+                self._events.clear()
+                self.overflowed = True
+            else:
+                self._events.append(event)
+        try:
+            self._wakeup()
+        except RuntimeError:
+            # The subscriber's event loop is already closed
+            pass
+
+    def mark_behind(self) -> None:
+        """Ask the reader to re-read the chain from its last id."""
+        with self._lock:
+            self._events.clear()
+            self.overflowed = True
+        try:
+            self._wakeup()
+        except RuntimeError:
+            pass
+
+    def drain(self) -> Tuple[List[BlockEvent], bool]:
+        """Return buffered events and whether any were dropped since the last drain."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            overflowed, self.overflowed = self.overflowed, False
+        return events, overflowed
+
+
+class BlockEventHub:
+    def __init__(self, buffer_size: int, max_subscribers: int):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        # Highest block index published or seen by the poller
+        self._tip_index: Optional[int] = None
+        self._poller_stop: Optional[threading.Event] = None
+
+    def subscribe(self, wakeup: Callable[[], None] = lambda: None) -> Optional[Subscription]:
+        """Register a subscriber, or return None when the worker is at capacity."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.buffer_size, wakeup)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if not self._subscribers and self._poller_stop is not None:
+                self._poller_stop.set()
+                self._poller_stop = None
+
+    def start_polling(self, tip_index: Callable[[], int], interval: float) -> None:
+        """
+        Start the process-wide tip poller unless one is running. It stops
+        once the last subscriber leaves.
+        """
+        with self._lock:
+            if self._poller_stop is not None or not self._subscribers:
+                return
+            stop = self._poller_stop = threading.Event()
+        threading.Thread(
+            target=self._poll, args=(tip_index, interval, stop), name="block-events-poller", daemon=True
+        ).start()
+
+    def _poll(self, tip_index: Callable[[], int], interval: float, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                tip = tip_index()
+            except Exception as e:
+                logger.warning(f"Block event poller could not read the chain tip: {str(e)}")
+            else:
+                with self._lock:
+                    # The first reading only seeds the tip; streams read it themselves on connect
+                    behind = self._tip_index is not None and tip > self._tip_index
+                    if self._tip_index is None or tip > self._tip_index:
+                        self._tip_index = tip
+                    subscribers = list(self._subscribers) if behind else []
+                for subscription in subscribers:
+                    subscription.mark_behind()
+            stop.wait(interval)
+
+    def publish(self, blocks: Iterable[Block]) -> None:
+        blocks = list(blocks)
+        with self._lock:
+            if blocks:
+                self._tip_index = max(self._tip_index or -1, blocks[-1].index)
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        for block in blocks:
+            event = BlockEvent.from_block(block)
+            for subscription in subscribers:
+                subscription.push(event)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+block_events = BlockEventHub(Config.SSE_BUFFER_SIZE, Config.SSE_MAX_SUBSCRIBERS)
@@ -1,13 +1,30 @@
 import logging
+import os
 import threading
-from typing import List, Dict, Optional, Tuple, Any
+from bisect import bisect_right
+from typing import List, Dict, Optional, Sequence, Tuple, Any
 from datetime import datetime
 
 from src.blockchain.block import Block
+from src.blockchain.chain_metadata import ChainMetadata
+from src.services.block_events import block_events
+from src.models.attendance_models import AttendanceResult, AttendanceSession
 from src.blockchain.genesis import create_genesis_block, create_blockchain
 from src.blockchain.newBlock import next_block
-from src.blockchain.getBlock import find_records, get_all_attendance_records, search_by_student
-from src.blockchain.checkChain import check_integrity, get_blockchain_stats, validate_block
+from src.blockchain.getBlock import (
+    attendance_record,
+    attendance_records_page,
+    find_block,
+    find_records,
+    get_all_attendance_records,
+    search_by_student,
+)
+from src.blockchain.checkChain import (
+    check_integrity,
+    get_blockchain_stats,
+    get_blockchain_stats_from_metadata,
+    validate_block
+)
 from src.blockchain.persistence import (
     save_blockchain,
     load_blockchain,
@@ -38,10 +55,20 @@ if USE_DATABASE:
         logger.warning("Database service not available, falling back to JSON storage")
 
 
+def _file_signature(filename: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class BlockchainService:
     def __init__(self, blockchain: Optional[List[Block]] = None):
         self._lock = threading.Lock()
         self._blockchain: List[Block] = blockchain or []
+        self._metadata = ChainMetadata()
+        self._file_signature: Optional[Tuple[int, int]] = None
         self._initialize_blockchain()
 
     def _initialize_blockchain(self) -> None:
@@ -76,9 +103,39 @@ class BlockchainService:
                             logger.info(f"Saved new blockchain: {save_msg}")
                         else:
                             logger.warning(f"Failed to save new blockchain: {save_msg}")
+                    self._file_signature = _file_signature(Config.BLOCKCHAIN_FILE)
+            self._metadata = ChainMetadata.from_chain(self._blockchain)
+
+    def _sync_with_file(self) -> None:
+        """
+        Pick up blocks appended by other workers. A single stat call on the hot
+        path; the chain is only reloaded when the file actually changed.
+        """
+        if USE_DATABASE or self._file_signature is None:
+            return
+        signature = _file_signature(Config.BLOCKCHAIN_FILE)
+        if signature is None or signature == self._file_signature:
+            return
+        with self._lock:
+            if signature == self._file_signature:
+                return
+            loaded_blockchain, message = load_blockchain(Config.BLOCKCHAIN_FILE)
+            if not loaded_blockchain:
+                logger.warning(f"Blockchain file changed but could not be reloaded: {message}")
+                return
+            previous_tip = self._metadata.tip_index
+            self._blockchain = loaded_blockchain
+            self._metadata = ChainMetadata.from_chain(loaded_blockchain)
+            self._file_signature = signature
+            logger.info(f"Reloaded blockchain changed on disk: {len(loaded_blockchain)} blocks")
+            if previous_tip is not None:
+                block_events.publish(
+                    loaded_blockchain[bisect_right(loaded_blockchain, previous_tip, key=lambda block: block.index):]
+                )
 
     @property
     def blockchain(self) -> List[Block]:
+        self._sync_with_file()
         with self._lock:
             if USE_DATABASE:
                 try:
@@ -126,65 +183,96 @@ class BlockchainService:
     def add_attendance_block(
         self, form_data: Dict[str, Any], attendance_data: Any
     ) -> Tuple[bool, str]:
+        """Legacy adapter: roll_no1..roll_noN form dict plus metadata; see record_attendance."""
+        metadata = self._normalize_attendance_metadata(attendance_data)
+
+        present_students = []
+        i = 1
+        while form_data.get(f"roll_no{i}"):
+            roll_no = form_data.get(f"roll_no{i}", "").strip()
+            if roll_no:
+                present_students.append(roll_no)
+            i += 1
+
+        result = self.record_attendance(AttendanceSession(present_students=present_students, **metadata))
+        return result.success, result.message
+
+    def record_attendance(self, session: AttendanceSession) -> AttendanceResult:
+        return self.record_attendance_batch([session])[0]
+
+    def record_attendance_batch(self, sessions: List[AttendanceSession]) -> List[AttendanceResult]:
+        """
+        Append one block per session as consecutive blocks under a single
+        lock hold, persisted with one write. Either every block is committed
+        or none is, in which case every result carries the same error.
+        """
+        success, message, blocks = self._append_sessions(sessions)
+        if not success:
+            return [AttendanceResult(False, message) for _ in sessions]
+        return [
+            AttendanceResult(
+                True,
+                f"Block #{block.index} has been added to the blockchain! "
+                f"{len(session.present_students)} students marked present.",
+                block_index=block.index,
+                students_count=len(session.present_students),
+            )
+            for session, block in zip(sessions, blocks)
+        ]
+
+    def _append_sessions(self, sessions: List[AttendanceSession]) -> Tuple[bool, str, List[Block]]:
+        if not sessions:
+            return True, "No attendance blocks to add", []
         try:
-            metadata = self._normalize_attendance_metadata(attendance_data)
+            if any(not session.present_students for session in sessions):
+                return False, "Error: No students marked present!", []
 
-            with self._lock:
-                attendance_dict = {
-                    "type": "attendance",
-                    "teacher_name": metadata.get("teacher_name", ""),
-                    "date": metadata.get("date", ""),
-                    "course": metadata.get("course", ""),
-                    "year": metadata.get("year", ""),
-                    "class_id": metadata.get("class_id"),
-                    "class_name": metadata.get("class_name"),
-                    "present_students": []
-                }
-
-                i = 1
-                while form_data.get(f"roll_no{i}"):
-                    roll_no = form_data.get(f"roll_no{i}", "").strip()
-                    if roll_no:
-                        attendance_dict["present_students"].append(roll_no)
-                    i += 1
-
-                if not attendance_dict["present_students"]:
-                    return False, "Error: No students marked present!"
+            self._sync_with_file()
 
+            with self._lock:
                 if not self._blockchain:
-                    return False, "Error: Blockchain not initialized"
+                    return False, "Error: Blockchain not initialized", []
 
+                blocks: List[Block] = []
                 previous_block = self._blockchain[-1]
-                block_to_add = next_block(previous_block, attendance_dict)
-
-                if not block_to_add.is_valid():
-                    return False, "Error: Invalid block created!"
-
-                self._blockchain.append(block_to_add)
+                for session in sessions:
+                    # to_block_data() builds a fresh dict, so next_block need not copy it
+                    block = next_block(previous_block, session.to_block_data(), copy_data=False)
+                    if not block.is_valid():
+                        return False, "Error: Invalid block created!", []
+                    blocks.append(block)
+                    previous_block = block
 
                 if USE_DATABASE:
-                    db_success, db_msg = db_blockchain_service.add_block(block_to_add)
+                    db_success, db_msg = db_blockchain_service.add_blocks(blocks)
                     if not db_success:
-                        logger.warning(f"Failed to save block to database: {db_msg}")
+                        return False, f"Error saving blocks: {db_msg}", []
+                    self._blockchain.extend(blocks)
                 else:
+                    self._blockchain.extend(blocks)
                     save_success, save_msg = save_blockchain(
                         self._blockchain, Config.BLOCKCHAIN_FILE
                     )
                     if not save_success:
-                        logger.warning(f"Failed to save blockchain after adding block: {save_msg}")
+                        del self._blockchain[-len(blocks):]
+                        return False, f"Error saving blockchain: {save_msg}", []
+                    self._file_signature = _file_signature(Config.BLOCKCHAIN_FILE)
 
-                logger.info(
-                    f"Added block #{block_to_add.index} with {len(attendance_dict['present_students'])} students"
-                )
+                for block in blocks:
+                    self._metadata.record_block(block)
+                block_events.publish(blocks)
 
-                return True, (
-                    f"Block #{block_to_add.index} has been added to the blockchain! "
-                    f"{len(attendance_dict['present_students'])} students marked present."
-                )
+                if len(blocks) == 1:
+                    logger.info(
+                        f"Added block #{blocks[0].index} with {len(sessions[0].present_students)} students"
+                    )
+                else:
+                    logger.info(f"Added {len(blocks)} attendance blocks ending at #{blocks[-1].index}")
+                return True, f"{len(blocks)} attendance blocks added to the blockchain", blocks
 
         except Exception as e:
-            logger.error(f"Error adding attendance block: {str(e)}", exc_info=True)
-            return False, f"Error adding block: {str(e)}"
+            logger.error(f"Error adding attendance blocks: {str(e)}", exc_info=True)
+            return False, f"Error adding block: {str(e)}", []
 
     def find_attendance_records(
         self, search_criteria: Dict[str, Any]
@@ -198,13 +286,59 @@ class BlockchainService:
             logger.error(f"Error finding attendance records: {str(e)}", exc_info=True)
             return False, None
 
-    def get_all_records(self) -> List[Dict[str, Any]]:
+    def get_all_records(
+        self,
+        filters: Optional[Dict[str, str]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
         try:
-            return get_all_attendance_records(self.blockchain)
+            return get_all_attendance_records(self.blockchain, filters, fields)
         except Exception as e:
             logger.error(f"Error getting all records: {str(e)}", exc_info=True)
             return []
 
+    def get_records_page(
+        self,
+        filters: Dict[str, str],
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Cursor page of attendance records keyed on block_index. Reads the
+        chain in place (no full copy), so cost follows the page size.
+        """
+        if USE_DATABASE:
+            return db_blockchain_service.get_attendance_records_page(filters, limit, after, before, fields)
+        self._sync_with_file()
+        with self._lock:
+            return attendance_records_page(self._blockchain, filters, limit, after, before, fields)
+
+    def get_blocks_after(self, block_index: int, limit: int) -> List[Block]:
+        """Up to limit blocks with index > block_index, oldest first."""
+        if USE_DATABASE:
+            return db_blockchain_service.get_blocks_after(block_index, limit)
+        self._sync_with_file()
+        with self._lock:
+            start = bisect_right(self._blockchain, block_index, key=lambda block: block.index)
+            return self._blockchain[start:start + limit]
+
+    def get_block_roster(self, block_index: int) -> Optional[Dict[str, Any]]:
+        """Present students of one attendance block, or None if there is no such block."""
+        if USE_DATABASE:
+            block = db_blockchain_service.get_block_by_index(block_index)
+        else:
+            self._sync_with_file()
+            with self._lock:
+                block = find_block(self._blockchain, block_index)
+        if block is None or not isinstance(block.data, dict) or block.data.get("type") != "attendance":
+            return None
+        return attendance_record(
+            block.index, block.timestamp, block.data,
+            ("block_index", "class_id", "class_name", "present_students", "student_count"),
+        )
+
     def search_by_student(self, roll_no: str) -> List[Dict[str, Any]]:
         try:
             return search_by_student(self.blockchain, roll_no)
@@ -221,7 +355,19 @@ class BlockchainService:
 
     def get_stats(self) -> Dict[str, Any]:
         try:
-            return get_blockchain_stats(self.blockchain)
+            if USE_DATABASE:
+                return get_blockchain_stats_from_metadata(
+                    db_blockchain_service.get_chain_metadata(),
+                    db_blockchain_service.get_block_by_index(0),
+                    db_blockchain_service.get_latest_block(),
+                )
+            self._sync_with_file()
+            with self._lock:
+                if not self._blockchain:
+                    return get_blockchain_stats(self._blockchain)
+                return get_blockchain_stats_from_metadata(
+                    self._metadata, self._blockchain[0], self._blockchain[-1]
+                )
         except Exception as e:
             logger.error(f"Error getting blockchain stats: {str(e)}", exc_info=True)
             return {"error": str(e)}
@@ -263,6 +409,8 @@ class BlockchainService:
                 loaded_blockchain, message = load_blockchain(Config.BLOCKCHAIN_FILE)
                 if loaded_blockchain:
                     self._blockchain = loaded_blockchain
+                    self._metadata = ChainMetadata.from_chain(loaded_blockchain)
+                    self._file_signature = _file_signature(Config.BLOCKCHAIN_FILE)
                     logger.info(f"Reloaded blockchain: {message}")
                     return True, message, len(self._blockchain)
                 else:
@@ -292,6 +440,8 @@ class BlockchainService:
                 restored_blockchain, message = restore_from_backup(backup_filename)
                 if restored_blockchain:
                     self._blockchain = restored_blockchain
+                    self._metadata = ChainMetadata.from_chain(restored_blockchain)
+                    self._file_signature = _file_signature(Config.BLOCKCHAIN_FILE)
                     logger.info(f"Restored from backup: {backup_filename}")
                     return True, message
                 else:
@@ -309,12 +459,36 @@ class BlockchainService:
             return False, f"Error cleaning up backups: {str(e)}"
 
     def get_block_count(self) -> int:
+        return self.get_chain_metadata().height
+
+    def get_chain_metadata(self) -> ChainMetadata:
+        if USE_DATABASE:
+            try:
+                return db_blockchain_service.get_chain_metadata()
+            except Exception as e:
+                logger.error(f"Error getting chain metadata from database: {str(e)}", exc_info=True)
+        else:
+            self._sync_with_file()
         with self._lock:
-            if USE_DATABASE:
-                try:
-                    return db_blockchain_service.get_block_count()
-                except Exception as e:
-                    logger.error(f"Error getting block count from database: {str(e)}", exc_info=True)
-                    return len(self._blockchain)
-            return len(self._blockchain)
-
+            return self._metadata.copy()
+
+
+_shared_services: Dict[str, BlockchainService] = {}
+_shared_services_lock = threading.Lock()
+
+
+def get_blockchain_service() -> BlockchainService:
+    """
+    Return the process-wide BlockchainService for the configured storage,
+    creating it on first use. Request handlers share this instance instead
+    of reloading the chain for every request.
+    """
+    key = Config.DATABASE_URL if USE_DATABASE else Config.BLOCKCHAIN_FILE
+    service = _shared_services.get(key)
+    if service is None:
+        with _shared_services_lock:
+            service = _shared_services.get(key)
+            if service is None:
+                service = BlockchainService()
+                _shared_services[key] = service
+    return service
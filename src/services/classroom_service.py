@@ -1,13 +1,34 @@
+import atexit
+import hashlib
 import json
 import logging
+import os
+import tempfile
 import threading
 import uuid
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Sequence, Protocol, Union
+from typing import AbstractSet, Any, Dict, Hashable, Iterable, List, Optional, Sequence, Protocol, Tuple, Union
 from datetime import datetime
 
+from marshmallow import ValidationError
+
 from src.config.config import Config
-from src.models.classroom_models import Classroom, StudentProfile
+from src.utils.validators import validate_roll_number
+from src.utils.roster_import import RosterRow, chunked, validate_roster_row
+from src.models.classroom_models import (
+    Classroom,
+    ClassroomSummary,
+    StudentProfile,
+    build_roll_index,
+    normalize_roll_number,
+)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +37,9 @@ class ClassroomRepository(Protocol):
     def list_classrooms(self) -> List[Classroom]:
         ...
 
+    def list_classroom_summaries(self) -> List[ClassroomSummary]:
+        ...
+
     def get_classroom(self, class_id: str) -> Optional[Classroom]:
         ...
 
@@ -28,15 +52,94 @@ class ClassroomRepository(Protocol):
     def add_students(self, class_id: str, students: List[StudentProfile]) -> Classroom:
         ...
 
+    def append_students(self, class_id: str, students: List[StudentProfile]) -> List[StudentProfile]:
+        """Enroll students without loading the roster; return those skipped as already enrolled."""
+        ...
+
     def delete_classroom(self, class_id: str) -> bool:
         ...
 
+    def version(self) -> Hashable:
+        ...
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _seed_marker_path(seed_path: Path) -> Path:
+    return seed_path.with_name(f".{seed_path.name}.seeded")
+
+
+def _read_seed_markers(marker_path: Path) -> Dict[str, str]:
+    try:
+        with marker_path.open("r", encoding="utf-8") as handle:
+            markers = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return markers if isinstance(markers, dict) else {}
+
+
+def _write_seed_markers(marker_path: Path, markers: Dict[str, str]) -> None:
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=str(marker_path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(markers, handle, indent=2)
+        os.replace(temp_path, marker_path)
+    except OSError as exc:
+        logger.warning("Could not record seed marker %s: %s", marker_path, exc)
+
+
+# (seed file, target store) -> seed file (mtime_ns, size) already handled in this process
+_seeded_signatures: Dict[Tuple[str, Any], Tuple[int, int]] = {}
+
 
 class JsonClassroomRepository:
-    def __init__(self, filepath: Optional[str] = None):
+    """
+    Classroom storage backed by a JSON file.
+
+    The file is loaded once into dicts indexed by id and by lowercased name.
+    Mutations are applied in memory and written back by a debounced timer
+    (CLASSES_WRITE_DELAY_MS, 0 writes synchronously), so a burst of changes
+    costs a single atomic rewrite. The file is reloaded when its mtime or
+    size changes underneath us, e.g. after a write from another worker.
+
+    Local changes are also kept as a list of pending operations. A flush
+    takes an exclusive flock on a sidecar lock file (where fcntl is
+    available), reloads the file if another worker wrote it, replays the
+    pending operations on top and only then writes, so concurrent workers
+    never overwrite each other's classrooms or students.
+    """
+
+    def __init__(self, filepath: Optional[str] = None, write_delay_ms: Optional[int] = None):
         self.filepath = Path(filepath or Config.CLASSES_FILE)
+        self._lock_path = self.filepath.with_name(f".{self.filepath.name}.lock")
+        self._write_delay = (
+            Config.CLASSES_WRITE_DELAY_MS if write_delay_ms is None else write_delay_ms
+        ) / 1000.0
         self._lock = threading.RLock()
+        self._metadata: Dict[str, Any] = {}
+        self._classes: Dict[str, Dict[str, Any]] = {}
+        self._ids_by_name: Dict[str, str] = {}
+        # class id -> normalized roll numbers, built when the entry is loaded or written
+        self._roll_indexes: Dict[str, AbstractSet[str]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        # ("save", entry) | ("add_students", class_id, [student dicts]) | ("delete", class_id)
+        self._pending: List[Tuple[Any, ...]] = []
+        self._mutations = 0
+        self._flush_timer: Optional[threading.Timer] = None
         self._ensure_file_initialized()
+        self._load()
+        _open_repositories.add(self)
+
+    @property
+    def storage_key(self) -> str:
+        return str(self.filepath.resolve())
 
     def _ensure_file_initialized(self) -> None:
         if self.filepath.exists():
@@ -50,98 +153,273 @@ class JsonClassroomRepository:
             "classes": [],
         }
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        with self.filepath.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
+        with self._exclusive():
+            if not self.filepath.exists():
+                self._atomic_write(payload)
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the cross-process lock on the classes file."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as lock_handle:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
 
-    def _read_payload(self) -> dict:
+    def _load(self) -> None:
+        signature = _file_signature(self.filepath)
         with self.filepath.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+            payload = json.load(handle)
+        self._metadata = payload.get("metadata", {})
+        self._classes = {}
+        self._ids_by_name = {}
+        self._roll_indexes = {}
+        for entry in payload.get("classes", []):
+            self._index(entry)
+        self._signature = signature
+
+    def _refresh(self) -> None:
+        """Reload if the file changed on disk since we last read or wrote it."""
+        signature = _file_signature(self.filepath)
+        if signature is None or signature == self._signature:
+            return
+        self._reload_with_pending()
+        logger.info("Reloaded classes changed on disk from %s", self.filepath)
+
+    def _reload_with_pending(self) -> None:
+        """Load the file and replay local changes that are not written yet."""
+        self._load()
+        for operation in self._pending:
+            self._replay(operation)
+
+    def _replay(self, operation: Tuple[Any, ...]) -> None:
+        kind, payload = operation[0], operation[1]
+        if kind == "save":
+            current = self._classes.get(payload.get("id"))
+            if current is None:
+                self._index(payload)
+                return
+            # Apply the saved fields onto the entry just read, keeping students
+            # another worker enrolled since this save was made
+            merged = dict(current)
+            merged.update((key, value) for key, value in payload.items() if key != "students")
+            enrolled = build_roll_index(current.get("students", []))
+            merged["students"] = list(current.get("students", [])) + [
+                student
+                for student in payload.get("students", [])
+                if normalize_roll_number(str(student.get("roll_number", ""))) not in enrolled
+            ]
+            self._index(merged)
+        elif kind == "delete":
+            self._unindex(payload)
+        elif kind == "add_students":
+            entry = self._classes.get(payload)
+            if entry is None:
+                logger.warning("Dropping students added to classroom %s, deleted by another worker", payload)
+                return
+            classroom = self._classroom(entry)
+            # Another worker may have enrolled the same roll numbers meanwhile
+            students = [
+                StudentProfile.from_dict(student)
+                for student in operation[2]
+                if not classroom.has_roll_number(student.get("roll_number", ""))
+            ]
+            if students:
+                classroom.add_students(students)
+                self._index(classroom.to_dict())
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        previous = self._classes.get(entry.get("id"))
+        if previous is not None:
+            self._ids_by_name.pop(previous.get("name", "").strip().lower(), None)
+        self._classes[entry.get("id")] = entry
+        self._ids_by_name[entry.get("name", "").strip().lower()] = entry.get("id")
+        self._roll_indexes[entry.get("id")] = build_roll_index(entry.get("students", []))
+
+    def _classroom(self, entry: Dict[str, Any]) -> Classroom:
+        index = self._roll_indexes.get(entry.get("id"))
+        if isinstance(index, set):
+            # Extended in place by append_students; freeze it again before sharing
+            index = self._roll_indexes[entry.get("id")] = frozenset(index)
+        return Classroom.from_dict(entry, index)
+
+    def _unindex(self, class_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._classes.pop(class_id, None)
+        self._roll_indexes.pop(class_id, None)
+        if entry is not None:
+            self._ids_by_name.pop(entry.get("name", "").strip().lower(), None)
+        return entry
+
+    def _atomic_write(self, payload: dict) -> None:
+        fd, temp_path = tempfile.mkstemp(
+            dir=str(self.filepath.parent), prefix=f".{self.filepath.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, indent=2)
+            os.replace(temp_path, self.filepath)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _mark_dirty(self, operation: Tuple[Any, ...]) -> None:
+        self._pending.append(operation)
+        self._dirty = True
+        self._mutations += 1
+        if self._write_delay <= 0:
+            self._flush_locked()
+            return
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self._write_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._dirty:
+            return
+        with self._exclusive():
+            if _file_signature(self.filepath) != self._signature:
+                # Another worker wrote since we last read; merge onto its state
+                self._reload_with_pending()
+            self._metadata["updated"] = datetime.utcnow().isoformat()
+            self._metadata["total_classes"] = len(self._classes)
+            self._atomic_write({"metadata": self._metadata, "classes": list(self._classes.values())})
+            self._signature = _file_signature(self.filepath)
+        self._pending = []
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Write pending changes to disk now."""
+        with self._lock:
+            try:
+                self._flush_locked()
+            except Exception as exc:
+                logger.error("Failed to write classes file %s: %s", self.filepath, exc)
 
-    def _write_payload(self, payload: dict) -> None:
-        payload.setdefault("metadata", {})
-        payload["metadata"]["updated"] = datetime.utcnow().isoformat()
-        payload["metadata"]["total_classes"] = len(payload.get("classes", []))
-        with self.filepath.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
+    def version(self) -> Hashable:
+        """The file signature, made process-specific while local changes are pending."""
+        with self._lock:
+            self._refresh()
+            if self._dirty:
+                return self._signature, os.getpid(), self._mutations
+            return self._signature
 
     def list_classrooms(self) -> List[Classroom]:
         with self._lock:
-            payload = self._read_payload()
-            return [Classroom.from_dict(entry) for entry in payload.get("classes", [])]
+            self._refresh()
+            return [self._classroom(entry) for entry in self._classes.values()]
+
+    def list_classroom_summaries(self) -> List[ClassroomSummary]:
+        return [classroom.summary() for classroom in self.list_classrooms()]
 
     def get_classroom(self, class_id: str) -> Optional[Classroom]:
         if not class_id:
             return None
         with self._lock:
-            payload = self._read_payload()
-            for entry in payload.get("classes", []):
-                if entry.get("id") == class_id:
-                    return Classroom.from_dict(entry)
-        return None
+            self._refresh()
+            entry = self._classes.get(class_id)
+            return self._classroom(entry) if entry is not None else None
 
     def get_classroom_by_name(self, name: str) -> Optional[Classroom]:
         if not name:
             return None
-        normalized = name.strip().lower()
         with self._lock:
-            payload = self._read_payload()
-            for entry in payload.get("classes", []):
-                if entry.get("name", "").strip().lower() == normalized:
-                    return Classroom.from_dict(entry)
-        return None
+            self._refresh()
+            class_id = self._ids_by_name.get(name.strip().lower())
+            return self._classroom(self._classes[class_id]) if class_id is not None else None
 
     def save_classroom(self, classroom: Classroom) -> Classroom:
         with self._lock:
-            payload = self._read_payload()
-            classes = payload.get("classes", [])
-            updated = False
-            for idx, entry in enumerate(classes):
-                if entry.get("id") == classroom.id:
-                    classes[idx] = classroom.to_dict()
-                    updated = True
-                    break
-            if not updated:
-                classes.append(classroom.to_dict())
-            payload["classes"] = classes
-            self._write_payload(payload)
+            self._refresh()
+            entry = classroom.to_dict()
+            self._index(entry)
+            self._mark_dirty(("save", entry))
         return classroom
 
     def add_students(self, class_id: str, students: List[StudentProfile]) -> Classroom:
         if not students:
             raise ValueError("At least one student must be provided")
         with self._lock:
-            payload = self._read_payload()
-            classes = payload.get("classes", [])
-            for idx, entry in enumerate(classes):
-                if entry.get("id") == class_id:
-                    classroom = Classroom.from_dict(entry)
-                    classroom.students.extend(students)
-                    classroom.updated_at = datetime.utcnow()
-                    classes[idx] = classroom.to_dict()
-                    payload["classes"] = classes
-                    self._write_payload(payload)
-                    return classroom
-        raise ValueError(f"Classroom {class_id} not found")
+            self._refresh()
+            entry = self._classes.get(class_id)
+            if entry is None:
+                raise ValueError(f"Classroom {class_id} not found")
+            classroom = self._classroom(entry)
+            classroom.add_students(students)
+            classroom.updated_at = datetime.utcnow()
+            self._index(classroom.to_dict())
+            self._mark_dirty(("add_students", class_id, [student.to_dict() for student in students]))
+            return classroom
+
+    def append_students(self, class_id: str, students: List[StudentProfile]) -> List[StudentProfile]:
+        with self._lock:
+            self._refresh()
+            entry = self._classes.get(class_id)
+            if entry is None:
+                raise ValueError(f"Classroom {class_id} not found")
+            index = self._roll_indexes.get(class_id, frozenset())
+            if not isinstance(index, set):
+                index = self._roll_indexes[class_id] = set(index)
+            added: List[Dict[str, Any]] = []
+            skipped: List[StudentProfile] = []
+            for student in students:
+                normalized_roll = normalize_roll_number(student.roll_number)
+                if normalized_roll in index:
+                    skipped.append(student)
+                    continue
+                index.add(normalized_roll)
+                added.append(student.to_dict())
+            if added:
+                entry.setdefault("students", []).extend(added)
+                entry["updated_at"] = datetime.utcnow().isoformat()
+                self._mark_dirty(("add_students", class_id, added))
+            return skipped
 
     def delete_classroom(self, class_id: str) -> bool:
         """Delete a classroom by ID."""
         if not class_id:
             return False
-            
+
         with self._lock:
-            payload = self._read_payload()
-            classes = payload.get("classes", [])
-            initial_len = len(classes)
-            filtered_classes = [c for c in classes if c.get("id") != class_id]
-            
-            if len(filtered_classes) == initial_len:
+            self._refresh()
+            if self._unindex(class_id) is None:
                 return False
-                
-            payload["classes"] = filtered_classes
-            self._write_payload(payload)
+            self._mark_dirty(("delete", class_id))
             return True
 
 
+_open_repositories: "weakref.WeakSet[JsonClassroomRepository]" = weakref.WeakSet()
+_shared_repositories: Dict[str, JsonClassroomRepository] = {}
+_shared_repositories_lock = threading.Lock()
+
+
+def get_json_classroom_repository(filepath: Optional[str] = None) -> JsonClassroomRepository:
+    """Return the process-wide repository for a classes file, creating it on first use."""
+    key = os.path.abspath(filepath or Config.CLASSES_FILE)
+    repository = _shared_repositories.get(key)
+    if repository is None:
+        with _shared_repositories_lock:
+            repository = _shared_repositories.get(key)
+            if repository is None:
+                repository = JsonClassroomRepository(key)
+                _shared_repositories[key] = repository
+    return repository
+
+
+@atexit.register
+def _flush_open_repositories() -> None:
+    for repository in list(_open_repositories):
+        repository.flush()
+
+
 class ClassroomService:
     def __init__(
         self,
@@ -161,11 +439,17 @@ class ClassroomService:
             from src.services.database_service import DatabaseClassroomRepository
 
             return DatabaseClassroomRepository()
-        return JsonClassroomRepository()
+        return get_json_classroom_repository()
 
     def list_classrooms(self) -> List[Classroom]:
         return self._repository.list_classrooms()
 
+    def list_classroom_summaries(self) -> List[ClassroomSummary]:
+        return self._repository.list_classroom_summaries()
+
+    def version(self) -> Hashable:
+        return self._repository.version()
+
     def get_classroom(self, class_id: str) -> Optional[Classroom]:
         return self._repository.get_classroom(class_id)
 
@@ -209,19 +493,25 @@ class ClassroomService:
             if not classroom:
                 raise ValueError(f"Classroom {class_id} not found")
 
-            existing_rolls = {student.roll_number.strip().lower() for student in classroom.students}
+            existing_rolls = classroom.roll_index()
+            incoming_rolls = set()
             new_students: List[StudentProfile] = []
 
             for entry in students:
                 student = self._coerce_student(entry)
-                normalized_roll = student.roll_number.strip().lower()
+                normalized_roll = normalize_roll_number(student.roll_number)
                 if not student.name:
                     raise ValueError("Student name is required")
                 if not student.roll_number:
                     raise ValueError("Student roll number is required")
-                if normalized_roll in existing_rolls:
+                try:
+                    # Same rule as attendance submission, so every enrolled student can be marked present
+                    validate_roll_number(student.roll_number)
+                except ValidationError as err:
+                    raise ValueError("; ".join(err.messages))
+                if normalized_roll in existing_rolls or normalized_roll in incoming_rolls:
                     raise ValueError(f"Roll number '{student.roll_number}' already exists in class")
-                existing_rolls.add(normalized_roll)
+                incoming_rolls.add(normalized_roll)
                 new_students.append(student)
 
             updated_classroom = self._repository.add_students(class_id, new_students)
@@ -232,6 +522,93 @@ class ClassroomService:
             )
             return updated_classroom
 
+    def import_students(
+        self,
+        class_id: str,
+        rows: Iterable[RosterRow],
+        chunk_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Import a stream of roster rows chunk by chunk.
+
+        Invalid rows, duplicate roll numbers and rows beyond the classroom's
+        expected student count are rejected individually; each accepted chunk
+        is written in one repository call. Only the first max_errors
+        rejections are listed in the report. The roster is read once;
+        roll numbers enrolled by others during the import are skipped by the
+        repository and reported as duplicates. Rows are parsed and validated
+        without holding the service lock, which is taken only for each write.
+        """
+        chunk_size = chunk_size or Config.ROSTER_IMPORT_CHUNK_SIZE
+        max_errors = Config.ROSTER_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        report: Dict[str, Any] = {"imported": 0, "rejected": 0, "errors": [], "errors_truncated": False}
+
+        def reject(line: int, roll_number: Optional[str], message: str) -> None:
+            report["rejected"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append({"line": line, "roll_number": roll_number, "error": message})
+            else:
+                report["errors_truncated"] = True
+
+        # Load the roster once; afterwards only this import's own rows are
+        # tracked, and the repository skips rolls enrolled concurrently.
+        classroom = self._repository.get_classroom(class_id)
+        if not classroom:
+            raise ValueError(f"Classroom {class_id} not found")
+        known_rolls = set(classroom.roll_index())
+        remaining = (
+            classroom.expected_student_count - len(classroom.students)
+            if classroom.expected_student_count > 0
+            else None
+        )
+        del classroom
+
+        for chunk in chunked(rows, chunk_size):
+            accepted: List[StudentProfile] = []
+            lines: Dict[str, Tuple[int, Optional[str]]] = {}
+            for line, row, parse_error in chunk:
+                if parse_error:
+                    reject(line, None, parse_error)
+                    continue
+                error = validate_roster_row(row)
+                roll_number = str(row.get("roll_number") or "").strip() or None
+                if error:
+                    reject(line, roll_number, error)
+                    continue
+                student = self._coerce_student(row)
+                normalized_roll = normalize_roll_number(student.roll_number)
+                if normalized_roll in known_rolls:
+                    reject(line, roll_number, "Roll number already exists in class")
+                    continue
+                if remaining is not None and remaining <= 0:
+                    reject(line, roll_number, "Classroom is at its expected student count")
+                    continue
+                known_rolls.add(normalized_roll)
+                lines[normalized_roll] = (line, roll_number)
+                accepted.append(student)
+                if remaining is not None:
+                    remaining -= 1
+
+            if not accepted:
+                continue
+            with self._lock:
+                skipped = self._repository.append_students(class_id, accepted)
+            report["imported"] += len(accepted) - len(skipped)
+            for student in skipped:
+                line, roll_number = lines[normalize_roll_number(student.roll_number)]
+                reject(line, roll_number, "Roll number already exists in class")
+                if remaining is not None:
+                    remaining += 1
+
+        logger.info(
+            "Imported %s student(s) into class %s (%s rejected)",
+            report["imported"],
+            class_id,
+            report["rejected"],
+        )
+        return report
+
     def delete_classroom(self, class_id: str) -> bool:
         """Delete a classroom by ID."""
         if not class_id:
@@ -246,30 +623,61 @@ class ClassroomService:
             return result
 
     def seed_from_file(self, seed_file: Optional[str] = None) -> int:
+        """
+        Import classrooms from a seed file that are not in the repository yet.
+
+        Seeding is recorded in a marker file next to the seed file with the
+        seed content's sha256 per target store, so it runs once per
+        deployment; within a process an unchanged seed file costs one stat.
+        """
         seed_path = Path(seed_file or Config.CLASSES_FILE)
-        if not seed_path.exists():
+        signature = _file_signature(seed_path)
+        if signature is None:
             return 0
 
-        with seed_path.open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
+        target = getattr(self._repository, "storage_key", None)
+        if target is not None and target == str(seed_path.resolve()):
+            # The JSON repository already serves this file directly
+            return 0
 
-        added = 0
+        memo_key = (str(seed_path.resolve()), target or id(self._repository))
+        if _seeded_signatures.get(memo_key) == signature:
+            return 0
+
+        content = seed_path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        marker_path = _seed_marker_path(seed_path)
+        markers = _read_seed_markers(marker_path) if target is not None else {}
+        if target is not None and markers.get(target) == digest:
+            _seeded_signatures[memo_key] = signature
+            return 0
+
+        payload = json.loads(content.decode("utf-8"))
         classes = payload.get("classes", [])
         if not isinstance(classes, list):
             return 0
 
+        existing = self._repository.list_classroom_summaries()
+        existing_ids = {summary.id for summary in existing}
+        existing_names = {summary.name.strip().lower() for summary in existing}
+
+        added = 0
         for entry in classes:
             classroom = Classroom.from_dict(entry)
-            existing = self._repository.get_classroom(classroom.id) or self._repository.get_classroom_by_name(
-                classroom.name
-            )
-            if existing:
+            normalized_name = classroom.name.strip().lower()
+            if classroom.id in existing_ids or normalized_name in existing_names:
                 continue
             self._repository.save_classroom(classroom)
+            existing_ids.add(classroom.id)
+            existing_names.add(normalized_name)
             added += 1
 
         if added:
             logger.info("Seeded %s classroom(s) from %s", added, seed_path)
+        if target is not None:
+            markers[target] = digest
+            _write_seed_markers(marker_path, markers)
+        _seeded_signatures[memo_key] = signature
         return added
 
     def _sanitize_name(self, name: str) -> str:
@@ -294,3 +702,22 @@ class ClassroomService:
             name=str(entry.get("name", "")).strip(),
         )
 
+
+_shared_services: Dict[str, ClassroomService] = {}
+_shared_services_lock = threading.Lock()
+
+
+def get_classroom_service() -> ClassroomService:
+    """
+    Return the process-wide ClassroomService for the configured storage,
+    creating (and seeding) it on first use.
+    """
+    key = Config.DATABASE_URL if Config.USE_DATABASE else os.path.abspath(Config.CLASSES_FILE)
+    service = _shared_services.get(key)
+    if service is None:
+        with _shared_services_lock:
+            service = _shared_services.get(key)
+            if service is None:
+                service = ClassroomService(seed=True)
+                _shared_services[key] = service
+    return service
@@ -1,24 +1,37 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Sequence, Set, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, and_, func, insert
 from sqlalchemy.exc import IntegrityError
 
 from src.models.database import (
     db_service,
     BlockModel,
+    ChainMetadataModel,
     UserModel,
     ClassroomModel,
     StudentModel,
+    classroom_summaries_from_rows,
+    classroom_summaries_query,
 )
 from src.blockchain.block import Block
+from src.blockchain.chain_metadata import ChainMetadata
+from src.blockchain.getBlock import take_attendance_records
 import logging
 from datetime import datetime
 
-from src.models.classroom_models import Classroom, StudentProfile
+from src.models.classroom_models import Classroom, ClassroomSummary, StudentProfile
 
 logger = logging.getLogger(__name__)
 
+CHAIN_METADATA_ROW_ID = 1
+ROSTER_CHUNK_SIZE = 500
+
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class DatabaseBlockchainService:
     def __init__(self):
@@ -42,6 +55,23 @@ class DatabaseBlockchainService:
         finally:
             session.close()
 
+    def get_blocks_after(self, index: int, limit: int) -> List[Block]:
+        session = self.db.get_session()
+        try:
+            block_models = (
+                session.query(BlockModel)
+                .filter(BlockModel.index > index)
+                .order_by(BlockModel.index)
+                .limit(limit)
+                .all()
+            )
+            return [
+                Block(index=bm.index, timestamp=bm.timestamp, data=bm.data, prev_hash=bm.prev_hash)
+                for bm in block_models
+            ]
+        finally:
+            session.close()
+
     def get_block_by_index(self, index: int) -> Optional[Block]:
         session = self.db.get_session()
         try:
@@ -77,12 +107,14 @@ class DatabaseBlockchainService:
             session.close()
 
     def add_block(self, block: Block) -> Tuple[bool, str]:
-        session = self.db.get_session()
+        session = self.db.get_write_session()
         try:
-            existing = session.query(BlockModel).filter(BlockModel.index == block.index).first()
+            existing = session.query(BlockModel.id).filter(BlockModel.index == block.index).first()
             if existing:
                 return False, f"Block with index {block.index} already exists"
 
+            metadata_row = self._get_metadata_row(session)
+
             block_model = BlockModel(
                 index=block.index,
                 timestamp=block.timestamp,
@@ -93,6 +125,7 @@ class DatabaseBlockchainService:
             )
 
             session.add(block_model)
+            self._record_block(metadata_row, block)
             session.commit()
             logger.info(f"Block {block.index} added to database")
             return True, f"Block {block.index} added successfully"
@@ -103,13 +136,105 @@ class DatabaseBlockchainService:
         finally:
             session.close()
 
+    def add_blocks(self, blocks: List[Block]) -> Tuple[bool, str]:
+        """Insert consecutive blocks in a single transaction; all or nothing."""
+        if not blocks:
+            return True, "No blocks to add"
+        session = self.db.get_write_session()
+        try:
+            indices = [block.index for block in blocks]
+            existing = session.query(BlockModel.index).filter(BlockModel.index.in_(indices)).first()
+            if existing:
+                return False, f"Block with index {existing[0]} already exists"
+
+            metadata_row = self._get_metadata_row(session)
+            metadata = self._metadata_from_row(metadata_row)
+            session.add_all([
+                BlockModel(
+                    index=block.index,
+                    timestamp=block.timestamp,
+                    data=block.data,
+                    prev_hash=block.prev_hash,
+                    merkle_root=block.merkle_root,
+                    hash=block.hash
+                )
+                for block in blocks
+            ])
+            for block in blocks:
+                metadata.record_block(block)
+            for key, value in metadata.to_dict().items():
+                setattr(metadata_row, key, value)
+            session.commit()
+            logger.info(f"Blocks {indices[0]}-{indices[-1]} added to database")
+            return True, f"{len(blocks)} blocks added successfully"
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error adding blocks to database: {str(e)}", exc_info=True)
+            return False, f"Error adding blocks: {str(e)}"
+        finally:
+            session.close()
+
     def get_block_count(self) -> int:
+        return self.get_chain_metadata().height
+
+    def get_chain_metadata(self) -> ChainMetadata:
         session = self.db.get_session()
         try:
-            return session.query(BlockModel).count()
+            metadata_row = session.get(ChainMetadataModel, CHAIN_METADATA_ROW_ID)
+            if metadata_row is not None:
+                return self._metadata_from_row(metadata_row)
         finally:
             session.close()
 
+        session = self.db.get_write_session()
+        try:
+            metadata_row = self._get_metadata_row(session)
+            metadata = self._metadata_from_row(metadata_row)
+            session.commit()
+            return metadata
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _get_metadata_row(self, session: Session) -> ChainMetadataModel:
+        metadata_row = (
+            session.query(ChainMetadataModel)
+            .filter(ChainMetadataModel.id == CHAIN_METADATA_ROW_ID)
+            .with_for_update()
+            .first()
+        )
+        if metadata_row is None:
+            metadata_row = self._rebuild_metadata_row(session)
+        return metadata_row
+
+    def _rebuild_metadata_row(self, session: Session) -> ChainMetadataModel:
+        """One-off backfill for databases created before chain metadata was tracked."""
+        metadata = ChainMetadata()
+        rows = (
+            session.query(BlockModel.index, BlockModel.hash, BlockModel.data)
+            .order_by(BlockModel.index)
+            .yield_per(1000)
+        )
+        for index, block_hash, data in rows:
+            metadata.record(index, block_hash, data)
+
+        metadata_row = ChainMetadataModel(id=CHAIN_METADATA_ROW_ID, **metadata.to_dict())
+        session.add(metadata_row)
+        session.flush()
+        logger.info(f"Rebuilt chain metadata from {metadata.height} stored blocks")
+        return metadata_row
+
+    def _record_block(self, metadata_row: ChainMetadataModel, block: Block) -> None:
+        metadata = self._metadata_from_row(metadata_row)
+        metadata.record_block(block)
+        for key, value in metadata.to_dict().items():
+            setattr(metadata_row, key, value)
+
+    def _metadata_from_row(self, metadata_row: ChainMetadataModel) -> ChainMetadata:
+        return ChainMetadata(**metadata_row.to_dict())
+
     def get_attendance_blocks(self, page: int = 1, per_page: int = 10) -> Tuple[List[Dict[str, Any]], int]:
         session = self.db.get_session()
         try:
@@ -139,6 +264,34 @@ class DatabaseBlockchainService:
         finally:
             session.close()
 
+    def get_attendance_records_page(
+        self,
+        filters: Dict[str, str],
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Keyset page over the blocks.index index; see attendance_records_page."""
+        session = self.db.get_session()
+        try:
+            query = session.query(BlockModel).filter(BlockModel.index > 0)
+            if before is not None:
+                query = query.filter(BlockModel.index < before).order_by(desc(BlockModel.index))
+            else:
+                if after is not None:
+                    query = query.filter(BlockModel.index > after)
+                query = query.order_by(BlockModel.index)
+
+            records, has_more = take_attendance_records(
+                query.yield_per(max(limit + 1, 100)), filters, limit, fields
+            )
+            if before is not None:
+                records.reverse()
+            return records, has_more
+        finally:
+            session.close()
+
     def search_attendance_records(
         self,
         teacher_name: Optional[str] = None,
@@ -182,9 +335,10 @@ class DatabaseBlockchainService:
             session.close()
 
     def clear_all_blocks(self) -> Tuple[bool, str]:
-        session = self.db.get_session()
+        session = self.db.get_write_session()
         try:
             session.query(BlockModel).delete()
+            session.query(ChainMetadataModel).delete()
             session.commit()
             logger.warning("All blocks cleared from database")
             return True, "All blocks cleared"
@@ -207,23 +361,115 @@ class DatabaseUserService:
         finally:
             session.close()
 
+    def get_all_users(self) -> List[UserModel]:
+        session = self.db.get_session()
+        try:
+            return session.query(UserModel).all()
+        finally:
+            session.close()
+
+    def get_version(self) -> Tuple[int, Optional[datetime]]:
+        session = self.db.get_session()
+        try:
+            count, latest = session.query(func.count(UserModel.id), func.max(UserModel.updated_at)).one()
+            return count, latest
+        finally:
+            session.close()
+
+    def create_user(
+        self,
+        username: str,
+        password_hash: str,
+        role: str = 'teacher',
+        email: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        session = self.db.get_write_session()
+        try:
+            existing = session.query(UserModel.id).filter(UserModel.username == username).first()
+            if existing:
+                return False, "Username already exists"
+
+            user = UserModel(
+                username=username,
+                password_hash=password_hash,
+                role=role,
+                email=email
+            )
+
+            session.add(user)
+            session.commit()
+            logger.info(f"User {username} created in database")
+            return True, None
+        except IntegrityError:
+            session.rollback()
+            return False, "Username already exists"
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error creating user: {str(e)}", exc_info=True)
+            return False, f"Error creating user: {str(e)}"
+        finally:
+            session.close()
+
+    def update_user(self, username: str, **kwargs) -> Tuple[bool, Optional[str]]:
+        session = self.db.get_write_session()
+        try:
+            user = session.query(UserModel).filter(UserModel.username == username).first()
+            if not user:
+                return False, "User not found"
+
+            for key, value in kwargs.items():
+                if hasattr(user, key):
+                    setattr(user, key, value)
+
+            user.updated_at = datetime.utcnow()
+            session.commit()
+            logger.info(f"User {username} updated")
+            return True, None
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating user: {str(e)}", exc_info=True)
+            return False, f"Error updating user: {str(e)}"
+        finally:
+            session.close()
+
 
 class DatabaseClassroomRepository:
     def __init__(self):
         self.db = db_service
 
+    @property
+    def storage_key(self) -> str:
+        return self.db.engine.url.render_as_string(hide_password=True)
+
     def list_classrooms(self) -> List[Classroom]:
         session = self.db.get_session()
         try:
-            models = session.query(ClassroomModel).order_by(ClassroomModel.created_at.asc()).all()
+            models = (
+                session.query(ClassroomModel)
+                .options(selectinload(ClassroomModel.students))
+                .order_by(ClassroomModel.created_at.asc())
+                .all()
+            )
             return [self._to_domain(model) for model in models]
         finally:
             session.close()
 
+    def list_classroom_summaries(self) -> List[ClassroomSummary]:
+        session = self.db.get_session()
+        try:
+            return classroom_summaries_from_rows(session.execute(classroom_summaries_query()).all())
+        finally:
+            session.close()
+
     def get_classroom(self, class_id: str) -> Optional[Classroom]:
         session = self.db.get_session()
         try:
-            model = session.query(ClassroomModel).filter(ClassroomModel.id == class_id).first()
+            model = (
+                session.query(ClassroomModel)
+                .options(selectinload(ClassroomModel.students))
+                .filter(ClassroomModel.id == class_id)
+                .first()
+            )
             return self._to_domain(model) if model else None
         finally:
             session.close()
@@ -235,6 +481,7 @@ class DatabaseClassroomRepository:
         try:
             model = (
                 session.query(ClassroomModel)
+                .options(selectinload(ClassroomModel.students))
                 .filter(func.lower(ClassroomModel.name) == name.strip().lower())
                 .first()
             )
@@ -243,9 +490,9 @@ class DatabaseClassroomRepository:
             session.close()
 
     def save_classroom(self, classroom: Classroom) -> Classroom:
-        session = self.db.get_session()
+        session = self.db.get_write_session()
         try:
-            model = session.query(ClassroomModel).filter(ClassroomModel.id == classroom.id).first()
+            model = session.get(ClassroomModel, classroom.id)
             if not model:
                 model = ClassroomModel(
                     id=classroom.id,
@@ -256,27 +503,19 @@ class DatabaseClassroomRepository:
                     updated_at=classroom.updated_at,
                 )
                 session.add(model)
+                session.flush()
             else:
                 model.name = classroom.name
                 model.description = classroom.description
                 model.expected_student_count = classroom.expected_student_count
                 model.updated_at = datetime.utcnow()
 
-            # Replace student roster with provided list, if any
+            # Bring the stored roster in line with the provided list, if any
             if classroom.students:
-                model.students.clear()
-                for student in classroom.students:
-                    model.students.append(
-                        StudentModel(
-                            classroom_id=classroom.id,
-                            roll_number=student.roll_number,
-                            name=student.name,
-                        )
-                    )
+                self._sync_roster(session, classroom.id, classroom.students)
 
             session.commit()
-            session.refresh(model)
-            return self._to_domain(model)
+            return self._load_classroom(session, classroom.id)
         except IntegrityError as exc:
             session.rollback()
             raise ValueError(str(exc)) from exc
@@ -284,37 +523,200 @@ class DatabaseClassroomRepository:
             session.close()
 
     def add_students(self, class_id: str, students: List[StudentProfile]) -> Classroom:
-        session = self.db.get_session()
+        session = self.db.get_write_session()
         try:
-            model = session.query(ClassroomModel).filter(ClassroomModel.id == class_id).first()
+            self._insert_students(session, class_id, students)
+            session.commit()
+            return self._load_classroom(session, class_id)
+        except IntegrityError as exc:
+            session.rollback()
+            raise ValueError(str(exc)) from exc
+        finally:
+            session.close()
+
+    def append_students(self, class_id: str, students: List[StudentProfile]) -> List[StudentProfile]:
+        """
+        Insert students in one transaction without reloading the roster.
+        Returns the students skipped because their roll number is already
+        enrolled, including ones inserted concurrently by another request.
+        """
+        session = self.db.get_write_session()
+        try:
+            model = session.get(ClassroomModel, class_id)
             if not model:
                 raise ValueError(f"Classroom {class_id} not found")
 
-            existing_rolls = {student.roll_number.strip().lower() for student in model.students}
+            pending: Dict[str, StudentProfile] = {}
+            skipped: List[StudentProfile] = []
             for student in students:
                 normalized_roll = student.roll_number.strip().lower()
-                if normalized_roll in existing_rolls:
-                    raise ValueError(f"Roll number '{student.roll_number}' already exists in class")
-                existing_rolls.add(normalized_roll)
-                model.students.append(
-                    StudentModel(
-                        classroom_id=class_id,
-                        roll_number=student.roll_number,
-                        name=student.name,
+                if normalized_roll in pending:
+                    skipped.append(student)
+                else:
+                    pending[normalized_roll] = student
+
+            for chunk in _chunks(list(pending), ROSTER_CHUNK_SIZE):
+                enrolled = (
+                    session.query(StudentModel.roll_number)
+                    .filter(
+                        StudentModel.classroom_id == class_id,
+                        func.lower(StudentModel.roll_number).in_(chunk),
                     )
+                    .all()
                 )
-            model.updated_at = datetime.utcnow()
+                for (roll_number,) in enrolled:
+                    student = pending.pop(roll_number.strip().lower(), None)
+                    if student is not None:
+                        skipped.append(student)
+
+            if pending:
+                rows = [
+                    {'classroom_id': class_id, 'roll_number': student.roll_number, 'name': student.name}
+                    for student in pending.values()
+                ]
+                inserted = self._insert_new_students(session, rows)
+                skipped.extend(student for student in pending.values() if student.roll_number not in inserted)
+                model.updated_at = datetime.utcnow()
             session.commit()
-            session.refresh(model)
-            return self._to_domain(model)
+            return skipped
         except IntegrityError as exc:
             session.rollback()
             raise ValueError(str(exc)) from exc
         finally:
             session.close()
 
-    def delete_classroom(self, class_id: str) -> bool:
+    def _insert_students(self, session: Session, class_id: str, students: List[StudentProfile]) -> None:
+        model = session.get(ClassroomModel, class_id)
+        if not model:
+            raise ValueError(f"Classroom {class_id} not found")
+
+        new_rolls = set()
+        for student in students:
+            normalized_roll = student.roll_number.strip().lower()
+            if normalized_roll in new_rolls:
+                raise ValueError(f"Roll number '{student.roll_number}' already exists in class")
+            new_rolls.add(normalized_roll)
+
+        # Only look up the incoming roll numbers instead of loading the roster
+        for chunk in _chunks(list(new_rolls), ROSTER_CHUNK_SIZE):
+            conflict = (
+                session.query(StudentModel.roll_number)
+                .filter(
+                    StudentModel.classroom_id == class_id,
+                    func.lower(StudentModel.roll_number).in_(chunk),
+                )
+                .first()
+            )
+            if conflict:
+                raise ValueError(f"Roll number '{conflict.roll_number}' already exists in class")
+
+        session.execute(
+            insert(StudentModel),
+            [
+                {
+                    'classroom_id': class_id,
+                    'roll_number': student.roll_number,
+                    'name': student.name,
+                }
+                for student in students
+            ],
+        )
+        model.updated_at = datetime.utcnow()
+
+    def _insert_new_students(self, session: Session, rows: List[Dict[str, Any]]) -> Set[str]:
+        """Insert rows, ignoring roll numbers enrolled since they were checked; return those inserted."""
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = (
+                dialect_insert(StudentModel)
+                .on_conflict_do_nothing(index_elements=[StudentModel.classroom_id, StudentModel.roll_number])
+                .returning(StudentModel.roll_number)
+            )
+            return set(session.execute(statement, rows).scalars())
+
+        # Elsewhere a concurrent duplicate fails the transaction with IntegrityError
+        session.execute(insert(StudentModel), rows)
+        return {row['roll_number'] for row in rows}
+
+    def _sync_roster(self, session: Session, class_id: str, students: List[StudentProfile]) -> None:
+        """
+        Diff the provided roster against the stored one: delete dropped roll
+        numbers and upsert new or renamed students, leaving unchanged rows alone.
+        """
+        desired = {student.roll_number: student.name for student in students}
+        existing = dict(
+            session.query(StudentModel.roll_number, StudentModel.name)
+            .filter(StudentModel.classroom_id == class_id)
+            .all()
+        )
+
+        removed = [roll for roll in existing if roll not in desired]
+        for chunk in _chunks(removed, ROSTER_CHUNK_SIZE):
+            session.query(StudentModel).filter(
+                StudentModel.classroom_id == class_id,
+                StudentModel.roll_number.in_(chunk),
+            ).delete(synchronize_session=False)
+
+        changed = [
+            {'classroom_id': class_id, 'roll_number': roll, 'name': name}
+            for roll, name in desired.items()
+            if existing.get(roll) != name
+        ]
+        if changed:
+            self._upsert_students(session, changed, existing)
+
+    def _upsert_students(
+        self, session: Session, rows: List[Dict[str, Any]], existing: Dict[str, str]
+    ) -> None:
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(StudentModel)
+            statement = statement.on_conflict_do_update(
+                index_elements=[StudentModel.classroom_id, StudentModel.roll_number],
+                set_={'name': statement.excluded.name},
+            )
+            session.execute(statement, rows)
+            return
+
+        inserts = [row for row in rows if row['roll_number'] not in existing]
+        updates = [row for row in rows if row['roll_number'] in existing]
+        if inserts:
+            session.execute(insert(StudentModel), inserts)
+        for row in updates:
+            session.query(StudentModel).filter(
+                StudentModel.classroom_id == row['classroom_id'],
+                StudentModel.roll_number == row['roll_number'],
+            ).update({'name': row['name']}, synchronize_session=False)
+
+    def _load_classroom(self, session: Session, class_id: str) -> Optional[Classroom]:
+        model = (
+            session.query(ClassroomModel)
+            .options(selectinload(ClassroomModel.students))
+            .filter(ClassroomModel.id == class_id)
+            .first()
+        )
+        return self._to_domain(model)
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
         session = self.db.get_session()
+        try:
+            count, latest = session.query(
+                func.count(ClassroomModel.id), func.max(ClassroomModel.updated_at)
+            ).one()
+            return count, latest
+        finally:
+            session.close()
+
+    def delete_classroom(self, class_id: str) -> bool:
+        session = self.db.get_write_session()
         try:
             result = session.query(ClassroomModel).filter(ClassroomModel.id == class_id).delete()
             session.commit()
@@ -339,69 +741,8 @@ class DatabaseClassroomRepository:
                     roll_number=student.roll_number,
                     name=student.name,
                 )
-                for student in sorted(model.students, key=lambda s: s.roll_number)
+                for student in model.students
             ],
             created_at=model.created_at or datetime.utcnow(),
             updated_at=model.updated_at or datetime.utcnow(),
         )
-
-    def create_user(
-        self,
-        username: str,
-        password_hash: str,
-        role: str = 'teacher',
-        email: Optional[str] = None
-    ) -> Tuple[bool, Optional[str]]:
-        session = self.db.get_session()
-        try:
-            existing = self.get_user_by_username(username)
-            if existing:
-                return False, "Username already exists"
-
-            user = UserModel(
-                username=username,
-                password_hash=password_hash,
-                role=role,
-                email=email
-            )
-
-            session.add(user)
-            session.commit()
-            logger.info(f"User {username} created in database")
-            return True, None
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error creating user: {str(e)}", exc_info=True)
-            return False, f"Error creating user: {str(e)}"
-        finally:
-            session.close()
-
-    def update_user(self, username: str, **kwargs) -> Tuple[bool, Optional[str]]:
-        session = self.db.get_session()
-        try:
-            user = self.get_user_by_username(username)
-            if not user:
-                return False, "User not found"
-
-            for key, value in kwargs.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
-
-            user.updated_at = datetime.utcnow()
-            session.commit()
-            logger.info(f"User {username} updated")
-            return True, None
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error updating user: {str(e)}", exc_info=True)
-            return False, f"Error updating user: {str(e)}"
-        finally:
-            session.close()
-
-    def get_all_users(self) -> List[UserModel]:
-        session = self.db.get_session()
-        try:
-            return session.query(UserModel).all()
-        finally:
-            session.close()
-
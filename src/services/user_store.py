@@ -0,0 +1,197 @@
+"""
+Backends for AuthService's user table.
+
+Each store exposes a cheap version() that changes whenever any user
+changes, so AuthService can keep the table in memory per worker and only
+reload it when another worker (or process) has written.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Protocol, Tuple
+
+from src.config.config import Config
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+UserRecord = Dict[str, Any]
+
+
+class UserStore(Protocol):
+    def version(self) -> Hashable:
+        ...
+
+    def load_all(self) -> Dict[str, UserRecord]:
+        ...
+
+    def create_user(self, user: UserRecord) -> Tuple[bool, Optional[str]]:
+        ...
+
+    def update_user(self, username: str, **fields) -> Tuple[bool, Optional[str]]:
+        ...
+
+
+class MemoryUserStore:
+    """Process-local store; used by tests and single-worker development."""
+
+    def __init__(self):
+        self._users: Dict[str, UserRecord] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def version(self) -> Hashable:
+        return self._version
+
+    def load_all(self) -> Dict[str, UserRecord]:
+        with self._lock:
+            return {username: dict(user) for username, user in self._users.items()}
+
+    def create_user(self, user: UserRecord) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            if user["username"] in self._users:
+                return False, "Username already exists"
+            self._users[user["username"]] = dict(user)
+            self._version += 1
+        return True, None
+
+    def update_user(self, username: str, **fields) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            if username not in self._users:
+                return False, "User not found"
+            self._users[username].update(fields)
+            self._version += 1
+        return True, None
+
+
+class FileUserStore:
+    """
+    Users in a local JSON file shared by every worker on the host.
+
+    Writes are read-modify-write under an exclusive flock on a sidecar lock
+    file (where fcntl is available) and land via temp file + os.replace;
+    the version is the file's (inode, mtime_ns, size). Every write is a new
+    inode, so a same-size rewrite within the timestamp granularity (a role
+    change, say) still changes the version.
+    """
+
+    def __init__(self, filepath: Optional[str] = None):
+        self.filepath = Path(filepath or Config.USERS_FILE)
+        self._lock_path = self.filepath.with_name(f".{self.filepath.name}.lock")
+        self._lock = threading.Lock()
+
+    def version(self) -> Hashable:
+        try:
+            stat = self.filepath.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load_all(self) -> Dict[str, UserRecord]:
+        try:
+            with self.filepath.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except ValueError as exc:
+            logger.error(f"Could not parse users file {self.filepath}: {str(exc)}")
+            return {}
+        return payload.get("users", {})
+
+    def create_user(self, user: UserRecord) -> Tuple[bool, Optional[str]]:
+        with self._exclusive():
+            users = self.load_all()
+            if user["username"] in users:
+                return False, "Username already exists"
+            users[user["username"]] = dict(user)
+            self._write(users)
+        return True, None
+
+    def update_user(self, username: str, **fields) -> Tuple[bool, Optional[str]]:
+        with self._exclusive():
+            users = self.load_all()
+            if username not in users:
+                return False, "User not found"
+            users[username].update(fields)
+            self._write(users)
+        return True, None
+
+    @contextmanager
+    def _exclusive(self):
+        with self._lock:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, "a") as lock_handle:
+                fcntl.flock(lock_handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _write(self, users: Dict[str, UserRecord]) -> None:
+        fd, temp_path = tempfile.mkstemp(
+            dir=str(self.filepath.parent), prefix=f".{self.filepath.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"users": users}, handle, indent=2)
+            os.replace(temp_path, self.filepath)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class DatabaseUserStore:
+    """Users in the UserModel table; the version is (row count, latest updated_at)."""
+
+    def __init__(self, user_service=None):
+        if user_service is None:
+            from src.services.database_service import DatabaseUserService
+
+            user_service = DatabaseUserService()
+        self._users = user_service
+
+    def version(self) -> Hashable:
+        return self._users.get_version()
+
+    def load_all(self) -> Dict[str, UserRecord]:
+        return {
+            user.username: {
+                "username": user.username,
+                "password_hash": user.password_hash,
+                "role": user.role,
+                "email": user.email,
+                "created_at": user.created_at.isoformat() if user.created_at else None,
+            }
+            for user in self._users.get_all_users()
+        }
+
+    def create_user(self, user: UserRecord) -> Tuple[bool, Optional[str]]:
+        return self._users.create_user(
+            user["username"], user["password_hash"], user.get("role", "teacher"), user.get("email")
+        )
+
+    def update_user(self, username: str, **fields) -> Tuple[bool, Optional[str]]:
+        return self._users.update_user(username, **fields)
+
+
+def build_user_store(kind: Optional[str] = None) -> UserStore:
+    kind = (kind or Config.USER_STORE or ("database" if Config.USE_DATABASE else "file")).lower()
+    if kind == "memory":
+        return MemoryUserStore()
+    if kind == "file":
+        return FileUserStore()
+    if kind == "database":
+        return DatabaseUserStore()
+    raise ValueError(f"Unknown USER_STORE '{kind}'")
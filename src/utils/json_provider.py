@@ -0,0 +1,68 @@
+"""
+JSON provider for API responses.
+
+Uses orjson when it is installed and a compact stdlib encoder otherwise.
+Both emit datetimes as ISO 8601 and never pretty-print or sort keys, so
+large record pages and analytics payloads encode in a single pass.
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+    compact = True
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. integers wider than 64 bits; the stdlib encoder handles those
+                pass
+        return self._dumps_stdlib(obj, **kwargs).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            return self.dumps_bytes(obj).decode("utf-8")
+        return self._dumps_stdlib(obj, **kwargs)
+
+    def _dumps_stdlib(self, obj: Any, **kwargs: Any) -> str:
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", False)
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,207 @@
+"""
+SQLite storage backend for the ``limits`` library.
+
+Registers the ``sqlite://`` scheme so Flask-Limiter counters can live in a
+local database file shared by every gunicorn worker on the host, without
+running Redis or memcached:
+
+    RATELIMIT_STORAGE_URI=sqlite:///ratelimits.db
+
+Every check-and-increment runs inside one ``BEGIN IMMEDIATE`` transaction,
+so fixed-window, moving-window and sliding-window-counter limits stay
+exact across processes.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from limits.storage import MovingWindowSupport, Storage
+
+try:
+    from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+    _SLIDING_WINDOW_BASES = (SlidingWindowCounterSupport, TimestampedSlidingWindow)
+except ImportError:  # limits < 4.1 has no sliding-window-counter strategy
+    _SLIDING_WINDOW_BASES = ()
+
+# Expired rows are purged once every this many writes per connection
+PURGE_INTERVAL = 1000
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS counters ("
+    " key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS window_entries ("
+    " key TEXT NOT NULL, ts REAL NOT NULL, expires_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_window_entries_key_ts ON window_entries (key, ts)",
+)
+
+
+class SQLiteStorage(Storage, MovingWindowSupport, *_SLIDING_WINDOW_BASES):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        path = uri.split("://", 1)[1]
+        self.path = path[1:] if path.startswith("/") else path
+        self.timeout = float(options.get("timeout", 5))
+        self._local = threading.local()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._transaction(lambda connection: None)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after fork (preload_app=True)
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            self._local.writes = 0
+        return connection
+
+    def _transaction(self, work):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(connection)
+            self._local.writes += 1
+            if self._local.writes % PURGE_INTERVAL == 0:
+                now = time.time()
+                connection.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+                connection.execute("DELETE FROM window_entries WHERE expires_at <= ?", (now,))
+            connection.execute("COMMIT")
+            return result
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _incr(self, connection: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        row = connection.execute(
+            "SELECT value, expires_at FROM counters WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            value = amount
+            connection.execute(
+                "INSERT OR REPLACE INTO counters (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + expiry),
+            )
+        else:
+            value = row[0] + amount
+            connection.execute("UPDATE counters SET value = ? WHERE key = ?", (value, key))
+        return value
+
+    def _get(self, connection: sqlite3.Connection, key: str, now: float) -> Tuple[int, Optional[float]]:
+        row = connection.execute(
+            "SELECT value, expires_at FROM counters WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    # Fixed window
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._transaction(lambda connection: self._incr(connection, key, expiry, amount, time.time()))
+
+    def get(self, key: str) -> int:
+        return self._get(self._connection(), key, time.time())[0]
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        expires_at = self._get(self._connection(), key, now)[1]
+        return expires_at if expires_at is not None else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        def work(connection):
+            count = connection.execute("SELECT COUNT(*) FROM counters").fetchone()[0]
+            count += connection.execute("SELECT COUNT(DISTINCT key) FROM window_entries").fetchone()[0]
+            connection.execute("DELETE FROM counters")
+            connection.execute("DELETE FROM window_entries")
+            return count
+
+        return self._transaction(work)
+
+    def clear(self, key: str) -> None:
+        def work(connection):
+            connection.execute("DELETE FROM counters WHERE key = ?", (key,))
+            connection.execute("DELETE FROM window_entries WHERE key = ?", (key,))
+
+        self._transaction(work)
+
+    # Moving window
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def work(connection):
+            now = time.time()
+            count = connection.execute(
+                "SELECT COUNT(*) FROM window_entries WHERE key = ? AND ts > ?", (key, now - expiry)
+            ).fetchone()[0]
+            if count + amount > limit:
+                return False
+            connection.executemany(
+                "INSERT INTO window_entries (key, ts, expires_at) VALUES (?, ?, ?)",
+                [(key, now, now + expiry)] * amount,
+            )
+            return True
+
+        return self._transaction(work)
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> Tuple[float, int]:
+        now = time.time()
+        oldest, count = self._connection().execute(
+            "SELECT MIN(ts), COUNT(*) FROM window_entries WHERE key = ? AND ts > ?", (key, now - expiry)
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    # Sliding window counter
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def work(connection):
+            now = time.time()
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(connection, key, expiry, now)
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            if math.floor(weighted_count) + amount > limit:
+                return False
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            self._incr(connection, current_key, 2 * expiry, amount, now)
+            return True
+
+        return self._transaction(work)
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        return self._sliding_window(self._connection(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+    def _sliding_window(
+        self, connection: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> Tuple[int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(connection, previous_key, now)[0]
+        current_count = self._get(connection, current_key, now)[0]
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
@@ -2,6 +2,8 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask import Flask
 from src.config.config import Config
+# Registers the sqlite:// storage scheme with limits
+import src.utils.rate_limit_storage  # noqa: F401
 
 limiter: Limiter = None
 
@@ -11,7 +13,9 @@ def init_rate_limiter(app: Flask) -> Limiter:
         app=app,
         key_func=get_remote_address,
         default_limits=["200 per day", "50 per hour"],
-        storage_uri="memory://",
+        storage_uri=Config.RATELIMIT_STORAGE_URI,
+        strategy=Config.RATELIMIT_STRATEGY,
+        enabled=Config.RATELIMIT_ENABLED,
     )
     return limiter
 
@@ -0,0 +1,103 @@
+"""
+Streaming parsers for bulk roster uploads (CSV or NDJSON).
+
+Rows are yielded one at a time as (line number, row, parse error) so an
+upload is never held in memory as a whole.
+"""
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from marshmallow import ValidationError
+
+from src.utils.validators import validate_roll_number
+
+RosterRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+REQUIRED_COLUMNS = ("roll_number", "name")
+
+T = TypeVar("T")
+
+
+def detect_roster_format(mimetype: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    if requested:
+        requested = requested.strip().lower()
+        return requested if requested in ("csv", "ndjson") else None
+    mimetype = (mimetype or "").lower()
+    if mimetype in CSV_CONTENT_TYPES:
+        return "csv"
+    if mimetype in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    return None
+
+
+def _text_stream(stream: IO[bytes]) -> io.TextIOWrapper:
+    if not hasattr(stream, "read1"):
+        stream = io.BufferedReader(stream)
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[RosterRow]:
+    reader = csv.DictReader(_text_stream(stream))
+    header = [column.strip().lower() for column in (reader.fieldnames or [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"CSV header must include columns: {', '.join(REQUIRED_COLUMNS)}")
+    reader.fieldnames = header
+
+    for row in reader:
+        if not any((value or "").strip() for value in row.values() if isinstance(value, str)):
+            continue
+        yield reader.line_num, {column: row.get(column) for column in REQUIRED_COLUMNS}, None
+
+
+def iter_ndjson_rows(stream: IO[bytes]) -> Iterator[RosterRow]:
+    for line_number, line in enumerate(_text_stream(stream), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def iter_roster_rows(stream: IO[bytes], roster_format: str) -> Iterator[RosterRow]:
+    if roster_format == "csv":
+        return iter_csv_rows(stream)
+    return iter_ndjson_rows(stream)
+
+
+def validate_roster_row(row: Dict[str, Any]) -> Optional[str]:
+    """Return an error message for an invalid row, mirroring StudentProfileSchema."""
+    roll_number = str(row.get("roll_number") or "").strip()
+    name = str(row.get("name") or "").strip()
+    if not roll_number:
+        return "Student roll number is required"
+    if not name:
+        return "Student name is required"
+    if len(name) > 200:
+        return "Student name must be less than 200 characters"
+    try:
+        validate_roll_number(roll_number)
+    except ValidationError as err:
+        return "; ".join(err.messages)
+    return None
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,189 @@
+"""
+Token-bucket rate limiting keyed by authenticated user.
+
+Each (route, identity) pair gets a bucket that refills at its role's rate
+and holds up to the role's burst. The identity is the username from a
+valid bearer token, falling back to the client address for anonymous
+callers, so teachers behind one campus NAT no longer share a budget.
+
+Buckets live in the worker's memory, so with N gunicorn workers a user
+can get up to N times the burst. A hit is amortized O(1) and only contends
+with keys that hash to the same lock stripe.
+"""
+import math
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from flask import jsonify, make_response, request
+from flask_limiter.util import get_remote_address
+
+from src.config.config import Config
+
+ANONYMOUS_ROLE = "anonymous"
+
+
+@dataclass(frozen=True)
+class BucketBudget:
+    rate_per_minute: float
+    burst: int
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.rate_per_minute / 60.0
+
+
+@dataclass
+class BucketDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def parse_role_budgets(spec: str) -> Dict[str, BucketBudget]:
+    """Parse "role=rate_per_minute/burst,..." into budgets."""
+    budgets = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        role, _, limits = entry.partition("=")
+        rate, _, burst = limits.partition("/")
+        budget = BucketBudget(rate_per_minute=float(rate), burst=int(burst or rate))
+        if budget.rate_per_minute <= 0 or budget.burst <= 0:
+            raise ValueError(f"Rate limit budget for '{role}' must be positive")
+        budgets[role.strip().lower()] = budget
+    return budgets
+
+
+class TokenBucketLimiter:
+    def __init__(
+        self,
+        budgets: Dict[str, BucketBudget],
+        stripes: int = 64,
+        max_buckets: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.budgets = budgets
+        self.max_buckets = max_buckets
+        self._clock = clock
+        # key -> [tokens, updated_at, refill_per_second, burst]
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._prune_lock = threading.Lock()
+
+    def budget_for(self, role: Optional[str]) -> BucketBudget:
+        return self.budgets.get(role or ANONYMOUS_ROLE) or self.budgets[ANONYMOUS_ROLE]
+
+    def hit(self, key: str, budget: BucketBudget, cost: int = 1) -> BucketDecision:
+        rate = budget.refill_per_second
+        lock = self._locks[zlib.crc32(key.encode("utf-8")) % len(self._locks)]
+        with lock:
+            now = self._clock()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = float(budget.burst)
+            else:
+                tokens = min(float(budget.burst), bucket[0] + (now - bucket[1]) * rate)
+            # A cost above the burst is let through on a full bucket and leaves
+            # it in debt, so large batches work but are still paid for in full
+            needed = min(cost, budget.burst)
+            allowed = tokens >= needed
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = [tokens, now, rate, budget.burst]
+
+        if len(self._buckets) > self.max_buckets and self._prune_lock.acquire(blocking=False):
+            try:
+                self._prune()
+            finally:
+                self._prune_lock.release()
+
+        return BucketDecision(
+            allowed=allowed,
+            limit=budget.burst,
+            remaining=max(0, int(tokens)),
+            reset_after=(budget.burst - tokens) / rate,
+            retry_after=0.0 if allowed else (needed - tokens) / rate,
+        )
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+    def _prune(self) -> None:
+        """
+        Drop refilled buckets, then the least recently hit ones until at most
+        half of max_buckets remain, so the next scan is max_buckets / 2 new
+        keys away.
+        """
+        now = self._clock()
+        active = []
+        for key, (tokens, updated_at, rate, burst) in list(self._buckets.items()):
+            # A bucket that has refilled completely is the same as no bucket
+            if tokens + (now - updated_at) * rate >= burst:
+                self._buckets.pop(key, None)
+            else:
+                active.append((updated_at, key))
+
+        excess = len(active) - self.max_buckets // 2
+        if excess > 0:
+            active.sort()
+            for _, key in active[:excess]:
+                self._buckets.pop(key, None)
+
+
+bucket_limiter = TokenBucketLimiter(parse_role_budgets(Config.RATE_LIMIT_ROLE_BUDGETS))
+
+
+def request_identity() -> Tuple[str, str]:
+    """Return (identity, role) for the current request."""
+    from src.services.auth_service import auth_service
+
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        is_valid, user_info = auth_service.verify_token(auth_header[len("Bearer "):])
+        if is_valid and user_info:
+            return f"user:{user_info['username']}", user_info["role"]
+    return f"ip:{get_remote_address()}", ANONYMOUS_ROLE
+
+
+def rate_limit_bucket(route: str, cost: Union[int, Callable[[], int]] = 1):
+    """
+    Apply the per-user token bucket for route and add X-RateLimit headers.
+    cost may be a callable evaluated per request, e.g. to charge per item
+    of a batch body.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not Config.RATELIMIT_ENABLED:
+                return f(*args, **kwargs)
+            identity, role = request_identity()
+            amount = cost() if callable(cost) else cost
+            decision = bucket_limiter.hit(f"{route}:{identity}", bucket_limiter.budget_for(role), amount)
+            if decision.allowed:
+                response = make_response(f(*args, **kwargs))
+            else:
+                response = jsonify({
+                    "error": "rate_limit_exceeded",
+                    "status_code": 429,
+                    "message": f"Too many requests; retry in {math.ceil(decision.retry_after)}s",
+                })
+                response.status_code = 429
+            response.headers.update(decision.headers())
+            return response
+
+        return decorated_function
+    return decorator
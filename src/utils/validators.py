@@ -3,13 +3,21 @@ from marshmallow import Schema, fields, validate, ValidationError, post_load
 from datetime import datetime
 import re
 
+_TEACHER_NAME_RE = re.compile(r'^[a-zA-Z\s\.\-]+$')
+_ROLL_NUMBER_RE = re.compile(r'^[a-zA-Z0-9\-\_]+$')
+# A whole roster joined with "," matches this only if every roll number is valid
+_ROLL_NUMBER_LIST_RE = re.compile(r'[a-zA-Z0-9\-\_]{0,50}(?:,[a-zA-Z0-9\-\_]{0,50})*')
+_HTML_BRACKETS_RE = re.compile(r'[<>]')
+
+ROLL_NUMBER_MAX_LENGTH = 50
+
 
 def validate_teacher_name(value: str) -> None:
     if not value or not value.strip():
         raise ValidationError("Teacher name cannot be empty")
     if len(value.strip()) > 100:
         raise ValidationError("Teacher name must be less than 100 characters")
-    if not re.match(r'^[a-zA-Z\s\.\-]+$', value.strip()):
+    if not _TEACHER_NAME_RE.match(value.strip()):
         raise ValidationError("Teacher name contains invalid characters")
 
 
@@ -29,12 +37,39 @@ def validate_year(value: str) -> None:
 
 def validate_roll_number(value: str) -> None:
     if value and value.strip():
-        if len(value.strip()) > 50:
+        if len(value.strip()) > ROLL_NUMBER_MAX_LENGTH:
             raise ValidationError("Roll number must be less than 50 characters")
-        if not re.match(r'^[a-zA-Z0-9\-\_]+$', value.strip()):
+        if not _ROLL_NUMBER_RE.match(value.strip()):
             raise ValidationError("Roll number contains invalid characters")
 
 
+def validate_roll_numbers(values: List[str], allow_blank: bool = True) -> Dict[int, List[str]]:
+    """
+    Check a whole roster in one regex pass. Returns errors keyed by list
+    position (empty when every roll number is valid); the per-item checks
+    only run to build messages for a roster that failed the fast path.
+    """
+    stripped = [value.strip() for value in values]
+    joined = ",".join(stripped)
+    if (
+        joined.count(",") == len(stripped) - 1
+        and _ROLL_NUMBER_LIST_RE.fullmatch(joined)
+        and (allow_blank or all(stripped))
+    ):
+        return {}
+
+    errors: Dict[int, List[str]] = {}
+    for position, value in enumerate(values):
+        if not allow_blank and not stripped[position]:
+            errors[position] = ["Roll number cannot be empty"]
+            continue
+        try:
+            validate_roll_number(value)
+        except ValidationError as err:
+            errors[position] = err.messages
+    return errors
+
+
 class TeacherNameField(fields.String):
     def __init__(self, **kwargs):
         super().__init__(validate=validate_teacher_name, **kwargs)
@@ -55,6 +90,33 @@ class RollNumberField(fields.String):
         super().__init__(validate=validate_roll_number, **kwargs)
 
 
+class RollNumberListField(fields.List):
+    """
+    List of roll numbers validated as a whole with validate_roll_numbers
+    instead of one RollNumberField per item. Errors keep the per-index
+    shape of fields.List.
+    """
+
+    def __init__(self, allow_blank: bool = True, **kwargs):
+        super().__init__(fields.String(), **kwargs)
+        self.allow_blank = allow_blank
+
+    def _deserialize(self, value, attr, data, **kwargs) -> List[str]:
+        if not isinstance(value, (list, tuple)):
+            raise self.make_error("invalid")
+        not_strings = {
+            position: ["Not a valid string."]
+            for position, item in enumerate(value)
+            if not isinstance(item, str)
+        }
+        if not_strings:
+            raise ValidationError(not_strings, valid_data=[])
+        errors = validate_roll_numbers(value, self.allow_blank)
+        if errors:
+            raise ValidationError(errors, valid_data=[])
+        return list(value)
+
+
 class AttendanceFormSchema(Schema):
     teacher_name = TeacherNameField(required=True)
     date = fields.Date(required=True, format='%Y-%m-%d')
@@ -62,8 +124,7 @@ class AttendanceFormSchema(Schema):
     year = YearField(required=True)
     class_id = fields.String(required=True, validate=validate.Length(min=1, max=64))
     class_name = fields.String(required=False, allow_none=True, validate=validate.Length(max=200))
-    present_students = fields.List(
-        RollNumberField(),
+    present_students = RollNumberListField(
         required=True,
         validate=validate.Length(min=1, error="At least one student must be marked present")
     )
@@ -95,8 +156,7 @@ class AttendanceRequestSchema(Schema):
     date = fields.Date(required=True, format='%Y-%m-%d')
     course = CourseField(required=True)
     year = YearField(required=True)
-    roll_numbers = fields.List(
-        RollNumberField(),
+    roll_numbers = RollNumberListField(
         required=True,
         validate=validate.Length(min=1, max=500, error="Must have between 1 and 500 students")
     )
@@ -106,36 +166,41 @@ def sanitize_string(value: str, max_length: Optional[int] = None) -> str:
     if not isinstance(value, str):
         return ""
     sanitized = value.strip()
-    sanitized = re.sub(r'[<>]', '', sanitized)
+    sanitized = _HTML_BRACKETS_RE.sub('', sanitized)
     if max_length:
         sanitized = sanitized[:max_length]
     return sanitized
 
 
+_attendance_form_schema = AttendanceFormSchema()
+_search_records_schema = SearchRecordsSchema()
+
+
+def _flatten_messages(messages: Any) -> List[str]:
+    # fields.List reports item errors as {index: [messages]}
+    if isinstance(messages, dict):
+        return [message for value in messages.values() for message in _flatten_messages(value)]
+    if isinstance(messages, list):
+        return [message for value in messages for message in _flatten_messages(value)]
+    return [str(messages)]
+
+
 def validate_attendance_form(form_data: Dict[str, Any]) -> tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
     try:
-        schema = AttendanceFormSchema()
-        validated_data = schema.load(form_data)
+        validated_data = _attendance_form_schema.load(form_data)
         return True, validated_data, None
     except ValidationError as err:
-        error_messages = []
-        for field, messages in err.messages.items():
-            error_messages.extend(messages)
-        return False, None, "; ".join(error_messages)
+        return False, None, "; ".join(_flatten_messages(err.messages))
     except Exception as e:
         return False, None, f"Validation error: {str(e)}"
 
 
 def validate_search_form(form_data: Dict[str, Any]) -> tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
     try:
-        schema = SearchRecordsSchema()
-        validated_data = schema.load(form_data)
+        validated_data = _search_records_schema.load(form_data)
         return True, validated_data, None
     except ValidationError as err:
-        error_messages = []
-        for field, messages in err.messages.items():
-            error_messages.extend(messages)
-        return False, None, "; ".join(error_messages)
+        return False, None, "; ".join(_flatten_messages(err.messages))
     except Exception as e:
         return False, None, f"Validation error: {str(e)}"
 
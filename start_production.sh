@@ -18,8 +18,14 @@ fi
 
 WORKERS=${WORKERS:-4}
 PORT=${PORT:-5001}
+# src.asgi serves the block event stream; WORKER_CLASS=sync runs the plain Flask app
+export WORKER_CLASS=${WORKER_CLASS:-uvicorn.workers.UvicornWorker}
+case "$WORKER_CLASS" in
+    *uvicorn*) APP=src.asgi:app ;;
+    *) APP=src.app:app ;;
+esac
 
-echo "Starting Gunicorn with $WORKERS workers on port $PORT"
+echo "Starting Gunicorn with $WORKERS $WORKER_CLASS workers on port $PORT ($APP)"
 
-exec gunicorn --config gunicorn_config.py src.app:app
+exec gunicorn --config gunicorn_config.py "$APP"
 
@@ -1,6 +1,12 @@
+import os
+
+# Keep the app's users in memory instead of writing users_data.json in the working directory
+os.environ.setdefault("USER_STORE", "memory")
+
 import pytest
 from src.services.blockchain_service import BlockchainService
 from src.services.auth_service import AuthService
+from src.services.user_store import MemoryUserStore
 from src.blockchain.block import Block
 import datetime as dt
 
@@ -13,7 +19,7 @@ def blockchain_service():
 
 @pytest.fixture
 def auth_service():
-    service = AuthService()
+    service = AuthService(store=MemoryUserStore())
     return service
 
 
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from src.blockchain.genesis import create_genesis_block
+from src.blockchain.newBlock import next_block
+from src.models.database import DatabaseService
+from src.models.classroom_models import Classroom, StudentProfile
+from src.services.database_service import DatabaseBlockchainService, DatabaseClassroomRepository
+from src.asgi import create_asgi_app
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'asgi.db'}"
+    database = DatabaseService(url)
+
+    blocks = DatabaseBlockchainService()
+    blocks.db = database
+    genesis = create_genesis_block()
+    blocks.add_block(genesis)
+    blocks.add_block(next_block(genesis, {
+        "type": "attendance",
+        "teacher_name": "Test Teacher",
+        "date": "2024-01-01",
+        "course": "Test Course",
+        "year": "2024",
+        "present_students": ["001", "002"],
+    }))
+
+    classrooms = DatabaseClassroomRepository()
+    classrooms.db = database
+    classrooms.save_classroom(Classroom(
+        id="CLS-ASGI",
+        name="Async Class",
+        students=[StudentProfile(roll_number="001", name="Ana")],
+    ))
+    return f"sqlite+aiosqlite:///{tmp_path / 'asgi.db'}"
+
+
+async def _get(app, path, query=b""):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}
+    await app(scope, receive, send)
+    status = messages[0]["status"]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return status, json.loads(body)
+
+
+def _run(app, *requests):
+    async def run_all():
+        try:
+            return [await _get(app, *request) for request in requests]
+        finally:
+            await app._blockchain_service.db.dispose()
+    return asyncio.run(run_all())
+
+
+def test_async_records_and_student_search(database_url):
+    app = create_asgi_app(database_url=database_url)
+
+    (records_status, records), (search_status, search) = _run(
+        app, ("/api/v1/records", b"per_page=5"), ("/api/v1/students/002",)
+    )
+
+    assert records_status == 200
+    assert records["data"]["pagination"]["total"] == 1
+    assert records["data"]["data"][0]["student_count"] == 2
+    assert search_status == 200
+    assert search["data"]["total_records"] == 1
+
+
+def test_async_classroom_listing(database_url):
+    app = create_asgi_app(database_url=database_url)
+
+    (list_status, listing), (summary_status, summaries), (missing_status, _) = _run(
+        app,
+        ("/api/v1/classrooms",),
+        ("/api/v1/classrooms", b"view=summary"),
+        ("/api/v1/classrooms/MISSING",),
+    )
+
+    assert list_status == 200
+    assert listing["data"][0]["current_student_count"] == 1
+    assert summary_status == 200
+    assert "students" not in summaries["data"][0]
+    assert missing_status == 404
+
+
+def test_async_records_summary_view_and_cursor(database_url):
+    app = create_asgi_app(database_url=database_url)
+
+    (summary_status, summary), (cursor_status, cursor_page) = _run(
+        app,
+        ("/api/v1/records", b"view=summary"),
+        ("/api/v1/records", b"cursor=&fields=student_count"),
+    )
+
+    assert summary_status == 200
+    assert "present_students" not in summary["data"]["data"][0]
+    assert summary["data"]["data"][0]["student_count"] == 2
+    assert cursor_status == 200
+    assert cursor_page["data"]["data"] == [{"block_index": 1, "student_count": 2}]
+    assert cursor_page["data"]["pagination"]["next_cursor"] is None
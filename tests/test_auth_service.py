@@ -1,5 +1,11 @@
+import os
+
 import pytest
+from src.config.config import Config
+from src.models.database import DatabaseService
 from src.services.auth_service import AuthService, ROLES
+from src.services.database_service import DatabaseUserService
+from src.services.user_store import DatabaseUserStore, FileUserStore, MemoryUserStore
 
 
 class TestAuthService:
@@ -76,3 +82,99 @@ class TestAuthService:
         assert auth_service.has_permission(user_info, "write") is True
         assert auth_service.has_permission(user_info, "delete") is False
 
+
+    def test_authenticate_reuses_verified_password(self, auth_service, monkeypatch):
+        auth_service.create_user("cached_user", "password123", ROLES["TEACHER"])
+        assert auth_service.authenticate("cached_user", "password123")[0] is True
+
+        def fail_verify(password, password_hash):
+            raise AssertionError("bcrypt should not run for a cached verification")
+
+        monkeypatch.setattr(auth_service, "_verify_password", fail_verify)
+        assert auth_service.authenticate("cached_user", "password123")[0] is True
+
+        monkeypatch.setattr(auth_service, "_verify_password", lambda password, password_hash: False)
+        assert auth_service.authenticate("cached_user", "wrong-password")[0] is False
+
+    def test_verify_token_cached_until_role_change(self, auth_service, monkeypatch):
+        auth_service.create_user("role_user", "password", ROLES["VIEWER"])
+        token = auth_service.generate_token("role_user", ROLES["VIEWER"])
+        assert auth_service.verify_token(token)[1]["role"] == ROLES["VIEWER"]
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("cached token should not be decoded again")
+
+        monkeypatch.setattr("src.services.auth_service.jwt.decode", fail_decode)
+        is_valid, user_info = auth_service.verify_token(token)
+        assert is_valid is True
+        assert auth_service.has_permission(user_info, "write") is False
+        monkeypatch.undo()
+
+        success, _ = auth_service.update_user_role("role_user", ROLES["TEACHER"])
+        assert success is True
+        is_valid, user_info = auth_service.verify_token(token)
+        assert user_info["role"] == ROLES["TEACHER"]
+        assert auth_service.has_permission(user_info, "write") is True
+
+
+@pytest.fixture
+def shared_store_services(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "USER_CACHE_CHECK_SECONDS", 0)
+    users_file = str(tmp_path / "users.json")
+    return AuthService(store=FileUserStore(users_file)), AuthService(store=FileUserStore(users_file))
+
+
+def test_file_store_shares_users_between_workers(shared_store_services):
+    first, second = shared_store_services
+    assert list(first.users) == ["admin"]
+
+    first.create_user("shared_user", "password123", ROLES["TEACHER"])
+    assert second.authenticate("shared_user", "password123")[0] is True
+
+    token = second.generate_token("shared_user", ROLES["TEACHER"])
+    assert second.verify_token(token)[1]["role"] == ROLES["TEACHER"]
+    first.update_user_role("shared_user", ROLES["VIEWER"])
+    assert second.verify_token(token)[1]["role"] == ROLES["VIEWER"]
+
+
+def test_file_store_version_changes_on_same_size_rewrite(tmp_path, monkeypatch):
+    store = FileUserStore(str(tmp_path / "users.json"))
+    store.create_user({"username": "sam", "password_hash": "x", "role": ROLES["STUDENT"]})
+    before = store.version()
+
+    # Pin mtime so only the rewrite itself can change the version
+    real_replace = os.replace
+
+    def replace_keeping_mtime(source, target):
+        real_replace(source, target)
+        os.utime(target, ns=(before[1], before[1]))
+
+    monkeypatch.setattr(os, "replace", replace_keeping_mtime)
+    store.update_user("sam", role=ROLES["TEACHER"])
+
+    assert store.version()[1:] == before[1:]
+    assert store.version() != before
+
+
+def test_auth_service_builds_configured_store_on_first_use(monkeypatch):
+    built = []
+    monkeypatch.setattr("src.services.auth_service.build_user_store", lambda: built.append(1) or MemoryUserStore())
+    service = AuthService()
+    assert built == []
+
+    assert service.authenticate("admin", "admin123")[0] is True
+    assert built == [1]
+
+
+def test_database_store_backs_auth_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "USER_CACHE_CHECK_SECONDS", 0)
+    user_service = DatabaseUserService()
+    user_service.db = DatabaseService(f"sqlite:///{tmp_path / 'users.db'}")
+    service = AuthService(store=DatabaseUserStore(user_service))
+
+    success, _ = service.create_user("db_user", "password123", ROLES["TEACHER"])
+    assert success is True
+    assert service.create_user("db_user", "password123", ROLES["TEACHER"])[0] is False
+    assert service.update_user_role("db_user", ROLES["ADMIN"])[0] is True
+    assert user_service.get_user_by_username("db_user").role == ROLES["ADMIN"]
+    assert service.authenticate("admin", "admin123")[0] is True
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.api.v1.events import BlockEventStream
+from src.blockchain.genesis import create_genesis_block
+from src.blockchain.newBlock import next_block
+from src.config.config import Config
+from src.services.block_events import BlockEventHub
+from src.services.blockchain_service import BlockchainService
+
+METADATA = {'teacher_name': 'Teacher', 'course': 'Course', 'year': '2024', 'date': '2024-01-01'}
+
+
+def _chain(length):
+    chain = [create_genesis_block()]
+    for number in range(1, length):
+        chain.append(next_block(chain[-1], {"type": "attendance", "present_students": [f"{number:03d}"]}))
+    return chain
+
+
+def test_subscription_overflow_drops_backlog_and_flags_catch_up():
+    hub = BlockEventHub(buffer_size=2, max_subscribers=1)
+    subscription = hub.subscribe()
+
+    hub.publish(_chain(4))
+    events, overflowed = subscription.drain()
+
+    assert events == []
+    assert overflowed is True
+    assert hub.subscribe() is None
+
+    hub.unsubscribe(subscription)
+    assert hub.subscribe() is not None
+
+
+def test_single_poller_marks_every_subscriber_behind_when_tip_moves():
+    hub = BlockEventHub(buffer_size=4, max_subscribers=2)
+    woken = threading.Event()
+    first = hub.subscribe(woken.set)
+    second = hub.subscribe()
+    hub.publish(_chain(3))
+    first.drain()
+    second.drain()
+
+    tip = [2]
+    pollers = []
+
+    def tip_index():
+        pollers.append(threading.get_ident())
+        return tip[0]
+
+    hub.start_polling(tip_index, 0.01)
+    hub.start_polling(tip_index, 0.01)
+    woken.clear()
+    tip[0] = 5
+
+    assert woken.wait(timeout=2)
+    assert first.drain() == ([], True)
+    assert second.drain() == ([], True)
+    assert len(set(pollers)) == 1
+
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+    time.sleep(0.05)
+    polls = len(pollers)
+    time.sleep(0.05)
+    assert len(pollers) == polls
+
+
+def test_first_poll_seeds_tip_without_waking_subscribers():
+    hub = BlockEventHub(buffer_size=4, max_subscribers=1)
+    subscription = hub.subscribe()
+    polled = threading.Event()
+
+    def tip_index():
+        polled.set()
+        return 7
+
+    hub.start_polling(tip_index, 30)
+    assert polled.wait(timeout=2)
+    time.sleep(0.05)
+
+    assert subscription.drain() == ([], False)
+    hub.unsubscribe(subscription)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "BLOCKCHAIN_FILE", str(tmp_path / "chain.json"))
+    # Long enough that only a pushed event can wake the stream within the test timeout
+    monkeypatch.setattr(Config, "SSE_POLL_SECONDS", 30)
+    return BlockchainService()
+
+
+def _run_stream(service, headers, on_start, frames_wanted):
+    """Drive one stream until frames_wanted events arrive, then disconnect."""
+    frames = []
+
+    async def run():
+        done = asyncio.Event()
+
+        async def receive():
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                asyncio.get_running_loop().call_later(0.05, on_start)
+            body = message.get("body", b"")
+            if b"event:" in body:
+                frames.append(body.decode("utf-8"))
+            if len(frames) >= frames_wanted:
+                done.set()
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/events/blocks", "headers": headers}
+        await asyncio.wait_for(BlockEventStream(service, send).run(scope, receive, {}), timeout=5)
+
+    asyncio.run(run())
+    return frames
+
+
+def test_stream_resumes_from_last_event_id_then_pushes_new_blocks(service):
+    for roll in ("001", "002"):
+        service.add_attendance_block({"roll_no1": roll}, METADATA)
+
+    def append_from_request_thread():
+        threading.Thread(target=service.add_attendance_block, args=({"roll_no1": "003"}, METADATA)).start()
+
+    frames = _run_stream(service, [(b"last-event-id", b"1")], append_from_request_thread, frames_wanted=2)
+
+    assert [frame.split("\n")[0] for frame in frames] == ["id: 2", "id: 3"]
+    payload = json.loads(frames[1].split("data: ")[1])
+    assert payload["index"] == 3
+    assert payload["student_count"] == 1
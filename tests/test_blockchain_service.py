@@ -111,3 +111,92 @@ class TestBlockchainService:
         records = blockchain_service.get_all_records()
         assert isinstance(records, list)
 
+
+    def test_get_stats_tracks_appended_blocks(self, blockchain_service):
+        before = blockchain_service.get_stats()
+        form_data = {"roll_no1": "001", "roll_no2": "002"}
+        attendance_data = {
+            "teacher_name": "Test Teacher",
+            "date": "2024-01-01",
+            "course": "Test Course",
+            "year": "2024",
+        }
+
+        blockchain_service.add_attendance_block(form_data, attendance_data)
+        stats = blockchain_service.get_stats()
+
+        assert stats["total_blocks"] == before["total_blocks"] + 1
+        assert stats["attendance_blocks"] == before["attendance_blocks"] + 1
+        assert stats["total_attendance_records"] == before["total_attendance_records"] + 2
+        assert stats["latest_block"]["hash"] == blockchain_service.get_chain_metadata().tip_hash
+
+
+def test_shared_service_picks_up_blocks_written_by_other_workers(tmp_path, monkeypatch):
+    from src.config.config import Config
+    from src.services.blockchain_service import get_blockchain_service
+
+    monkeypatch.setattr(Config, "BLOCKCHAIN_FILE", str(tmp_path / "chain.json"))
+    monkeypatch.setattr(Config, "BACKUP_DIR", str(tmp_path / "backups"))
+
+    shared = get_blockchain_service()
+    assert get_blockchain_service() is shared
+
+    other_worker = BlockchainService(blockchain=[])
+    other_worker.add_attendance_block(
+        {"roll_no1": "001"},
+        {"teacher_name": "Test Teacher", "date": "2024-01-01", "course": "Test Course", "year": "2024"},
+    )
+
+    assert shared.get_block_count() == 2
+    assert shared.get_stats()["attendance_blocks"] == 1
+
+
+def test_record_attendance_returns_structured_result(tmp_path, monkeypatch):
+    from src.config.config import Config
+    from src.models.attendance_models import AttendanceSession
+
+    monkeypatch.setattr(Config, "BLOCKCHAIN_FILE", str(tmp_path / "chain.json"))
+    service = BlockchainService()
+    session = AttendanceSession(
+        teacher_name="Test Teacher", date="2024-01-01", course="Test Course", year="2024",
+        present_students=["001", "002"], class_id="CLS-TEST",
+    )
+
+    result = service.record_attendance(session)
+
+    assert result.success is True
+    assert result.block_index == 1
+    assert result.students_count == 2
+    session.present_students.append("003")
+    assert service.get_block_roster(1)["present_students"] == ["001", "002"]
+
+
+def test_record_attendance_batch_leaves_chain_untouched_when_save_fails(tmp_path, monkeypatch):
+    from src.config.config import Config
+    from src.models.attendance_models import AttendanceSession
+    import src.services.blockchain_service as blockchain_module
+
+    monkeypatch.setattr(Config, "BLOCKCHAIN_FILE", str(tmp_path / "chain.json"))
+    service = BlockchainService()
+    monkeypatch.setattr(blockchain_module, "save_blockchain", lambda chain, path: (False, "disk full"))
+    sessions = [
+        AttendanceSession(teacher_name="T", date="2024-01-01", course="C", year="2024", present_students=[roll])
+        for roll in ("001", "002")
+    ]
+
+    results = service.record_attendance_batch(sessions)
+
+    assert [result.success for result in results] == [False, False]
+    assert "disk full" in results[0].message
+    assert service.get_block_count() == 1
+    assert service.get_chain_metadata().height == 1
+
+
+def test_next_block_can_skip_copying_data():
+    from src.blockchain.genesis import create_genesis_block
+    from src.blockchain.newBlock import next_block
+
+    data = {"type": "attendance", "present_students": ["001"]}
+
+    assert next_block(create_genesis_block(), data).data is not data
+    assert next_block(create_genesis_block(), data, copy_data=False).data is data
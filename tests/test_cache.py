@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from src.utils.cache import ResponseCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_least_recently_used_entry_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_discard_where_removes_matching_entries():
+    cache = TTLCache(maxsize=10)
+    cache.set("alice:1", {"username": "alice"})
+    cache.set("bob:1", {"username": "bob"})
+
+    assert cache.discard_where(lambda key, value: value["username"] == "alice") == 1
+    assert len(cache) == 1
+
+
+def test_response_cache_evicts_by_total_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.get_or_render("a", lambda: b"12345")
+    cache.get_or_render("b", lambda: b"12345")
+    cache.get_or_render("c", lambda: b"123")
+
+    assert cache.size == 8
+    assert cache.get_or_render("a", lambda: b"fresh") == b"fresh"
+    assert cache.get_or_render("c", lambda: b"stale?") == b"123"
+
+
+def test_response_cache_collapses_concurrent_renders():
+    cache = ResponseCache(max_bytes=1024)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def render():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"body"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_render("k", render)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_render("k", render)))
+        for _ in range(4)
+    ]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == [b"body"] * 5
+
+
+def test_response_cache_does_not_store_failures():
+    cache = ResponseCache(max_bytes=1024)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_render("k", fail)
+    assert cache.get_or_render("k", lambda: b"ok") == b"ok"
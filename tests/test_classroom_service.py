@@ -1,10 +1,13 @@
+import io
 import json
+import threading
 from datetime import datetime
 
 import pytest
 
 from src.services.classroom_service import ClassroomService, JsonClassroomRepository
-from src.models.classroom_models import StudentProfile
+from src.models.classroom_models import Classroom, StudentProfile
+from src.utils.roster_import import iter_roster_rows
 
 
 def build_repository(tmp_path):
@@ -44,6 +47,20 @@ def test_add_students_prevents_duplicate_roll_numbers(tmp_path):
         )
 
 
+@pytest.mark.parametrize("roll_number", ["21/CS/001", "CS.101"])
+def test_add_students_rejects_roll_numbers_attendance_would_reject(tmp_path, roll_number):
+    from marshmallow import ValidationError
+    from src.api.v1.schemas import AddStudentsRequestSchema
+
+    service = ClassroomService(repository=build_repository(tmp_path), seed=False)
+    classroom = service.create_classroom("Slashes", expected_student_count=1)
+
+    with pytest.raises(ValueError, match="invalid characters"):
+        service.add_students_to_class(classroom.id, [{"roll_number": roll_number, "name": "Ana Rao"}])
+    with pytest.raises(ValidationError):
+        AddStudentsRequestSchema().load({"students": [{"roll_number": roll_number, "name": "Ana Rao"}]})
+
+
 def test_seed_from_file_populates_repository(tmp_path):
     seed_payload = {
         "metadata": {
@@ -77,3 +94,207 @@ def test_seed_from_file_populates_repository(tmp_path):
     assert len(classrooms) == 1
     assert classrooms[0].name == "Seeded Class"
 
+
+
+def test_json_repository_coalesces_writes_until_flush(tmp_path):
+    storage_path = tmp_path / "classes.json"
+    repo = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=60_000)
+    service = ClassroomService(repository=repo, seed=False)
+
+    created = service.create_classroom("Physics", expected_student_count=3)
+    service.add_students_to_class(created.id, [{"roll_number": "P01", "name": "Ada"}])
+
+    assert json.loads(storage_path.read_text(encoding="utf-8"))["classes"] == []
+    assert repo.get_classroom_by_name("PHYSICS").id == created.id
+
+    repo.flush()
+    payload = json.loads(storage_path.read_text(encoding="utf-8"))
+    assert payload["metadata"]["total_classes"] == 1
+    assert payload["classes"][0]["students"] == [{"roll_number": "P01", "name": "Ada"}]
+
+
+def test_json_repository_reloads_when_file_changes(tmp_path):
+    storage_path = tmp_path / "classes.json"
+    repo = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=0)
+    other = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=0)
+
+    created = ClassroomService(repository=other, seed=False).create_classroom(
+        "Chemistry Lab Section", expected_student_count=1
+    )
+
+    assert repo.get_classroom(created.id).name == "Chemistry Lab Section"
+
+
+def test_json_repositories_on_one_file_merge_pending_changes(tmp_path):
+    storage_path = tmp_path / "classes.json"
+    first = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=60_000)
+    second = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=60_000)
+    shared = ClassroomService(repository=first, seed=False).create_classroom("Shared", expected_student_count=2)
+    first.flush()
+
+    ClassroomService(repository=first, seed=False).create_classroom("Only First", expected_student_count=0)
+    first.add_students(shared.id, [StudentProfile(roll_number="S01", name="Ada")])
+    ClassroomService(repository=second, seed=False).create_classroom("Only Second", expected_student_count=0)
+    second.add_students(shared.id, [StudentProfile(roll_number="S02", name="Grace")])
+    first.flush()
+    second.flush()
+
+    payload = json.loads(storage_path.read_text(encoding="utf-8"))
+    assert sorted(entry["name"] for entry in payload["classes"]) == ["Only First", "Only Second", "Shared"]
+    shared_entry = next(entry for entry in payload["classes"] if entry["id"] == shared.id)
+    assert [student["roll_number"] for student in shared_entry["students"]] == ["S01", "S02"]
+    assert first.get_classroom_by_name("Only Second") is not None
+
+
+def test_json_repository_rename_keeps_students_enrolled_by_another_worker(tmp_path):
+    storage_path = tmp_path / "classes.json"
+    first = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=60_000)
+    second = JsonClassroomRepository(filepath=str(storage_path), write_delay_ms=60_000)
+    classroom = ClassroomService(repository=first, seed=False).create_classroom("Physics", expected_student_count=0)
+    first.flush()
+
+    renamed = first.get_classroom(classroom.id)
+    renamed.name = "Physics II"
+    first.save_classroom(renamed)
+    second.add_students(classroom.id, [StudentProfile(roll_number="P01", name="Marie")])
+    second.flush()
+    first.flush()
+
+    payload = json.loads(storage_path.read_text(encoding="utf-8"))
+    [entry] = payload["classes"]
+    assert entry["name"] == "Physics II"
+    assert [student["roll_number"] for student in entry["students"]] == ["P01"]
+
+
+def test_classroom_roll_index_tracks_roster_changes():
+    classroom = Classroom(
+        id="CLS-1",
+        name="Biology",
+        students=[StudentProfile(roll_number=" B01 ", name="Ada")],
+    )
+
+    assert classroom.has_roll_number("b01")
+    index = classroom.roll_index()
+
+    classroom.add_students([StudentProfile(roll_number="B02", name="Grace")])
+    assert classroom.roll_index() is index
+    assert classroom.missing_roll_numbers(["B01", "b02", "B03"]) == ["B03"]
+
+    classroom.students = [StudentProfile(roll_number="Z09", name="Alan")]
+    assert not classroom.has_roll_number("B01")
+    assert classroom.has_roll_number("z09")
+
+
+def test_classroom_roll_index_rebuilt_after_explicit_invalidation():
+    classroom = Classroom(id="CLS-1", name="Biology", students=[StudentProfile(roll_number="B01", name="Ada")])
+    assert classroom.has_roll_number("B01")
+
+    classroom.students[0].roll_number = "B07"
+    classroom.invalidate_roll_index()
+    assert classroom.missing_roll_numbers(["B01", "b07"]) == ["B01"]
+
+
+def test_json_repository_supplies_shared_roll_index(tmp_path):
+    repo = build_repository(tmp_path)
+    classroom = repo.save_classroom(Classroom(id="CLS-1", name="Biology"))
+    repo.add_students(classroom.id, [StudentProfile(roll_number="B01", name="Ada")])
+
+    first = repo.get_classroom(classroom.id)
+    second = repo.get_classroom(classroom.id)
+    assert first.roll_index() is second.roll_index()
+    assert first.has_roll_number("b01")
+
+    # Extending a loaded copy must not leak into the repository's index
+    first.add_students([StudentProfile(roll_number="B02", name="Grace")])
+    assert first.has_roll_number("B02")
+    assert not repo.get_classroom(classroom.id).has_roll_number("B02")
+
+    repo.add_students(classroom.id, [StudentProfile(roll_number="B03", name="Alan")])
+    assert repo.get_classroom(classroom.id).has_roll_number("B03")
+
+
+def _write_seed(seed_path, names):
+    payload = {
+        "metadata": {"version": "1.0"},
+        "classes": [
+            {"id": f"CLS-SEED-{number}", "name": name, "students": []}
+            for number, name in enumerate(names)
+        ],
+    }
+    seed_path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_seed_runs_once_per_seed_content(tmp_path, monkeypatch):
+    seed_path = tmp_path / "seed.json"
+    _write_seed(seed_path, ["Seeded Class"])
+
+    repo = build_repository(tmp_path)
+    assert ClassroomService(repository=repo, seed=False).seed_from_file(str(seed_path)) == 1
+    assert (tmp_path / ".seed.json.seeded").exists()
+
+    # A fresh process with the same seed content only checks the marker
+    monkeypatch.setattr("src.services.classroom_service._seeded_signatures", {})
+    monkeypatch.setattr(repo, "list_classroom_summaries", lambda: pytest.fail("seed re-ran"))
+    assert ClassroomService(repository=repo, seed=False).seed_from_file(str(seed_path)) == 0
+    monkeypatch.undo()
+
+    _write_seed(seed_path, ["Seeded Class", "Second Class"])
+    assert ClassroomService(repository=repo, seed=False).seed_from_file(str(seed_path)) == 1
+    assert len(repo.list_classrooms()) == 2
+
+
+def test_import_students_chunks_and_caps_errors(tmp_path):
+    repo = build_repository(tmp_path)
+    service = ClassroomService(repository=repo, seed=False)
+    classroom = service.create_classroom("Bulk", expected_student_count=4)
+
+    ndjson = "\n".join([
+        '{"roll_number": "B01", "name": "One"}',
+        'not json',
+        '{"roll_number": "B02", "name": "Two"}',
+        '{"roll_number": "b01", "name": "Dup"}',
+        '{"roll_number": "B03", "name": "Three"}',
+        '{"roll_number": "B04", "name": "Four"}',
+        '{"roll_number": "B05", "name": "Over capacity"}',
+    ]).encode("utf-8")
+    rows = iter_roster_rows(io.BytesIO(ndjson), "ndjson")
+    loads = []
+    get_classroom = repo.get_classroom
+    repo.get_classroom = lambda class_id: loads.append(class_id) or get_classroom(class_id)
+
+    report = service.import_students(classroom.id, rows, chunk_size=2, max_errors=2)
+
+    assert loads == [classroom.id]
+
+    assert report["imported"] == 4
+    assert report["rejected"] == 3
+    assert [error["line"] for error in report["errors"]] == [2, 4]
+    assert report["errors_truncated"] is True
+    assert len(service.get_classroom(classroom.id).students) == 4
+
+
+def test_import_students_lets_other_enrollments_run_between_chunks(tmp_path):
+    service = ClassroomService(repository=build_repository(tmp_path), seed=False)
+    classroom = service.create_classroom("Streamed", expected_student_count=0)
+    enrolled = []
+
+    def rows():
+        yield 1, {"roll_number": "S01", "name": "One"}, None
+        # The upload is still streaming; another request enrolls a student meanwhile
+        worker = threading.Thread(
+            target=lambda: enrolled.append(
+                service.add_students_to_class(classroom.id, [{"roll_number": "S02", "name": "Walk-in"}])
+            )
+        )
+        worker.start()
+        worker.join(timeout=5)
+        yield 2, {"roll_number": "S02", "name": "Two"}, None
+        yield 3, {"roll_number": "S03", "name": "Three"}, None
+
+    report = service.import_students(classroom.id, rows(), chunk_size=1)
+
+    assert enrolled, "enrollment blocked behind the running import"
+    assert report["imported"] == 2
+    assert [error["line"] for error in report["errors"]] == [2]
+    rolls = [student.roll_number for student in service.get_classroom(classroom.id).students]
+    assert sorted(rolls) == ["S01", "S02", "S03"]
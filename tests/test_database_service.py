@@ -0,0 +1,314 @@
+import datetime as dt
+
+import pytest
+
+from src.blockchain.genesis import create_genesis_block
+from src.blockchain.newBlock import next_block
+from sqlalchemy import event, text
+
+from src.config.config import Config
+from src.models.database import DatabaseService, BlockModel, build_engine_options
+from src.models.classroom_models import Classroom, StudentProfile
+from src.services.database_service import DatabaseBlockchainService, DatabaseClassroomRepository
+
+
+@pytest.fixture
+def database(tmp_path):
+    return DatabaseService(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def classroom_repository(database):
+    repository = DatabaseClassroomRepository()
+    repository.db = database
+    return repository
+
+
+@pytest.fixture
+def block_service(database):
+    service = DatabaseBlockchainService()
+    service.db = database
+    return service
+
+
+def _attendance_block(previous, rolls):
+    return next_block(previous, {
+        "type": "attendance",
+        "teacher_name": "Test Teacher",
+        "date": "2024-01-01",
+        "course": "Test Course",
+        "year": "2024",
+        "present_students": rolls,
+    })
+
+
+def test_chain_metadata_updated_with_each_block(block_service):
+    genesis = create_genesis_block()
+    first = _attendance_block(genesis, ["001", "002"])
+    second = _attendance_block(first, ["003"])
+
+    for block in (genesis, first, second):
+        success, _ = block_service.add_block(block)
+        assert success is True
+
+    metadata = block_service.get_chain_metadata()
+    assert metadata.height == 3
+    assert metadata.tip_index == 2
+    assert metadata.tip_hash == second.hash
+    assert metadata.attendance_blocks == 2
+    assert metadata.total_attendance_records == 3
+    assert block_service.get_block_count() == 3
+
+
+def test_chain_metadata_backfilled_for_existing_blocks(block_service, database):
+    genesis = create_genesis_block()
+    first = _attendance_block(genesis, ["001"])
+    session = database.get_session()
+    for block in (genesis, first):
+        session.add(BlockModel(
+            index=block.index,
+            timestamp=block.timestamp,
+            data=block.data,
+            prev_hash=block.prev_hash,
+            merkle_root=block.merkle_root,
+            hash=block.hash,
+        ))
+    session.commit()
+    session.close()
+
+    metadata = block_service.get_chain_metadata()
+    assert metadata.height == 2
+    assert metadata.tip_hash == first.hash
+    assert metadata.total_attendance_records == 1
+
+
+def test_duplicate_block_index_rejected(block_service):
+    genesis = create_genesis_block()
+    assert block_service.add_block(genesis)[0] is True
+
+    success, message = block_service.add_block(genesis)
+
+    assert success is False
+    assert "already exists" in message
+    assert block_service.get_chain_metadata().height == 1
+
+
+def test_sqlite_file_database_uses_wal_and_single_writer(database):
+    with database.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+
+    assert database.write_engine is not database.engine
+    assert database.write_engine.pool.size() == 1
+    assert database.engine.pool.size() == Config.SQLITE_READ_POOL_SIZE
+
+
+def test_postgres_pool_sized_from_worker_count(monkeypatch):
+    monkeypatch.setattr(Config, "WORKERS", 9)
+    monkeypatch.setattr(Config, "DB_MAX_CONNECTIONS", 90)
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(Config, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(Config, "ASYNC_READS", False)
+    monkeypatch.setattr(Config, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    options = build_engine_options("postgresql+psycopg2://user:pw@localhost/blockendance")
+
+    assert options["pool_size"] == 10
+    assert options["max_overflow"] == 0
+    assert options["connect_args"]["options"] == "-c statement_timeout=5000"
+
+
+def test_postgres_overflow_comes_out_of_the_connection_budget(monkeypatch):
+    monkeypatch.setattr(Config, "WORKERS", 9)
+    monkeypatch.setattr(Config, "DB_MAX_CONNECTIONS", 90)
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(Config, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(Config, "ASYNC_READS", False)
+
+    options = build_engine_options("postgresql+psycopg2://user:pw@localhost/blockendance")
+
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert Config.WORKERS * (options["pool_size"] + options["max_overflow"]) <= Config.DB_MAX_CONNECTIONS
+
+
+def test_postgres_sync_and_async_pools_share_the_connection_budget(monkeypatch):
+    from src.services.async_database_service import build_async_engine_options
+
+    monkeypatch.setattr(Config, "WORKERS", 9)
+    monkeypatch.setattr(Config, "DB_MAX_CONNECTIONS", 90)
+    monkeypatch.setattr(Config, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(Config, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(Config, "USE_DATABASE", True)
+    monkeypatch.setattr(Config, "ASYNC_READS", True)
+
+    engines = [
+        build_engine_options("postgresql+psycopg2://user:pw@localhost/blockendance"),
+        build_async_engine_options("postgresql+asyncpg://user:pw@localhost/blockendance"),
+    ]
+
+    assert [options["pool_size"] for options in engines] == [4, 4]
+    per_worker = sum(options["pool_size"] + options["max_overflow"] for options in engines)
+    assert Config.WORKERS * per_worker <= Config.DB_MAX_CONNECTIONS
+
+
+
+def _save_classrooms(repository, count, roster_size):
+    for number in range(count):
+        repository.save_classroom(Classroom(
+            id=f"CLS-{number}",
+            name=f"Class {number}",
+            expected_student_count=roster_size,
+            students=[
+                StudentProfile(roll_number=f"R{number}-{roll:03d}", name=f"Student {roll}")
+                for roll in reversed(range(roster_size))
+            ],
+        ))
+
+
+def test_list_classrooms_loads_rosters_without_n_plus_one(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=5, roster_size=3)
+    statements = []
+    event.listen(database.engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    classrooms = classroom_repository.list_classrooms()
+
+    assert len(classrooms) == 5
+    assert len(statements) == 2
+    rolls = [student.roll_number for student in classrooms[0].students]
+    assert rolls == sorted(rolls)
+
+
+def test_classroom_summaries_count_students_without_rosters(classroom_repository):
+    _save_classrooms(classroom_repository, count=2, roster_size=4)
+    classroom_repository.save_classroom(Classroom(id="CLS-EMPTY", name="Empty"))
+
+    summaries = {summary.id: summary for summary in classroom_repository.list_classroom_summaries()}
+
+    assert summaries["CLS-0"].current_student_count == 4
+    assert summaries["CLS-EMPTY"].current_student_count == 0
+    assert "students" not in summaries["CLS-1"].to_dict()
+
+
+def _student_ids(database, class_id):
+    with database.engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT roll_number, id, name FROM students WHERE classroom_id = :class_id"),
+            {"class_id": class_id},
+        ).all()
+    return {roll: (student_id, name) for roll, student_id, name in rows}
+
+
+def test_save_classroom_applies_roster_diff(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=1, roster_size=3)
+    before = _student_ids(database, "CLS-0")
+
+    classroom = classroom_repository.get_classroom("CLS-0")
+    classroom.students = [
+        StudentProfile(roll_number="R0-000", name="Student 0"),
+        StudentProfile(roll_number="R0-001", name="Renamed"),
+        StudentProfile(roll_number="R0-NEW", name="Newcomer"),
+    ]
+    saved = classroom_repository.save_classroom(classroom)
+    after = _student_ids(database, "CLS-0")
+
+    assert sorted(after) == ["R0-000", "R0-001", "R0-NEW"]
+    assert after["R0-000"] == before["R0-000"]
+    assert after["R0-001"] == (before["R0-001"][0], "Renamed")
+    assert [student.roll_number for student in saved.students] == ["R0-000", "R0-001", "R0-NEW"]
+
+
+def test_add_students_rejects_existing_roll_case_insensitively(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=1, roster_size=2)
+
+    with pytest.raises(ValueError):
+        classroom_repository.add_students("CLS-0", [StudentProfile(roll_number="r0-001", name="Dup")])
+
+    updated = classroom_repository.add_students("CLS-0", [StudentProfile(roll_number="R0-002", name="New")])
+    assert len(updated.students) == 3
+    assert len(_student_ids(database, "CLS-0")) == 3
+
+
+def test_append_students_inserts_without_loading_roster(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=1, roster_size=2)
+    statements = []
+    event.listen(database.write_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    skipped = classroom_repository.append_students("CLS-0", [
+        StudentProfile(roll_number=f"BULK-{number}", name=f"Bulk {number}") for number in range(50)
+    ])
+
+    assert skipped == []
+    assert len(_student_ids(database, "CLS-0")) == 52
+    assert not any(
+        statement.lstrip().upper().startswith("SELECT students.id") for statement in statements
+    )
+
+
+def test_append_students_skips_rolls_already_enrolled(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=1, roster_size=2)
+    enrolled = classroom_repository.get_classroom("CLS-0").students[0].roll_number
+
+    skipped = classroom_repository.append_students("CLS-0", [
+        StudentProfile(roll_number=enrolled.lower(), name="Taken"),
+        StudentProfile(roll_number="NEW-1", name="New"),
+    ])
+
+    assert [student.name for student in skipped] == ["Taken"]
+    assert len(_student_ids(database, "CLS-0")) == 3
+
+
+def test_append_students_ignores_rolls_inserted_after_the_check(classroom_repository, database):
+    _save_classrooms(classroom_repository, count=1, roster_size=1)
+    enrolled = classroom_repository.get_classroom("CLS-0").students[0].roll_number
+    session = database.get_write_session()
+    try:
+        inserted = classroom_repository._insert_new_students(session, [
+            {"classroom_id": "CLS-0", "roll_number": enrolled, "name": "Raced"},
+            {"classroom_id": "CLS-0", "roll_number": "NEW-1", "name": "New"},
+        ])
+        session.commit()
+    finally:
+        session.close()
+
+    assert inserted == {"NEW-1"}
+    assert len(_student_ids(database, "CLS-0")) == 2
+
+
+def test_attendance_records_page_walks_by_block_index(block_service):
+    blocks = [create_genesis_block()]
+    for number in range(5):
+        blocks.append(_attendance_block(blocks[-1], [f"{number:03d}"]))
+    for block in blocks:
+        block_service.add_block(block)
+
+    first, has_more = block_service.get_attendance_records_page({}, 2)
+    assert [record["block_index"] for record in first] == [1, 2]
+    assert has_more is True
+
+    last, has_more = block_service.get_attendance_records_page({}, 2, after=4)
+    assert [record["block_index"] for record in last] == [5]
+    assert has_more is False
+
+    previous, has_more = block_service.get_attendance_records_page({}, 2, before=4)
+    assert [record["block_index"] for record in previous] == [2, 3]
+    assert has_more is True
+
+
+def test_add_blocks_commits_all_or_nothing(block_service):
+    genesis = create_genesis_block()
+    first = _attendance_block(genesis, ["001"])
+    second = _attendance_block(first, ["002", "003"])
+    block_service.add_block(genesis)
+
+    success, _ = block_service.add_blocks([first, second])
+    assert success is True
+    assert block_service.get_chain_metadata().total_attendance_records == 3
+
+    third = _attendance_block(second, ["004"])
+    success, message = block_service.add_blocks([third, second])
+    assert success is False
+    assert "already exists" in message
+    assert block_service.get_block_count() == 3
@@ -2,7 +2,9 @@ import pytest
 from flask import Flask
 import src.app as blockchain_app
 from src.app import app
+from src.api.v1.caching import response_cache
 from src.services.blockchain_service import BlockchainService
+import src.services.blockchain_service as blockchain_module
 from src.services.auth_service import auth_service
 from src.config.config import Config
 
@@ -193,6 +195,23 @@ class TestClassroomAPI:
         assert isinstance(data['data'], list)
         assert len(data['data']) >= 2
     
+    def test_list_classrooms_summary_view(self, client):
+        """Test the roster-free summary listing"""
+        create_response = client.post('/api/v1/classrooms', json={
+            'name': 'Summary Class',
+            'expected_student_count': 5
+        })
+        class_id = create_response.get_json()['data']['id']
+        client.post(f'/api/v1/classrooms/{class_id}/students', json={
+            'students': [{'roll_number': 'SUM001', 'name': 'Alice'}]
+        })
+
+        response = client.get('/api/v1/classrooms?view=summary')
+        assert response.status_code == 200
+        summaries = {entry['id']: entry for entry in response.get_json()['data']}
+        assert summaries[class_id]['current_student_count'] == 1
+        assert 'students' not in summaries[class_id]
+    
     def test_get_classroom_success(self, client):
         """Test retrieving a specific classroom"""
         # Create a classroom
@@ -250,6 +269,51 @@ class TestClassroomAPI:
         assert 'ROLL001' in student_rolls
         assert 'ROLL002' in student_rolls
     
+    def test_import_students_csv_reports_rejected_rows(self, client):
+        """Test bulk CSV import with a per-row error report"""
+        create_response = client.post('/api/v1/classrooms', json={
+            'name': 'Import Class',
+            'expected_student_count': 0
+        })
+        class_id = create_response.get_json()['data']['id']
+        
+        csv_body = (
+            "roll_number,name\n"
+            "IMP001,Alice Smith\n"
+            "IMP002,\n"
+            "imp001,Alice Again\n"
+            "IMP003,Bob Johnson\n"
+        )
+        response = client.post(
+            f'/api/v1/classrooms/{class_id}/students/import',
+            data=csv_body,
+            content_type='text/csv'
+        )
+        
+        assert response.status_code == 200
+        report = response.get_json()['data']
+        assert report['imported'] == 2
+        assert report['rejected'] == 2
+        assert [error['line'] for error in report['errors']] == [3, 4]
+        
+        classroom = client.get(f'/api/v1/classrooms/{class_id}').get_json()['data']
+        assert classroom['current_student_count'] == 2
+    
+    def test_import_students_rejects_unknown_format(self, client):
+        """Test that uploads other than CSV/NDJSON are refused"""
+        create_response = client.post('/api/v1/classrooms', json={
+            'name': 'Import Format Class',
+            'expected_student_count': 0
+        })
+        class_id = create_response.get_json()['data']['id']
+        
+        response = client.post(
+            f'/api/v1/classrooms/{class_id}/students/import',
+            data='roll_number,name',
+            content_type='text/plain'
+        )
+        assert response.status_code == 415
+    
     def test_add_students_duplicate_roll_number(self, client):
         """Test that duplicate roll numbers are rejected"""
         # Create a classroom
@@ -417,4 +481,184 @@ class TestAttendanceWorkflow:
         assert response.status_code == 400
         data = response.get_json()
         assert data['error'] == 'validation_error'
-        assert 'not part of classroom' in data['message'].lower()
\ No newline at end of file
+        assert 'not part of classroom' in data['message'].lower()
+
+    def test_submit_attendance_batch_reports_each_session(self, client, monkeypatch):
+        class_id, students = self._create_class_with_students(client)
+        session = {
+            'teacher_name': 'Ms. Valid',
+            'course': 'Mathematics',
+            'year': '2024',
+            'class_id': class_id,
+            'present_students': [students[0]['roll_number']]
+        }
+        service = blockchain_app.get_blockchain_service()
+        saves = []
+        original_save = blockchain_module.save_blockchain
+
+        def counting_save(chain, path):
+            saves.append(len(chain))
+            return original_save(chain, path)
+
+        monkeypatch.setattr(blockchain_module, 'save_blockchain', counting_save)
+
+        response = client.post('/api/v1/attendance/batch', json={'sessions': [
+            {**session, 'date': '2024-01-10'},
+            {**session, 'date': '2024-01-11', 'present_students': ['UNKNOWN']},
+            {**session, 'date': 'not-a-date'},
+            {**session, 'date': '2024-01-12'},
+        ]})
+
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert (data['accepted'], data['rejected']) == (2, 2)
+        results = data['results']
+        assert results[1]['error'] == 'validation_error'
+        assert 'date' in results[2]['details']
+        assert results[3]['block_index'] == results[0]['block_index'] + 1
+        assert len(saves) == 1
+        assert service.get_block_roster(results[3]['block_index'])['present_students'] == [students[0]['roll_number']]
+
+
+def test_attendance_rate_limited_per_user(client, auth_token):
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    response = client.post('/api/v1/attendance', json={}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.headers['X-RateLimit-Limit'] == '30'
+    assert int(response.headers['X-RateLimit-Remaining']) < 30
+
+
+def test_attendance_batch_charges_the_attendance_bucket_per_session(client, auth_token):
+    from src.utils.token_bucket import bucket_limiter
+
+    bucket_limiter.reset()
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    sessions = [{'class_id': 'missing'}] * 4
+
+    batch = client.post('/api/v1/attendance/batch', json={'sessions': sessions}, headers=headers)
+    single = client.post('/api/v1/attendance', json={}, headers=headers)
+
+    limit = int(batch.headers['X-RateLimit-Limit'])
+    assert int(batch.headers['X-RateLimit-Remaining']) == limit - 4
+    assert int(single.headers['X-RateLimit-Remaining']) == limit - 5
+
+
+def test_attendance_not_capped_by_default_per_address_limits(client, auth_token, monkeypatch):
+    from src.utils.token_bucket import bucket_limiter, parse_role_budgets
+
+    monkeypatch.setattr(bucket_limiter, 'budgets', parse_role_budgets('admin=100000/100000,anonymous=10/10'))
+    bucket_limiter.reset()
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    statuses = {client.post('/api/v1/attendance', json={}, headers=headers).status_code for _ in range(60)}
+
+    assert statuses == {400}
+
+
+def test_attendance_token_bucket_skipped_when_rate_limits_disabled(client, auth_token, monkeypatch):
+    monkeypatch.setattr(Config, 'RATELIMIT_ENABLED', False)
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    response = client.post('/api/v1/attendance', json={}, headers=headers)
+
+    assert response.status_code == 400
+    assert 'X-RateLimit-Limit' not in response.headers
+
+
+def test_stats_conditional_get_returns_304_until_chain_changes(client):
+    first = client.get('/api/v1/stats')
+    etag = first.headers['ETag']
+
+    assert first.status_code == 200
+    assert etag.startswith('W/')
+    assert first.headers['Cache-Control'].startswith('private, max-age=')
+
+    cached = client.get('/api/v1/stats', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    blockchain_app.get_blockchain_service().add_attendance_block({'roll_no1': '001'}, {
+        'teacher_name': 'Teacher', 'course': 'Course', 'year': '2024', 'date': '2024-01-01',
+    })
+    refreshed = client.get('/api/v1/stats', headers={'If-None-Match': etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers['ETag'] != etag
+
+
+def test_classroom_etag_changes_with_classrooms(client):
+    etag = client.get('/api/v1/classrooms').headers['ETag']
+    client.post('/api/v1/classrooms', json={'name': 'ETag Class', 'expected_student_count': 1})
+
+    response = client.get('/api/v1/classrooms', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_report_json_is_an_object_rendered_once_per_tip(client, auth_token, monkeypatch):
+    response_cache.clear()
+    service = blockchain_app.get_blockchain_service()
+    calls = []
+    original = service.get_analytics
+    monkeypatch.setattr(service, 'get_analytics', lambda: calls.append(1) or original())
+    headers = {'Authorization': f'Bearer {auth_token}'}
+
+    first = client.get('/api/v1/report', headers=headers)
+    second = client.get('/api/v1/report', headers=headers)
+
+    assert first.status_code == 200
+    assert 'overview' in first.get_json()['data']['report']
+    assert second.data == first.data
+    assert len(calls) == 1
+
+
+def test_records_cursor_pages_are_stable_across_appends(client):
+    service = blockchain_app.get_blockchain_service()
+    metadata = {'teacher_name': 'Teacher', 'course': 'Course', 'year': '2024', 'date': '2024-01-01'}
+    for roll in ('001', '002', '003'):
+        service.add_attendance_block({'roll_no1': roll}, metadata)
+    existing = [record['block_index'] for record in service.get_all_records()]
+
+    first = client.get('/api/v1/records?cursor=&per_page=2').get_json()['data']
+    assert [record['block_index'] for record in first['data']] == existing[:2]
+    assert first['pagination']['prev_cursor'] is None
+
+    service.add_attendance_block({'roll_no1': '004'}, metadata)
+    second = client.get(
+        f"/api/v1/records?per_page=2&cursor={first['pagination']['next_cursor']}"
+    ).get_json()['data']
+    assert [record['block_index'] for record in second['data']] == [existing[2], existing[2] + 1]
+
+    back = client.get(
+        f"/api/v1/records?per_page=2&cursor={second['pagination']['prev_cursor']}"
+    ).get_json()['data']
+    assert back['data'] == first['data']
+
+
+def test_records_rejects_malformed_cursor(client):
+    response = client.get('/api/v1/records?cursor=not-a-cursor')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'validation_error'
+
+
+def test_records_projection_and_block_roster(client, auth_token):
+    service = blockchain_app.get_blockchain_service()
+    service.add_attendance_block({'roll_no1': '001', 'roll_no2': '002'}, {
+        'teacher_name': 'Teacher', 'course': 'Course', 'year': '2024', 'date': '2024-01-01',
+    })
+    block_index = service.get_all_records()[-1]['block_index']
+
+    summary = client.get('/api/v1/records?view=summary').get_json()['data']['data'][-1]
+    assert 'present_students' not in summary
+    assert summary['student_count'] == 2
+
+    sparse = client.get('/api/v1/records?fields=course').get_json()['data']['data'][-1]
+    assert sparse == {'block_index': block_index, 'course': 'Course'}
+
+    legacy = client.get('/api/records?view=summary', headers={'Authorization': f'Bearer {auth_token}'})
+    assert 'present_students' not in legacy.get_json()['records'][-1]
+
+    roster = client.get(f'/api/v1/records/{block_index}/students').get_json()['data']
+    assert roster['present_students'] == ['001', '002']
+    assert client.get('/api/v1/records/9999/students').status_code == 404
+    assert client.get('/api/v1/records?fields=password').status_code == 400
@@ -0,0 +1,39 @@
+import datetime as dt
+
+import pytest
+from flask import Flask
+
+import src.utils.json_provider as json_provider
+from src.utils.json_provider import FastJSONProvider
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    request.node.app = app  # the provider only holds a weak reference
+    return app.json
+
+
+def test_datetimes_encode_as_iso_8601_without_whitespace(provider):
+    payload = {"b": dt.datetime(2024, 1, 2, 3, 4, 5), "a": dt.date(2024, 1, 2)}
+
+    assert provider.dumps(payload) == '{"b":"2024-01-02T03:04:05","a":"2024-01-02"}'
+    assert provider.dumps_bytes(payload) == provider.dumps(payload).encode("utf-8")
+
+
+def test_response_round_trips(provider):
+    with provider._app.app_context():
+        response = provider.response({"students": ["001", "002"], "count": 2})
+
+    assert response.mimetype == "application/json"
+    assert provider.loads(response.get_data()) == {"students": ["001", "002"], "count": 2}
+
+
+def test_unserializable_values_raise_type_error(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"value": object()})
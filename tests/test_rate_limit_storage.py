@@ -0,0 +1,53 @@
+import multiprocessing
+
+import pytest
+from limits import parse
+from limits.strategies import STRATEGIES
+
+from src.utils.rate_limit_storage import SQLiteStorage
+
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'ratelimits.db'}"
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_strategies_enforce_limit(storage_uri, strategy):
+    limiter = STRATEGIES[strategy](SQLiteStorage(storage_uri))
+    item = parse("3/minute")
+
+    assert [limiter.hit(item, "client") for _ in range(4)] == [True, True, True, False]
+    assert limiter.hit(item, "other-client") is True
+    assert limiter.get_window_stats(item, "client").remaining == 0
+
+
+def _hit_from_worker(storage_uri, results):
+    limiter = STRATEGIES["fixed-window"](SQLiteStorage(storage_uri))
+    item = parse("10/minute")
+    results.put(sum(limiter.hit(item, "shared") for _ in range(5)))
+
+
+def test_counters_shared_between_processes(storage_uri):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [context.Process(target=_hit_from_worker, args=(storage_uri, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert sum(results.get(timeout=5) for _ in workers) == 10
+
+
+def test_clear_and_reset(storage_uri):
+    storage = SQLiteStorage(storage_uri)
+    storage.incr("a", 60)
+    storage.incr("a", 60, amount=2)
+    assert storage.get("a") == 3
+
+    storage.clear("a")
+    assert storage.get("a") == 0
+
+    storage.incr("b", 60)
+    assert storage.reset() == 1
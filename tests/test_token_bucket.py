@@ -0,0 +1,86 @@
+import pytest
+
+from src.utils.token_bucket import BucketBudget, TokenBucketLimiter, parse_role_budgets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return TokenBucketLimiter(parse_role_budgets("teacher=60/3,anonymous=6/1"), clock=clock)
+
+
+def test_burst_then_refill(limiter, clock):
+    budget = limiter.budget_for("teacher")
+    decisions = [limiter.hit("attendance:user:alice", budget) for _ in range(4)]
+
+    assert [decision.allowed for decision in decisions] == [True, True, True, False]
+    assert decisions[-1].headers()["Retry-After"] == "1"
+    assert decisions[2].headers() == {
+        "X-RateLimit-Limit": "3",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": "3",
+    }
+
+    clock.now += 1
+    assert limiter.hit("attendance:user:alice", budget).allowed is True
+
+
+def test_users_have_independent_buckets(limiter):
+    budget = limiter.budget_for("teacher")
+    for _ in range(3):
+        limiter.hit("attendance:user:alice", budget)
+
+    assert limiter.hit("attendance:user:alice", budget).allowed is False
+    assert limiter.hit("attendance:user:bob", budget).allowed is True
+
+
+def test_unknown_role_uses_anonymous_budget(limiter):
+    assert limiter.budget_for("auditor") == BucketBudget(rate_per_minute=6, burst=1)
+
+
+def test_full_buckets_pruned(clock):
+    limiter = TokenBucketLimiter(parse_role_budgets("anonymous=60/1"), max_buckets=3, clock=clock)
+    budget = limiter.budget_for(None)
+    for number in range(3):
+        limiter.hit(f"key-{number}", budget)
+
+    clock.now += 5
+    limiter.hit("key-3", budget)
+    assert len(limiter._buckets) == 1
+
+
+
+def test_prune_evicts_least_recently_hit_when_nothing_refilled(clock):
+    limiter = TokenBucketLimiter(parse_role_budgets("anonymous=1/1"), max_buckets=4, clock=clock)
+    budget = limiter.budget_for(None)
+    for number in range(5):
+        clock.now += 0.001
+        limiter.hit(f"key-{number}", budget)
+
+    assert sorted(limiter._buckets) == ["key-3", "key-4"]
+    assert limiter.hit("key-4", budget).allowed is False
+
+
+def test_cost_above_burst_allowed_on_full_bucket_then_repaid(limiter, clock):
+    budget = limiter.budget_for("teacher")
+
+    batch = limiter.hit("attendance:user:alice", budget, cost=5)
+    assert batch.allowed is True
+    assert batch.remaining == 0
+
+    clock.now += 2
+    assert limiter.hit("attendance:user:alice", budget).allowed is False
+    clock.now += 1
+    assert limiter.hit("attendance:user:alice", budget).allowed is True
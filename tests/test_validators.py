@@ -3,7 +3,10 @@ from src.utils.validators import (
     validate_attendance_form,
     validate_search_form,
     sanitize_string,
+    validate_roll_number,
+    validate_roll_numbers,
 )
+from marshmallow import ValidationError
 
 
 class TestValidators:
@@ -127,3 +130,38 @@ class TestValidators:
         assert is_valid is False
         assert "invalid characters" in error_msg.lower()
 
+
+    def test_validate_attendance_form_reports_invalid_roll_numbers(self):
+        form_data = {
+            "teacher_name": "John Doe",
+            "date": "2024-01-15",
+            "course": "Data Structures",
+            "year": "2024",
+            "class_id": "CLS-1234",
+            "present_students": ["001", "00 2", "x" * 51]
+        }
+
+        is_valid, validated_data, error_msg = validate_attendance_form(form_data)
+
+        assert is_valid is False
+        assert "Roll number contains invalid characters" in error_msg
+        assert "Roll number must be less than 50 characters" in error_msg
+
+    @pytest.mark.parametrize("rolls", [
+        ["001", " 002 ", "A-1_b", "x" * 50, ""],
+        ["001", "0,02"],
+        ["001", "00\n2", "ok"],
+        ["<1>", "x" * 51, "  "],
+    ])
+    def test_validate_roll_numbers_matches_per_item_validator(self, rolls):
+        expected = {}
+        for position, roll in enumerate(rolls):
+            try:
+                validate_roll_number(roll)
+            except ValidationError as err:
+                expected[position] = err.messages
+
+        assert validate_roll_numbers(rolls) == expected
+
+    def test_validate_roll_numbers_can_reject_blanks(self):
+        assert validate_roll_numbers(["001", "  "], allow_blank=False) == {1: ["Roll number cannot be empty"]}